@@ -0,0 +1,88 @@
+"""
+Exportação do histórico de métricas em NDJSON ou CSV.
+
+Os dados são gerados em pedaços a partir de um iterador de pontos, de
+modo que a memória usada não depende do período exportado.
+
+- NDJSON: uma linha por ponto, {"timestamp": epoch, "<caminho>": valor, ...}
+  (pandas.read_json(..., lines=True) gera uma tabela larga);
+- CSV: formato longo, uma linha por valor: timestamp,metric,value
+  (use DataFrame.pivot para obter uma coluna por métrica).
+"""
+
+import io
+import csv
+import json
+from fnmatch import fnmatchcase
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+
+# Tamanho aproximado de cada pedaço enviado ao cliente
+CHUNK_SIZE = 64 * 1024
+
+class MetricFilter:
+    """Seleção de métricas por caminho, prefixo ou padrão fnmatch."""
+    
+    def __init__(self, patterns):
+        """Inicializa o filtro.
+        
+        Args:
+            patterns: Lista de caminhos ("hardware.memory.used"), prefixos
+                ("hardware.memory") ou padrões ("network.interfaces.*.rx_bytes");
+                vazia seleciona todas as métricas
+        """
+        self.patterns = [pattern for pattern in patterns if pattern]
+        self._cache = {}
+    
+    def __call__(self, path):
+        """Indica se o caminho foi selecionado (resultado memorizado)."""
+        if not self.patterns:
+            return True
+        
+        selected = self._cache.get(path)
+        if selected is None:
+            selected = self._cache[path] = any(
+                path == pattern or path.startswith(pattern + '.') or fnmatchcase(path, pattern)
+                for pattern in self.patterns
+            )
+        return selected
+
+def iter_export(points, export_format, metric_filter):
+    """Gera o conteúdo da exportação em pedaços de bytes.
+    
+    Args:
+        points: Iterável de tuplas (timestamp, lista de pares caminho -> valor)
+        export_format: "ndjson" ou "csv"
+        metric_filter: Instância de MetricFilter
+    
+    Yields:
+        Pedaços de bytes de aproximadamente CHUNK_SIZE
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    if export_format == "csv":
+        writer.writerow(["timestamp", "metric", "value"])
+    
+    for timestamp, values in points:
+        selected = [(path, value) for path, value in values if metric_filter(path)]
+        if not selected:
+            continue
+        
+        if export_format == "csv":
+            writer.writerows((timestamp, path, value) for path, value in selected)
+        else:
+            row = {"timestamp": timestamp}
+            row.update(selected)
+            buffer.write(json.dumps(row, ensure_ascii=False))
+            buffer.write('\n')
+        
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
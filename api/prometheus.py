@@ -0,0 +1,177 @@
+"""
+Exposição das métricas no formato texto do Prometheus.
+
+Cada métrica declarada no esquema dos coletores vira uma família com nome
+no padrão do Prometheus (namespace, componentes do caminho e sufixo de
+unidade, com _total nos counters). Os componentes declarados como rótulo
+("interfaces.{interface}.rx_bytes") saem do nome e viram rótulos:
+
+    dashboard_network_interfaces_rx_bytes_total{interface="wlan0"} 123456
+
+A resolução de nomes e rótulos é feita uma vez por caminho, e o texto é
+gerado a partir de um template compilado para o conjunto de caminhos do
+snapshot; o template só é recompilado quando esse conjunto muda. O
+resultado fica em cache até que algum coletor produza dados novos.
+"""
+
+import re
+import math
+import threading
+
+from config.settings import Config
+from collectors.schema import COUNTER, BYTES, SECONDS, CELSIUS, PERCENT
+from storage.metrics_history import flatten_snapshot
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Sufixos de unidade acrescentados ao nome quando ainda não fazem parte dele
+UNIT_SUFFIXES = {
+    BYTES: "bytes",
+    SECONDS: "seconds",
+    CELSIUS: "celsius",
+    PERCENT: "percent"
+}
+
+_INVALID_NAME_CHARS = re.compile(r'[^a-zA-Z0-9_]+')
+
+def metric_name(parts, kind, unit, namespace=""):
+    """Monta o nome de uma família de métricas no padrão do Prometheus.
+    
+    Args:
+        parts: Componentes do caminho sem os rótulos (ex: ["hardware", "memory", "used"])
+        kind: Tipo da métrica (gauge ou counter)
+        unit: Unidade declarada no esquema
+        namespace: Prefixo comum a todas as métricas
+    
+    Returns:
+        Nome sanitizado (ex: "dashboard_hardware_memory_used_bytes")
+    """
+    name = '_'.join(part for part in (namespace, *parts) if part)
+    name = _INVALID_NAME_CHARS.sub('_', name).strip('_')
+    if name[:1].isdigit():
+        name = '_' + name
+    
+    suffix = UNIT_SUFFIXES.get(unit)
+    if suffix and suffix not in parts[-1]:
+        name += '_' + suffix
+    if kind == COUNTER and not name.endswith('_total'):
+        name += '_total'
+    return name
+
+def escape_label_value(value):
+    """Escapa um valor de rótulo (barra invertida, aspas e quebra de linha)."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_sample(value):
+    """Formata o valor de uma amostra (inclusive NaN e infinitos)."""
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(value)
+
+class PrometheusExporter:
+    """Renderiza snapshots no formato texto do Prometheus, com cache."""
+    
+    def __init__(self, schema, namespace=None, exclude=None):
+        """Inicializa o exportador.
+        
+        Args:
+            schema: Instância de MetricSchema
+            namespace: Prefixo dos nomes (usa Config.PROMETHEUS_NAMESPACE se None)
+            exclude: Caminhos ignorados (usa Config.PROMETHEUS_EXCLUDE se None)
+        """
+        self.schema = schema
+        self.namespace = namespace if namespace is not None else Config.PROMETHEUS_NAMESPACE
+        self.exclude = exclude if exclude is not None else Config.PROMETHEUS_EXCLUDE
+        
+        # Caminho -> (família, prefixo da amostra) ou None se não declarado
+        self._series = {}
+        self._layout = None
+        self._template = None
+        self._snapshot = None
+        self._body = b""
+        self._lock = threading.Lock()
+    
+    def _compile_series(self, path):
+        """Resolve família e prefixo de amostra de um caminho."""
+        split = self.schema.split_labels(path)
+        if split is None:
+            return None
+        
+        parts, labels = split
+        kind, unit = self.schema.lookup(path)
+        name = metric_name(parts, kind, unit, self.namespace)
+        
+        help_text = '.'.join(parts) + (f" ({unit})" if unit else "")
+        if labels:
+            label_text = ','.join(f'{label}="{escape_label_value(value)}"' for label, value in labels)
+            prefix = f"{name}{{{label_text}}} "
+        else:
+            prefix = f"{name} "
+        return (name, kind, help_text), prefix
+    
+    def _compile_template(self, layout):
+        """Compila o template de texto para uma sequência de caminhos.
+        
+        As amostras são agrupadas por família (o formato exige que cada
+        família apareça uma única vez) e os valores entram como campos
+        posicionais de str.format.
+        """
+        families = {}
+        for index, path in enumerate(layout):
+            (name, kind, help_text), prefix = self._series[path]
+            family = families.setdefault(name, (kind, help_text, []))
+            family[2].append(prefix.replace('{', '{{').replace('}', '}}') + f"{{{index}}}")
+        
+        lines = []
+        for name in sorted(families):
+            kind, help_text, samples = families[name]
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+    
+    def render(self, snapshot):
+        """Retorna o texto de exposição de um snapshot.
+        
+        Args:
+            snapshot: Dicionário coletor -> dados, como retornado por
+                CollectorPool.collect_all
+        
+        Returns:
+            Corpo da resposta em bytes (reaproveitado enquanto os dados de
+            todos os coletores forem os mesmos objetos)
+        """
+        current = tuple(snapshot.items())
+        with self._lock:
+            if self._snapshot is not None and len(current) == len(self._snapshot) and all(
+                name == cached_name and data is cached_data
+                for (name, data), (cached_name, cached_data) in zip(current, self._snapshot)
+            ):
+                return self._body
+            
+            layout = []
+            values = []
+            for path, value in flatten_snapshot(snapshot, self.exclude):
+                if not isinstance(value, (int, float)):
+                    continue
+                if path not in self._series:
+                    self._series[path] = self._compile_series(path)
+                if self._series[path] is None:
+                    continue
+                layout.append(path)
+                values.append(format_sample(value))
+            
+            layout = tuple(layout)
+            if layout != self._layout:
+                self._template = self._compile_template(layout)
+                self._layout = layout
+            
+            self._body = self._template.format(*values).encode('utf-8')
+            self._snapshot = current
+            return self._body
@@ -6,8 +6,12 @@ Este módulo implementa as rotas da API e os manipuladores de requisições.
 
 import os
 import json
+import math
+import time
+import sqlite3
 import logging
 from datetime import datetime
+from urllib.parse import urlsplit, parse_qs, unquote
 
 from core.server import BaseHandler
 from collectors.system_collector import SystemCollector
@@ -16,90 +20,415 @@ from collectors.network_collector import NetworkCollector
 from collectors.storage_collector import StorageCollector
 from collectors.process_collector import ProcessCollector
 from collectors.android_collector import AndroidCollector
-from storage.metrics_history import MetricsHistory
+from collectors.pressure_collector import PressureCollector
+from collectors.collector_pool import CollectorPool
+from collectors.schema import MetricSchema
+from api.views import format_snapshot, build_catalog
+from api.export import EXPORT_FORMATS, MetricFilter, iter_export
+from api.prometheus import PrometheusExporter, CONTENT_TYPE as PROMETHEUS_CONTENT_TYPE
+from storage.metrics_history import MetricsHistory, AGGREGATIONS
+from storage.segment_store import SegmentStore
+from storage.sqlite_store import SqliteStore
+from storage.stats import MetricStats
+from core import perf
+from core.fallback import get_fallback_stats
+from core.profiler import profile, ProfilerBusy
+from core.alerts import AlertEngine
+from core.forecast import Forecaster, SOURCE as FORECAST_SOURCE
+from core.sampler import BackgroundSampler, SnapshotSampler
 from config.settings import Config
 
+# Estado compartilhado entre requisições (o HTTPServer cria um
+# manipulador novo para cada requisição)
+collectors = {
+    "system": SystemCollector(),
+    "hardware": HardwareCollector(),
+    "network": NetworkCollector(),
+    "storage": StorageCollector(),
+    "process": ProcessCollector(),
+    "android": AndroidCollector()
+}
+if PressureCollector.is_available():
+    collectors["pressure"] = PressureCollector()
+
+collector_pool = CollectorPool(collectors)
+metric_schema = MetricSchema(collectors)
+metrics_history = MetricsHistory()
+prometheus_exporter = PrometheusExporter(metric_schema)
+metric_stats = MetricStats(metric_schema)
+metrics_history.add_listener(metric_stats.add)
+alert_engine = AlertEngine()
+metrics_history.add_listener(alert_engine.evaluate)
+forecaster = Forecaster(metrics_history)
+metric_schema.register(FORECAST_SOURCE, forecaster.schema)
+metrics_history.add_listener(forecaster.update)
+samplers = []
+
+# Rotas fixas da API, usadas como rótulo nas medições de desempenho
+# (demais caminhos são agrupados para limitar a cardinalidade)
+API_ROUTES = ("status", "export", "metrics", "schema", "fallbacks", "history",
+              "alerts", "forecast", "stats", "metric", "_perf", "_profile")
+
+def create_history_store(backend=None):
+    """Cria o armazenamento persistente do histórico.
+    
+    Args:
+        backend: "segments", "sqlite" ou None (usa Config.HISTORY_BACKEND)
+    
+    Returns:
+        Instância de SegmentStore ou SqliteStore, ou None se o histórico
+        for mantido apenas em memória
+    """
+    backend = backend or Config.HISTORY_BACKEND
+    if backend == "segments":
+        return SegmentStore()
+    if backend == "sqlite":
+        return SqliteStore()
+    if backend:
+        logging.warning(f"Backend de histórico desconhecido: {backend}")
+    return None
+
+def start_background_tasks():
+    """Inicia a amostragem em segundo plano do snapshot principal e dos
+    coletores de alta frequência.
+    
+    As fontes são registradas no histórico antes de recarregar os dados
+    do disco, para que cada ponto volte ao seu próprio buffer.
+    """
+    if "pressure" in collectors:
+        samplers.append(BackgroundSampler("pressure", collectors["pressure"], metrics_history, Config.PSI_SAMPLE_INTERVAL))
+    
+    # Snapshot principal, com os demais coletores (alimenta alertas,
+    # previsões e estatísticas mesmo sem clientes conectados)
+    sampled = {sampler.name for sampler in samplers}
+    samplers.append(SnapshotSampler(
+        collector_pool, metrics_history, Config.COLLECTION_INTERVAL,
+        [name for name in collectors if name not in sampled]
+    ))
+    
+    for sampler in samplers:
+        if sampler.source is not None:
+            metrics_history.register_source(sampler.source, sampler.interval)
+    
+    try:
+        store = create_history_store()
+        if store is not None:
+            metrics_history.attach_store(store)
+    except (OSError, sqlite3.Error) as e:
+        logging.error(f"Histórico em disco indisponível: {e}")
+    
+    for sampler in samplers:
+        sampler.start()
+
+def stop_background_tasks():
+    """Encerra a amostragem e grava o histórico pendente em disco."""
+    for sampler in samplers:
+        sampler.stop()
+    if metrics_history.store is not None:
+        metrics_history.store.flush()
+
 class ApiHandler(BaseHandler):
     """Manipulador para rotas da API."""
     
     def __init__(self, *args, **kwargs):
         """Inicializa o manipulador da API."""
-        # Inicializa coletores
-        self.collectors = {
-            "system": SystemCollector(),
-            "hardware": HardwareCollector(),
-            "network": NetworkCollector(),
-            "storage": StorageCollector(),
-            "process": ProcessCollector(),
-            "android": AndroidCollector()
-        }
-        
-        # Inicializa armazenamento de histórico
-        self.metrics_history = MetricsHistory()
+        self.collector_pool = collector_pool
+        self.collectors = collector_pool.collectors
+        self.metrics_history = metrics_history
         
         super().__init__(*args, **kwargs)
     
     def do_GET(self):
         """Processa requisições GET."""
+        start = time.perf_counter() if perf.enabled else None
         try:
-            if self.path == '/api/status':
+            # Separa o caminho dos parâmetros de consulta
+            url = urlsplit(self.path)
+            self.route_path = url.path
+            self.query = parse_qs(url.query)
+            if start is not None:
+                self.route_label = self._route_label()
+            
+            if self.route_path == '/api/status':
                 self.handle_status()
-            elif self.path.startswith('/api/'):
+            elif self.route_path == '/metrics':
+                self.handle_prometheus()
+            elif self.route_path.startswith('/api/'):
                 self.handle_api_route()
-            elif self.path.startswith('/static/'):
+            elif self.route_path.startswith('/static/'):
                 self.handle_static_file()
             else:
                 self.handle_static_content()
         except Exception as e:
             self.handle_error(e)
+        
+        if start is not None:
+            perf.observe("request_duration_seconds", self.route_label, time.perf_counter() - start)
+    
+    def _route_label(self):
+        """Retorna o rótulo da rota nas medições de desempenho."""
+        if self.route_path.startswith('/api/'):
+            route = self.route_path.split('/')[2]
+            if route in self.collectors or route in API_ROUTES:
+                return f"/api/{route}"
+            return "/api/other"
+        if self.route_path.startswith('/static/'):
+            return "/static"
+        return self.route_path if self.route_path in ('/', '/metrics') else "other"
     
     def handle_status(self):
         """Manipula rota /api/status."""
         try:
-            data = {}
-            
-            # Coleta dados de todos os coletores
-            for name, collector in self.collectors.items():
-                data[name] = collector.collect()
-            
-            # Armazena dados no histórico
-            self.metrics_history.add_data_point(data)
+            # Coleta dados de todos os coletores em paralelo, com prazo
+            # (o histórico é alimentado pelo SnapshotSampler, não pelas requisições)
+            data = self.collector_pool.collect_all()
             
             # Adiciona timestamp global
             data["timestamp"] = self.get_timestamp()
             
             # Envia resposta
-            self.send_json_response(data)
+            self.send_snapshot_response(data)
         except Exception as e:
             self.handle_error(e)
     
+    def handle_prometheus(self):
+        """Manipula rota /metrics (formato texto do Prometheus).
+        
+        Os coletores respeitam seus intervalos de coleta, de modo que
+        scrapes frequentes reaproveitam os dados e o texto já renderizado.
+        """
+        data = self.collector_pool.collect_all()
+        data[FORECAST_SOURCE] = forecaster.latest
+        body = prometheus_exporter.render(data)
+        if perf.enabled:
+            body += perf.render_prometheus(Config.PROMETHEUS_NAMESPACE).encode('utf-8')
+        self.send_bytes_response(body, PROMETHEUS_CONTENT_TYPE)
+    
+    def send_snapshot_response(self, data):
+        """Envia um snapshot, formatado se o cliente pedir (?format=human)."""
+        if self.query.get('format', [''])[0] == 'human':
+            data = format_snapshot(data, metric_schema)
+        self.send_json_response(data)
+    
     def handle_api_route(self):
         """Manipula rotas específicas da API."""
         # Extrai o nome da rota: /api/route -> route
-        route = self.path.split('/')[2]
+        route = self.route_path.split('/')[2]
         
         if route in self.collectors:
             # Rota para coletor específico
             data = {
-                route: self.collectors[route].collect(),
+                route: self.collector_pool.collect(route),
                 "timestamp": self.get_timestamp()
             }
-            self.send_json_response(data)
+            self.send_snapshot_response(data)
+        elif route == "export":
+            # Rota para exportação do histórico em streaming (NDJSON ou CSV)
+            self.handle_export()
+        elif route == "metrics":
+            # Rota para o catálogo de métricas (caminho, tipo, unidade e valor atual)
+            catalog = build_catalog(self.metrics_history.get_latest(), metric_schema)
+            self.send_json_response(catalog)
+        elif route == "schema":
+            # Rota para o esquema (tipo e unidade) das métricas numéricas
+            self.send_json_response(metric_schema.describe())
+        elif route == "fallbacks":
+            # Rota para estatísticas das cadeias de fallback
+            self.send_json_response(get_fallback_stats())
+        elif route == "_perf":
+            # Rota para a instrumentação interna (coletores, comandos, rotas)
+            self.send_json_response(perf.snapshot())
+        elif route == "_profile":
+            # Rota para o profiler sob demanda (desativada por padrão)
+            self.handle_profile()
         elif route == "history":
             # Rota para obter dados históricos
             self.send_json_response(self.metrics_history.get_history())
-        elif route == "metric" and len(self.path.split('/')) >= 4:
+        elif route == "alerts":
+            # Rota para regras, alertas ativos e eventos recentes, ou para o
+            # canal de eventos em tempo real (/api/alerts/stream)
+            if self.route_path.rstrip('/').endswith('/stream'):
+                self.send_event_stream(alert_engine.iter_events())
+            else:
+                self.send_json_response(alert_engine.describe())
+        elif route == "forecast":
+            # Rota para as previsões de esgotamento (disco cheio, bateria)
+            self.send_json_response(forecaster.latest)
+        elif route == "stats":
+            # Rota para estatísticas contínuas de uma métrica
+            # Formato: /api/stats/hardware.cpu.usage?window=5m (o restante
+            # do caminho é a métrica, que pode conter "/", ex: pontos de montagem)
+            self.handle_metric_stats(unquote(self.route_path[len('/api/stats/'):]))
+        elif route == "metric" and len(self.route_path) > len('/api/metric/'):
             # Rota para obter histórico de uma métrica específica
-            # Formato: /api/metric/cpu.usage
-            metric_path = self.path.split('/')[3]
-            self.send_json_response(self.metrics_history.get_metric_history(metric_path))
+            # Formato: /api/metric/cpu.usage ou /api/metric/storage.partitions./data.used
+            metric_path = unquote(self.route_path[len('/api/metric/'):])
+            self.handle_metric_history(metric_path)
         else:
             self.send_json_response({"error": "Rota não encontrada"}, 404)
     
+    def handle_metric_history(self, metric_path):
+        """Manipula rota /api/metric/<caminho>.
+        
+        Parâmetros de consulta opcionais: from e to (epoch em segundos;
+        valores negativos ou zero são relativos ao momento atual, ex:
+        from=-3600 para a última hora), step (segundos por intervalo
+        agregado), agg (avg, min, max ou last) e points (número máximo de
+        pontos, reduzidos com LTTB preservando picos).
+        """
+        try:
+            start = self._get_time_param('from')
+            end = self._get_time_param('to')
+            step = self._get_float_param('step')
+            max_points = self._get_float_param('points')
+        except ValueError as e:
+            self.send_json_response({"error": str(e)}, 400)
+            return
+        
+        aggregation = self.query.get('agg', ['avg'])[0]
+        if aggregation not in AGGREGATIONS:
+            self.send_json_response({"error": f"Agregação inválida: {aggregation}"}, 400)
+            return
+        if step is not None and step <= 0:
+            self.send_json_response({"error": "step deve ser positivo"}, 400)
+            return
+        if max_points is not None and (max_points < 3 or max_points != int(max_points)):
+            self.send_json_response({"error": "points deve ser um inteiro maior ou igual a 3"}, 400)
+            return
+        
+        points = self.metrics_history.get_metric_history(
+            metric_path, start, end, step, aggregation,
+            int(max_points) if max_points is not None else None
+        )
+        self.send_json_response(points)
+    
+    def handle_metric_stats(self, metric_path):
+        """Manipula rota /api/stats/<caminho>.
+        
+        Parâmetros de consulta opcionais: window (nome da janela, ex: 5m;
+        todas se omitido) e q (quantis separados por vírgula, ex: 0.9,0.999).
+        Sem caminho, lista as métricas acompanhadas.
+        """
+        if not metric_path:
+            self.send_json_response({
+                "metrics": metric_stats.tracked(),
+                "windows": Config.STATS_WINDOWS
+            })
+            return
+        
+        window = self.query.get('window', [None])[0]
+        try:
+            quantiles = [float(q) for q in self.query.get('q', [''])[0].split(',') if q]
+        except ValueError:
+            self.send_json_response({"error": "Parâmetro q inválido"}, 400)
+            return
+        if any(not 0 <= q <= 1 for q in quantiles):
+            self.send_json_response({"error": "Quantis devem estar entre 0 e 1"}, 400)
+            return
+        
+        try:
+            summary = metric_stats.summary(metric_path, time.time(), window, quantiles)
+        except KeyError:
+            self.send_json_response({"error": f"Janela inválida: {window}"}, 400)
+            return
+        if summary is None:
+            self.send_json_response({"error": f"Métrica sem estatísticas: {metric_path} (ver STATS_METRICS)"}, 404)
+            return
+        
+        self.send_json_response({"metric": metric_path, "windows": summary})
+    
+    def handle_profile(self):
+        """Manipula rota /api/_profile.
+        
+        Parâmetros de consulta opcionais: seconds (duração, padrão 5, até
+        Config.PROFILE_MAX_SECONDS) e mode (sample, com pilhas no formato
+        collapsed, ou cprofile, com a saída do pstats). A resposta só é
+        enviada ao fim da janela.
+        """
+        if not Config.PROFILE_ENABLED:
+            self.send_json_response({"error": "Profiler desativado (ver PROFILE_ENABLED)"}, 403)
+            return
+        
+        try:
+            seconds = self._get_float_param('seconds')
+        except ValueError as e:
+            self.send_json_response({"error": str(e)}, 400)
+            return
+        if seconds is None:
+            seconds = 5
+        if not 0 < seconds <= Config.PROFILE_MAX_SECONDS:
+            self.send_json_response({"error": f"seconds deve estar entre 0 e {Config.PROFILE_MAX_SECONDS}"}, 400)
+            return
+        
+        try:
+            _, result = profile(seconds, self.query.get('mode', [None])[0])
+        except ValueError as e:
+            self.send_json_response({"error": str(e)}, 400)
+            return
+        except ProfilerBusy:
+            self.send_json_response({"error": "Já existe um profile em andamento"}, 409)
+            return
+        
+        self.send_bytes_response(result.encode('utf-8'), 'text/plain; charset=utf-8')
+    
+    def handle_export(self):
+        """Manipula rota /api/export.
+        
+        Parâmetros de consulta: format (ndjson ou csv), from e to (como em
+        /api/metric) e metrics (lista separada por vírgulas de caminhos,
+        prefixos ou padrões fnmatch).
+        """
+        export_format = self.query.get('format', ['ndjson'])[0]
+        if export_format not in EXPORT_FORMATS:
+            self.send_json_response({"error": f"Formato inválido: {export_format}"}, 400)
+            return
+        
+        try:
+            start = self._get_time_param('from')
+            end = self._get_time_param('to')
+        except ValueError as e:
+            self.send_json_response({"error": str(e)}, 400)
+            return
+        
+        patterns = ','.join(self.query.get('metrics', [])).split(',')
+        chunks = iter_export(
+            self.metrics_history.iter_points(start, end),
+            export_format,
+            MetricFilter(patterns)
+        )
+        self.send_chunked_response(chunks, EXPORT_FORMATS[export_format], f"history.{export_format}")
+    
+    def _get_float_param(self, name):
+        """Lê um parâmetro de consulta numérico.
+        
+        Returns:
+            Valor float ou None se o parâmetro não foi informado
+            
+        Raises:
+            ValueError: Se o valor não for numérico ou não for finito
+        """
+        value = self.query.get(name, [None])[0]
+        if value is None or value == '':
+            return None
+        try:
+            number = float(value)
+        except ValueError:
+            raise ValueError(f"Parâmetro {name} inválido: {value}")
+        if not math.isfinite(number):
+            raise ValueError(f"Parâmetro {name} inválido: {value}")
+        return number
+    
+    def _get_time_param(self, name):
+        """Lê um parâmetro de tempo (epoch absoluto ou relativo ao momento atual)."""
+        value = self._get_float_param(name)
+        if value is not None and value <= 0:
+            value += time.time()
+        return value
+    
     def handle_static_file(self):
         """Manipula requisições para arquivos estáticos."""
         # Extrai o caminho do arquivo: /static/css/style.css -> css/style.css
-        file_path = self.path[8:]  # Remove '/static/'
+        file_path = self.route_path[8:]  # Remove '/static/'
         full_path = os.path.join(Config.STATIC_DIR, file_path)
         
         # Verifica se o arquivo existe
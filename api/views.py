@@ -0,0 +1,107 @@
+"""
+Camada de apresentação dos dados coletados.
+
+Os coletores emitem valores brutos (bytes, segundos, percentuais). Este
+módulo converte um snapshot em texto legível usando o esquema declarado
+pelos coletores, para clientes que não fazem a formatação por conta
+própria (ex: /api/status?format=human).
+"""
+
+from core.utils import format_bytes, format_duration
+from collectors.schema import (
+    GAUGE, BYTES, SECONDS, MILLISECONDS, MICROSECONDS, PERCENT, RATIO,
+    CELSIUS, MHZ, MBPS, DBM
+)
+
+# Formatadores por unidade
+FORMATTERS = {
+    BYTES: format_bytes,
+    SECONDS: format_duration,
+    MILLISECONDS: lambda value: f"{value} ms",
+    MICROSECONDS: lambda value: f"{value} µs",
+    PERCENT: lambda value: f"{value:.1f}%",
+    RATIO: lambda value: f"{value:.2f}",
+    CELSIUS: lambda value: f"{value:.1f}°C",
+    MHZ: lambda value: f"{value:g} MHz",
+    MBPS: lambda value: f"{value} Mbps",
+    DBM: lambda value: f"{value} dBm"
+}
+
+def format_value(value, unit):
+    """Formata um valor numérico de acordo com a unidade.
+    
+    Args:
+        value: Valor bruto
+        unit: Unidade declarada no esquema
+    
+    Returns:
+        String formatada, ou o próprio valor se a unidade não tiver formatador
+    """
+    formatter = FORMATTERS.get(unit)
+    if formatter is None:
+        return value
+    try:
+        return formatter(value)
+    except (TypeError, ValueError):
+        return value
+
+def format_snapshot(data, schema, prefix=""):
+    """Retorna uma cópia do snapshot com os valores numéricos formatados.
+    
+    Args:
+        data: Snapshot (dicionário aninhado) com valores brutos
+        schema: Instância de MetricSchema
+        prefix: Caminho do nível atual (uso interno na recursão)
+    
+    Returns:
+        Novo dicionário com a mesma estrutura e valores formatados
+    """
+    if isinstance(data, dict):
+        items = data.items()
+    elif isinstance(data, list):
+        items = enumerate(data)
+    else:
+        return data
+    
+    formatted = {} if isinstance(data, dict) else [None] * len(data)
+    for key, value in items:
+        path = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, (dict, list)):
+            formatted[key] = format_snapshot(value, schema, path)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            spec = schema.lookup(path)
+            formatted[key] = format_value(value, spec[1]) if spec else value
+        else:
+            formatted[key] = value
+    
+    return formatted
+
+def build_catalog(latest, schema):
+    """Monta o catálogo das métricas disponíveis no histórico.
+    
+    Args:
+        latest: Dicionário caminho -> (timestamp, valor) de MetricsHistory.get_latest
+        schema: Instância de MetricSchema
+        
+    Returns:
+        Lista de dicionários com caminho, tipo, unidade, valor atual e
+        timestamp (epoch) do valor
+    """
+    catalog = []
+    for path, (timestamp, value) in latest.items():
+        spec = schema.lookup(path)
+        if spec:
+            kind, unit = spec
+        else:
+            # Métricas não declaradas: numéricas são gauges sem unidade,
+            # as demais são informativas (texto)
+            kind = GAUGE if isinstance(value, (int, float)) else "info"
+            unit = None
+        catalog.append({
+            "path": path,
+            "type": kind,
+            "unit": unit,
+            "value": value,
+            "timestamp": timestamp
+        })
+    return catalog
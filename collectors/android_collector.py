@@ -10,11 +10,29 @@ import re
 from datetime import datetime
 
 from collectors.base_collector import BaseCollector
-from core.utils import get_timestamp, safe_parse_json, extract_value_with_regex
+from core.utils import get_timestamp, safe_parse_json
+from core.facts import facts
+from core.battery import battery
+from collectors.schema import GAUGE, PERCENT, CELSIUS
 
 class AndroidCollector(BaseCollector):
     """Coleta informações específicas do sistema Android."""
     
+    schema = {
+        "battery.percentage": (GAUGE, PERCENT),
+        "battery.temperature": (GAUGE, CELSIUS),
+        "battery.current": (GAUGE, "microamperes"),
+        "sensors.light.value": (GAUGE, "lux"),
+        "sensors.accelerometer.values.{axis}": (GAUGE, "m/s2")
+    }
+    
+    commands = [
+        ['termux-battery-status'],  # via core.battery
+        ['termux-sensor', '-l'],
+        ['termux-sensor', '-s', 'accelerometer', '-n', '1'],
+        ['termux-sensor', '-s', 'light', '-n', '1']
+    ]
+    
     def _collect_data(self):
         """Coleta dados específicos do Android.
         
@@ -23,7 +41,7 @@ class AndroidCollector(BaseCollector):
         """
         data = {
             "timestamp": get_timestamp(),
-            "device_info": self._get_device_info(),
+            "device_info": facts.get("device_info", {"model": "Galaxy S10+"}),
             "battery": self._get_battery_info()
         }
         
@@ -38,135 +56,13 @@ class AndroidCollector(BaseCollector):
             
         return data
     
-    def _get_device_info(self):
-        """Obtém informações do dispositivo Android.
-        
-        Returns:
-            Dicionário com informações do dispositivo
-        """
-        device_info = {}
-        
-        # Tenta via termux-api
-        try:
-            output = self.run_command(['termux-info'])
-            info = safe_parse_json(output)
-            
-            if info:
-                # Extrai informações relevantes
-                if "DEVICE_MANUFACTURER" in info:
-                    device_info["manufacturer"] = info["DEVICE_MANUFACTURER"]
-                if "DEVICE_MODEL" in info:
-                    device_info["model"] = info["DEVICE_MODEL"]
-                if "ANDROID_VERSION" in info:
-                    device_info["android_version"] = info["ANDROID_VERSION"]
-                if "ANDROID_SDK" in info:
-                    device_info["android_sdk"] = info["ANDROID_SDK"]
-                    
-                return device_info
-        except Exception:
-            pass
-            
-        # Tenta método alternativo via getprop
-        try:
-            # Fabricante
-            manufacturer = self.run_command(['getprop', 'ro.product.manufacturer'])
-            if manufacturer:
-                device_info["manufacturer"] = manufacturer
-                
-            # Modelo
-            model = self.run_command(['getprop', 'ro.product.model'])
-            if model:
-                device_info["model"] = model
-                
-            # Versão do Android
-            android_version = self.run_command(['getprop', 'ro.build.version.release'])
-            if android_version:
-                device_info["android_version"] = android_version
-                
-            # SDK do Android
-            android_sdk = self.run_command(['getprop', 'ro.build.version.sdk'])
-            if android_sdk:
-                device_info["android_sdk"] = android_sdk
-                
-            return device_info
-        except Exception:
-            # Informações mínimas
-            return {"model": "Galaxy S10+"}
-    
     def _get_battery_info(self):
         """Obtém informações detalhadas da bateria.
         
         Returns:
             Dicionário com informações da bateria
         """
-        try:
-            # Tenta via termux-api
-            output = self.run_command(['termux-battery-status'])
-            battery_info = safe_parse_json(output)
-            
-            if battery_info:
-                return battery_info
-                
-            # Se não conseguiu parsear JSON, tenta extrair manualmente
-            battery_info = {}
-            
-            percentage = extract_value_with_regex(output, r'percentage.*?(\d+)')
-            if percentage:
-                battery_info["percentage"] = int(percentage)
-            
-            status = extract_value_with_regex(output, r'status.*?(\w+)')
-            if status:
-                battery_info["status"] = status
-            
-            temperature = extract_value_with_regex(output, r'temperature.*?(\d+)')
-            if temperature:
-                battery_info["temperature"] = float(temperature) / 10
-                
-            health = extract_value_with_regex(output, r'health.*?(\w+)')
-            if health:
-                battery_info["health"] = health
-                
-            return battery_info
-        except Exception:
-            # Tenta método alternativo via arquivos do sistema
-            try:
-                battery_info = {}
-                
-                # Verificar capacidade
-                try:
-                    with open('/sys/class/power_supply/battery/capacity', 'r') as f:
-                        battery_info["percentage"] = int(f.read().strip())
-                except:
-                    pass
-                
-                # Verificar status
-                try:
-                    with open('/sys/class/power_supply/battery/status', 'r') as f:
-                        battery_info["status"] = f.read().strip()
-                except:
-                    pass
-                
-                # Verificar temperatura
-                try:
-                    with open('/sys/class/power_supply/battery/temp', 'r') as f:
-                        temp = int(f.read().strip())
-                        # A maioria dos dispositivos armazena em millicelsius
-                        if temp > 1000:
-                            temp /= 10
-                        battery_info["temperature"] = temp / 10
-                except:
-                    pass
-                
-                # Verificar saúde
-                try:
-                    with open('/sys/class/power_supply/battery/health', 'r') as f:
-                        battery_info["health"] = f.read().strip()
-                except:
-                    pass
-                
-                return battery_info
-            except Exception:
-                return None
+        return battery.read()
     
     def _get_sensors_info(self):
         """Obtém informações dos sensores do dispositivo.
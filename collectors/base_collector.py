@@ -7,42 +7,93 @@ todos os coletores de informações do sistema.
 
 import time
 import logging
+import threading
 from datetime import datetime
 
 from config.settings import Config
-from core.utils import run_command, get_timestamp
+from core import perf
+from core.utils import run_command, run_commands, get_timestamp
 
 class BaseCollector:
     """Classe base para todos os coletores de dados."""
     
+    # Prazo máximo (segundos) para a resposta aguardar este coletor
+    # (None usa Config.RESPONSE_DEADLINE)
+    deadline = None
+    
+    # Intervalo mínimo (segundos) entre coletas
+    # (None usa Config.COLLECTION_INTERVAL)
+    interval = None
+    
+    # Esquema das métricas numéricas: padrão de caminho -> (tipo, unidade)
+    # (ver collectors.schema)
+    schema = {}
+    
+    # Comandos externos que o coletor pode executar, em ordem de uso
+    # (medidos por tools/bench_commands.py)
+    commands = []
+    
     def __init__(self):
         """Inicializa o coletor."""
         self.last_collection_time = 0
+        self.last_success_time = None
         self.last_data = None
         self.name = self.__class__.__name__
+        self._lock = threading.Lock()
     
-    def collect(self):
+    def collect(self, force=False):
         """Coleta dados se o intervalo de coleta foi atingido.
         
+        Args:
+            force: Se True, coleta mesmo que o intervalo não tenha sido atingido
+        
         Returns:
             Dados coletados ou dados em cache se o intervalo não foi atingido
         """
-        current_time = time.time()
-        if (current_time - self.last_collection_time) >= Config.COLLECTION_INTERVAL:
-            try:
-                logging.debug(f"Coletando dados de {self.name}")
-                self.last_data = self._collect_data()
-                self.last_collection_time = current_time
-            except Exception as e:
-                logging.error(f"Erro na coleta de dados de {self.name}: {e}")
-                # Retorna dados anteriores ou erro
-                if not self.last_data:
-                    self.last_data = {
-                        "error": str(e),
-                        "timestamp": get_timestamp()
-                    }
+        with self._lock:
+            current_time = time.time()
+            interval = self.interval or Config.COLLECTION_INTERVAL
+            if force or (current_time - self.last_collection_time) >= interval:
+                start = time.perf_counter() if perf.enabled else None
+                try:
+                    logging.debug(f"Coletando dados de {self.name}")
+                    self.last_data = self._collect_data()
+                    self.last_collection_time = current_time
+                    self.last_success_time = time.time()
+                except Exception as e:
+                    logging.error(f"Erro na coleta de dados de {self.name}: {e}")
+                    # Retorna dados anteriores ou erro
+                    if not self.last_data:
+                        self.last_data = {
+                            "error": str(e),
+                            "timestamp": get_timestamp()
+                        }
+                if start is not None:
+                    perf.observe("collector_duration_seconds", self.name, time.perf_counter() - start)
+            
+            return self.last_data
+    
+    def get_stale_data(self):
+        """Retorna os últimos dados válidos marcados como desatualizados.
+        
+        Usado quando o coletor não responde dentro do prazo. Não bloqueia
+        mesmo que uma coleta esteja em andamento.
+        
+        Returns:
+            Cópia dos últimos dados com os campos "stale" e "age" (segundos)
+        """
+        if self.last_data is None:
+            return {
+                "error": f"{self.name} não respondeu dentro do prazo",
+                "stale": True,
+                "age": None,
+                "timestamp": get_timestamp()
+            }
         
-        return self.last_data
+        data = dict(self.last_data)
+        data["stale"] = True
+        data["age"] = round(time.time() - self.last_success_time, 1) if self.last_success_time else None
+        return data
     
     def _collect_data(self):
         """Método a ser implementado pelas subclasses.
@@ -67,3 +118,16 @@ class BaseCollector:
             String com a saída do comando
         """
         return run_command(command, timeout, shell)
+    
+    def run_commands(self, commands, timeout=None, shell=False):
+        """Executa vários comandos shell concorrentemente.
+        
+        Args:
+            commands: Lista de comandos (cada um lista ou string)
+            timeout: Timeout por comando em segundos (usa Config.COMMAND_TIMEOUT se None)
+            shell: Se True, executa comandos em shell
+            
+        Returns:
+            Lista com a saída de cada comando ou a exceção que ele levantou
+        """
+        return run_commands(commands, timeout, shell)
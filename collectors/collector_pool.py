@@ -0,0 +1,88 @@
+"""
+Execução paralela de coletores.
+
+Este módulo implementa a execução concorrente dos coletores em um
+pool de threads, com prazo global de resposta e prazos individuais
+por coletor. Coletores que não respondem a tempo têm seus últimos
+dados válidos retornados e marcados como desatualizados.
+"""
+
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from config.settings import Config
+
+class CollectorPool:
+    """Executa coletores em paralelo com prazos e resultados parciais."""
+    
+    def __init__(self, collectors, max_workers=None):
+        """Inicializa o pool.
+        
+        Args:
+            collectors: Dicionário nome -> instância de BaseCollector
+            max_workers: Número de threads (usa Config.COLLECTOR_WORKERS se None)
+        """
+        self.collectors = collectors
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or Config.COLLECTOR_WORKERS,
+            thread_name_prefix="collector"
+        )
+        self._pending = {}
+        self._lock = threading.Lock()
+    
+    def collect_all(self, names=None, deadline=None):
+        """Coleta dados de vários coletores em paralelo.
+        
+        Coletas ainda em andamento de chamadas anteriores são reaproveitadas,
+        de modo que um coletor travado ocupa no máximo uma thread.
+        
+        Args:
+            names: Nomes dos coletores (todos se None)
+            deadline: Prazo global em segundos (usa Config.RESPONSE_DEADLINE se None)
+        
+        Returns:
+            Dicionário nome -> dados coletados (ou dados desatualizados)
+        """
+        start = time.monotonic()
+        overall = deadline if deadline is not None else Config.RESPONSE_DEADLINE
+        names = list(names) if names is not None else list(self.collectors)
+        
+        futures = {}
+        with self._lock:
+            for name in names:
+                future = self._pending.get(name)
+                if future is None or future.done():
+                    future = self._executor.submit(self.collectors[name].collect)
+                    self._pending[name] = future
+                futures[name] = future
+        
+        results = {}
+        for name, future in futures.items():
+            collector = self.collectors[name]
+            limit = min(overall, collector.deadline or overall)
+            remaining = start + limit - time.monotonic()
+            try:
+                results[name] = future.result(timeout=max(0, remaining))
+            except FutureTimeoutError:
+                logging.warning(f"Coletor {name} excedeu o prazo de {limit}s, usando dados anteriores")
+                results[name] = collector.get_stale_data()
+        
+        return results
+    
+    def collect(self, name, deadline=None):
+        """Coleta dados de um único coletor respeitando o prazo.
+        
+        Args:
+            name: Nome do coletor
+            deadline: Prazo em segundos (usa Config.RESPONSE_DEADLINE se None)
+        
+        Returns:
+            Dados coletados (ou dados desatualizados)
+        """
+        return self.collect_all([name], deadline)[name]
+    
+    def shutdown(self):
+        """Encerra o pool sem aguardar coletas em andamento."""
+        self._executor.shutdown(wait=False)
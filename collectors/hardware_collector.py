@@ -7,15 +7,48 @@ como CPU, memória e bateria.
 
 import os
 import re
-import json
 from datetime import datetime
 
 from collectors.base_collector import BaseCollector
-from core.utils import get_timestamp, extract_value_with_regex, format_bytes
+from core.utils import get_timestamp, extract_value_with_regex
+from core.facts import facts
+from core.battery import battery
+from core.sysfs import sysfs, ThermalZones, CpuFreqPolicies
+from collectors.schema import GAUGE, BYTES, PERCENT, RATIO, CELSIUS, MHZ, COUNT
 
 class HardwareCollector(BaseCollector):
     """Coleta informações de hardware do dispositivo."""
     
+    schema = {
+        "cpu.usage": (GAUGE, PERCENT),
+        "cpu.cores.count": (GAUGE, COUNT),
+        "cpu.frequency": (GAUGE, MHZ),
+        "cpu.cpufreq.policies.{policy}.*_mhz": (GAUGE, MHZ),
+        "cpu.cpufreq.policies.{policy}.time_in_state.{freq_mhz}": (GAUGE, RATIO),
+        "cpu.cpufreq.cores.{core}.cur_mhz": (GAUGE, MHZ),
+        "memory.percent": (GAUGE, PERCENT),
+        "memory.swap.percent": (GAUGE, PERCENT),
+        "memory.zram.{device}.compression_ratio": (GAUGE, RATIO),
+        "memory.zram.{device}.*": (GAUGE, BYTES),
+        "memory.swap.*": (GAUGE, BYTES),
+        "memory.*": (GAUGE, BYTES),
+        "battery.percentage": (GAUGE, PERCENT),
+        "battery.temperature": (GAUGE, CELSIUS),
+        "temperature.{zone}": (GAUGE, CELSIUS)
+    }
+    
+    commands = [
+        ['top', '-bn1'],
+        ['termux-battery-status']  # via core.battery
+    ]
+    
+    def __init__(self):
+        """Inicializa o coletor e seus leitores de sysfs."""
+        super().__init__()
+        self._thermal_zones = ThermalZones(sysfs)
+        self._cpufreq = CpuFreqPolicies(sysfs)
+        self._zram_devices = None
+    
     def _collect_data(self):
         """Coleta dados de hardware.
         
@@ -46,9 +79,18 @@ class HardwareCollector(BaseCollector):
         """
         cpu_info = {
             "usage": self._get_cpu_usage(),
-            "cores": self._get_cpu_cores(),
+            "cores": facts.get("cpu_cores"),
             "frequency": self._get_cpu_frequency()
         }
+        
+        # Frequência por core e por cluster, com residência por frequência
+        try:
+            cpufreq = self._cpufreq.read()
+            if cpufreq:
+                cpu_info["cpufreq"] = cpufreq
+        except Exception:
+            pass
+            
         return cpu_info
     
     def _get_cpu_usage(self):
@@ -83,64 +125,22 @@ class HardwareCollector(BaseCollector):
         # Se chegou aqui, não conseguiu obter a CPU
         return None
     
-    def _get_cpu_cores(self):
-        """Obtém informações sobre os cores da CPU.
-        
-        Returns:
-            Dicionário com informações dos cores ou None se não conseguir obter
-        """
-        try:
-            # Tenta ler /proc/cpuinfo
-            if os.path.exists('/proc/cpuinfo'):
-                with open('/proc/cpuinfo', 'r') as f:
-                    cpuinfo = f.read()
-                
-                # Conta o número de processadores
-                processors = cpuinfo.count('processor')
-                if processors > 0:
-                    # Extrai modelo do processador
-                    model_name = extract_value_with_regex(cpuinfo, r'model name\s+:\s+(.*)', 'Desconhecido')
-                    
-                    return {
-                        "count": processors,
-                        "model": model_name
-                    }
-        except Exception as e:
-            pass
-        
-        # Tenta via nproc
-        try:
-            core_count = int(self.run_command(['nproc']).strip())
-            return {
-                "count": core_count,
-                "model": "Desconhecido"
-            }
-        except Exception as e:
-            pass
-            
-        return None
-    
     def _get_cpu_frequency(self):
         """Obtém a frequência atual da CPU.
         
         Returns:
             Frequência em MHz ou None se não conseguir obter
         """
-        try:
-            # Tenta ler /sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq
-            if os.path.exists('/sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq'):
-                with open('/sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq', 'r') as f:
-                    freq = int(f.read().strip())
-                    # Converte de KHz para MHz
-                    return freq / 1000
-        except Exception as e:
-            pass
+        # Tenta ler /sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq
+        freq = sysfs.read_int('/sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq')
+        if freq is not None:
+            # Converte de KHz para MHz
+            return freq / 1000
             
         # Tenta via /proc/cpuinfo
         try:
             if os.path.exists('/proc/cpuinfo'):
-                with open('/proc/cpuinfo', 'r') as f:
-                    cpuinfo = f.read()
+                cpuinfo = sysfs.read('/proc/cpuinfo')
                 
                 # Extrai frequência
                 freq = extract_value_with_regex(cpuinfo, r'cpu MHz\s+:\s+(\d+\.\d+)', None)
@@ -152,54 +152,110 @@ class HardwareCollector(BaseCollector):
         return None
     
     def _get_memory_info(self):
-        """Obtém informações de memória.
+        """Obtém o modelo de memória a partir de /proc/meminfo e do zram.
+        
+        Todos os valores são retornados em bytes; a formatação fica a
+        cargo da camada de apresentação. "used" considera a memória
+        disponível (MemAvailable), não apenas a livre, para não contar
+        page cache recuperável como uso.
         
         Returns:
             Dicionário com informações de memória
         """
         try:
-            # Tenta usar o comando free
-            output = self.run_command(['free', '-b'])
-            
-            lines = output.split('\n')
-            if len(lines) >= 2:
-                parts = lines[1].split()
-                if len(parts) >= 3:
-                    total = int(parts[1])
-                    used = int(parts[2])
-                    percent = (used / total) * 100
-                    return {
-                        "total": format_bytes(total),
-                        "used": format_bytes(used),
-                        "percent": round(percent, 2)
-                    }
-            
-            raise Exception("Não foi possível analisar a saída do comando 'free'")
-        except Exception as e:
-            # Tenta usar /proc/meminfo
+            meminfo = self._read_meminfo()
+        except Exception:
+            return {"total": None, "used": None, "percent": 0}
+        
+        total = meminfo.get("MemTotal", 0)
+        free = meminfo.get("MemFree", 0)
+        buffers = meminfo.get("Buffers", 0)
+        cached = meminfo.get("Cached", 0)
+        
+        # Kernels anteriores ao 3.14 não expõem MemAvailable
+        available = meminfo.get("MemAvailable", free + buffers + cached)
+        used = total - available
+        
+        swap_total = meminfo.get("SwapTotal", 0)
+        swap_free = meminfo.get("SwapFree", 0)
+        swap_used = swap_total - swap_free
+        
+        memory = {
+            "total": total,
+            "available": available,
+            "used": used,
+            "free": free,
+            "buffers": buffers,
+            "cached": cached,
+            "shmem": meminfo.get("Shmem", 0),
+            "dirty": meminfo.get("Dirty", 0),
+            "percent": round(used / total * 100, 2) if total else 0,
+            "swap": {
+                "total": swap_total,
+                "free": swap_free,
+                "used": swap_used,
+                "cached": meminfo.get("SwapCached", 0),
+                "percent": round(swap_used / swap_total * 100, 2) if swap_total else 0
+            }
+        }
+        
+        zram = self._get_zram_info()
+        if zram:
+            memory["zram"] = zram
+        
+        return memory
+    
+    def _read_meminfo(self):
+        """Lê /proc/meminfo convertendo todos os campos para números.
+        
+        Returns:
+            Dicionário campo -> valor (em bytes para campos em kB)
+        """
+        meminfo = {}
+        for line in sysfs.read('/proc/meminfo').split('\n'):
+            key, _, value = line.partition(':')
+            parts = value.split()
+            if not parts:
+                continue
             try:
-                with open('/proc/meminfo', 'r') as f:
-                    meminfo = f.read()
-                
-                total_match = re.search(r'MemTotal:\s+(\d+)', meminfo)
-                free_match = re.search(r'MemFree:\s+(\d+)', meminfo)
-                
-                if total_match and free_match:
-                    total_kb = int(total_match.group(1))
-                    free_kb = int(free_match.group(1))
-                    used_kb = total_kb - free_kb
-                    percent = (used_kb / total_kb) * 100
-                    
-                    return {
-                        "total": format_bytes(total_kb * 1024),
-                        "used": format_bytes(used_kb * 1024),
-                        "percent": round(percent, 2)
-                    }
-            except Exception as e:
-                pass
-                
-            # Se tudo falhar
-            return {"total": "Desconhecido", "used": "Desconhecido", "percent": 0}
+                number = int(parts[0])
+            except ValueError:
+                continue
+            meminfo[key] = number * 1024 if len(parts) > 1 and parts[1] == 'kB' else number
+        return meminfo
+    
+    def _get_zram_info(self):
+        """Obtém estatísticas dos dispositivos zram (swap comprimido em RAM).
+        
+        Returns:
+            Dicionário dispositivo -> estatísticas em bytes, ou None se não houver zram
+        """
+        if self._zram_devices is None:
+            try:
+                self._zram_devices = sorted(d for d in os.listdir('/sys/block') if d.startswith('zram'))
+            except OSError:
+                self._zram_devices = []
+        
+        zram = {}
+        for device in self._zram_devices:
+            try:
+                fields = [int(field) for field in sysfs.read(f'/sys/block/{device}/mm_stat').split()]
+            except (OSError, ValueError):
+                continue
+            if len(fields) < 3:
+                continue
+            
+            # mm_stat: orig_data_size compr_data_size mem_used_total mem_limit mem_used_max ...
+            orig_size, compr_size, mem_used = fields[0], fields[1], fields[2]
+            zram[device] = {
+                "disksize": sysfs.read_int(f'/sys/block/{device}/disksize', 0),
+                "orig_data_size": orig_size,
+                "compr_data_size": compr_size,
+                "mem_used_total": mem_used,
+                "compression_ratio": round(orig_size / compr_size, 2) if compr_size else None
+            }
+        
+        return zram or None
     
     def _get_battery_info(self):
         """Tenta obter informações de bateria.
@@ -207,58 +263,7 @@ class HardwareCollector(BaseCollector):
         Returns:
             Dicionário com informações de bateria ou None se não conseguir obter
         """
-        try:
-            # Tentar via termux-api
-            output = self.run_command(['termux-battery-status'])
-            
-            try:
-                # Tentar parse do JSON
-                battery_info = json.loads(output)
-                return battery_info
-            except json.JSONDecodeError:
-                # Se falhar, tentar extrair valores manualmente
-                battery_info = {}
-                
-                percentage = extract_value_with_regex(output, r'percentage.*?(\d+)')
-                if percentage:
-                    battery_info["percentage"] = int(percentage)
-                
-                status = extract_value_with_regex(output, r'status.*?(\w+)')
-                if status:
-                    battery_info["status"] = status
-                
-                temperature = extract_value_with_regex(output, r'temperature.*?(\d+)')
-                if temperature:
-                    battery_info["temperature"] = float(temperature) / 10
-                
-                return battery_info
-        except Exception as e:
-            # Tentar método alternativo: arquivos diretos do sistema
-            try:
-                battery_info = {}
-                
-                # Verificar capacidade
-                if os.path.exists('/sys/class/power_supply/battery/capacity'):
-                    with open('/sys/class/power_supply/battery/capacity', 'r') as f:
-                        battery_info["percentage"] = int(f.read().strip())
-                
-                # Verificar status
-                if os.path.exists('/sys/class/power_supply/battery/status'):
-                    with open('/sys/class/power_supply/battery/status', 'r') as f:
-                        battery_info["status"] = f.read().strip()
-                
-                # Verificar temperatura
-                if os.path.exists('/sys/class/power_supply/battery/temp'):
-                    with open('/sys/class/power_supply/battery/temp', 'r') as f:
-                        temp = int(f.read().strip())
-                        # A maioria dos dispositivos armazena em millicelsius
-                        if temp > 1000:
-                            temp /= 10
-                        battery_info["temperature"] = temp / 10
-                
-                return battery_info
-            except Exception as e:
-                return None
+        return battery.read()
     
     def _get_temperature_info(self):
         """Obtém informações de temperatura do sistema.
@@ -266,34 +271,9 @@ class HardwareCollector(BaseCollector):
         Returns:
             Dicionário com informações de temperatura ou None se não conseguir obter
         """
-        temps = {}
-        
-        # Tenta ler temperaturas do diretório thermal
         try:
-            thermal_dir = '/sys/class/thermal/'
-            if os.path.exists(thermal_dir) and os.path.isdir(thermal_dir):
-                for zone in os.listdir(thermal_dir):
-                    if zone.startswith('thermal_zone'):
-                        zone_path = os.path.join(thermal_dir, zone)
-                        
-                        # Tenta ler o tipo da zona
-                        type_path = os.path.join(zone_path, 'type')
-                        if os.path.exists(type_path):
-                            with open(type_path, 'r') as f:
-                                zone_type = f.read().strip()
-                        else:
-                            zone_type = zone
-                        
-                        # Tenta ler a temperatura
-                        temp_path = os.path.join(zone_path, 'temp')
-                        if os.path.exists(temp_path):
-                            with open(temp_path, 'r') as f:
-                                temp_value = int(f.read().strip())
-                                # Converte para Celsius (geralmente em millicelsius)
-                                if temp_value > 1000:
-                                    temp_value /= 1000
-                                temps[zone_type] = round(temp_value, 1)
+            temps = self._thermal_zones.read_temperatures()
         except Exception as e:
-            pass
+            temps = None
             
         return temps if temps else None
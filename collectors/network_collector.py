@@ -12,11 +12,47 @@ import subprocess
 from datetime import datetime
 
 from collectors.base_collector import BaseCollector
-from core.utils import get_timestamp, extract_value_with_regex, format_bytes
+from core.utils import get_timestamp, extract_value_with_regex
+from core.fallback import FallbackChain
+from collectors.schema import GAUGE, COUNTER, BYTES, COUNT, MHZ, MBPS, DBM
 
 class NetworkCollector(BaseCollector):
     """Coleta informações de rede do dispositivo."""
     
+    schema = {
+        "interfaces.{interface}.rx_bytes": (COUNTER, BYTES),
+        "interfaces.{interface}.tx_bytes": (COUNTER, BYTES),
+        "interfaces.{interface}.rx_packets": (COUNTER, COUNT),
+        "interfaces.{interface}.tx_packets": (COUNTER, COUNT),
+        "connections.*": (GAUGE, COUNT),
+        "wifi.frequency": (GAUGE, MHZ),
+        "wifi.signal_strength": (GAUGE, DBM),
+        "wifi.link_speed": (GAUGE, MBPS)
+    }
+    
+    commands = [
+        ['hostname', '-I'],
+        ['ifconfig'],
+        ['ip', 'addr'],
+        ['ip', 'addr', 'show', 'lo'],  # um por interface
+        ['termux-wifi-connectioninfo'],
+        ['netstat', '-tuln'],
+        ['ss', '-tuln']
+    ]
+    
+    def __init__(self):
+        """Inicializa o coletor e suas cadeias de fallback."""
+        super().__init__()
+        
+        # Métodos para obter o IP, em ordem de prioridade
+        self._ip_chain = FallbackChain("network.ip", [
+            self._get_ip_socket,
+            self._get_ip_hostname,
+            self._get_ip_ifconfig,
+            self._get_ip_ip_addr,
+            self._get_ip_termux_api
+        ], validator=lambda ip: bool(ip) and ip not in ["127.0.0.1", "localhost"])
+    
     def _collect_data(self):
         """Coleta dados de rede.
         
@@ -47,25 +83,7 @@ class NetworkCollector(BaseCollector):
         Returns:
             String com o endereço IP ou "Desconhecido" se não conseguir obter
         """
-        # Lista de métodos para obter o IP, em ordem de prioridade
-        ip_methods = [
-            self._get_ip_socket,
-            self._get_ip_hostname,
-            self._get_ip_ifconfig,
-            self._get_ip_ip_addr,
-            self._get_ip_termux_api
-        ]
-        
-        # Tenta cada método até obter sucesso
-        for method in ip_methods:
-            try:
-                ip = method()
-                if ip and ip not in ["127.0.0.1", "localhost"]:
-                    return ip
-            except Exception:
-                continue
-                
-        return "Desconhecido"
+        return self._ip_chain.run(default="Desconhecido")
     
     def _get_ip_socket(self):
         """Obtém IP usando socket."""
@@ -141,22 +159,23 @@ class NetworkCollector(BaseCollector):
                             if len(stats) >= 16:
                                 interface_info = {
                                     "name": interface_name,
-                                    "rx_bytes": format_bytes(int(stats[0])),
-                                    "tx_bytes": format_bytes(int(stats[8])),
+                                    "rx_bytes": int(stats[0]),
+                                    "tx_bytes": int(stats[8]),
                                     "rx_packets": int(stats[1]),
                                     "tx_packets": int(stats[9])
                                 }
-                                
-                                # Tenta obter IP específico da interface
-                                try:
-                                    output = self.run_command(['ip', 'addr', 'show', interface_name])
-                                    ip_match = re.search(r'inet\s+(\d+\.\d+\.\d+\.\d+)', output)
-                                    if ip_match:
-                                        interface_info["ip"] = ip_match.group(1)
-                                except Exception:
-                                    pass
-                                    
                                 interfaces.append(interface_info)
+                
+                # Obtém o IP de cada interface com comandos concorrentes
+                outputs = self.run_commands(
+                    [['ip', 'addr', 'show', iface["name"]] for iface in interfaces]
+                )
+                for interface_info, output in zip(interfaces, outputs):
+                    if isinstance(output, Exception):
+                        continue
+                    ip_match = re.search(r'inet\s+(\d+\.\d+\.\d+\.\d+)', output)
+                    if ip_match:
+                        interface_info["ip"] = ip_match.group(1)
         except Exception as e:
             # Tenta método alternativo via ifconfig
             try:
@@ -184,9 +203,9 @@ class NetworkCollector(BaseCollector):
                                 tx_bytes = extract_value_with_regex(block, r'TX bytes:(\d+)', None)
                                 
                                 if rx_bytes:
-                                    interface_info["rx_bytes"] = format_bytes(int(rx_bytes))
+                                    interface_info["rx_bytes"] = int(rx_bytes)
                                 if tx_bytes:
-                                    interface_info["tx_bytes"] = format_bytes(int(tx_bytes))
+                                    interface_info["tx_bytes"] = int(tx_bytes)
                                     
                                 interfaces.append(interface_info)
             except Exception:
@@ -275,7 +294,7 @@ class NetworkCollector(BaseCollector):
                 
             link_speed = extract_value_with_regex(output, r'"link_speed":\s*(\d+)')
             if link_speed:
-                wifi_info["link_speed"] = f"{link_speed} Mbps"
+                wifi_info["link_speed"] = int(link_speed)
                 
             return wifi_info if wifi_info else None
         except Exception:
@@ -0,0 +1,111 @@
+"""
+Coletor de Pressure Stall Information (PSI).
+
+Este módulo implementa a coleta das métricas de pressão do kernel
+(/proc/pressure/{cpu,memory,io}), que indicam quanto tempo as tarefas
+ficaram paradas esperando por CPU, memória ou I/O.
+"""
+
+import os
+import time
+
+from collectors.base_collector import BaseCollector
+from core.utils import get_timestamp
+from core.sysfs import sysfs
+from config.settings import Config
+from collectors.schema import GAUGE, COUNTER, PERCENT, MICROSECONDS
+
+PRESSURE_DIR = '/proc/pressure'
+PRESSURE_RESOURCES = ('cpu', 'memory', 'io')
+
+class PressureCollector(BaseCollector):
+    """Coleta métricas de PSI em alta frequência."""
+    
+    # A leitura de /proc/pressure é barata: coleta em intervalo menor
+    interval = Config.PSI_SAMPLE_INTERVAL
+    
+    schema = {
+        "{resource}.{scope}.avg*": (GAUGE, PERCENT),
+        "{resource}.{scope}.total": (COUNTER, MICROSECONDS),
+        "{resource}.{scope}.stall_us": (GAUGE, MICROSECONDS),
+        "{resource}.{scope}.stall_percent": (GAUGE, PERCENT)
+    }
+    
+    def __init__(self):
+        """Inicializa o coletor."""
+        super().__init__()
+        self._last_totals = {}
+        self._last_sample_time = None
+    
+    @staticmethod
+    def is_available():
+        """Verifica se o kernel expõe PSI.
+        
+        Returns:
+            True se /proc/pressure existir
+        """
+        return os.path.exists(os.path.join(PRESSURE_DIR, 'cpu'))
+    
+    def _collect_data(self):
+        """Coleta dados de pressão de CPU, memória e I/O.
+        
+        Returns:
+            Dicionário recurso -> linhas "some"/"full" com médias e deltas
+        """
+        now = time.monotonic()
+        elapsed = now - self._last_sample_time if self._last_sample_time else None
+        self._last_sample_time = now
+        
+        data = {"timestamp": get_timestamp()}
+        for resource in PRESSURE_RESOURCES:
+            try:
+                content = sysfs.read(os.path.join(PRESSURE_DIR, resource))
+            except OSError:
+                continue
+            data[resource] = self._parse_pressure(resource, content, elapsed)
+        
+        return data
+    
+    def _parse_pressure(self, resource, content, elapsed):
+        """Interpreta o conteúdo de um arquivo de PSI.
+        
+        Args:
+            resource: Nome do recurso (cpu, memory, io)
+            content: Conteúdo do arquivo
+            elapsed: Segundos desde a amostra anterior (None na primeira)
+        
+        Returns:
+            Dicionário "some"/"full" -> avg10, avg60, avg300 (percentuais),
+            total (microssegundos), stall_us (delta desde a amostra anterior)
+            e stall_percent (fração do intervalo com tarefas paradas)
+        """
+        pressure = {}
+        for line in content.split('\n'):
+            parts = line.split()
+            if not parts:
+                continue
+            
+            kind = parts[0]
+            fields = {}
+            for part in parts[1:]:
+                key, _, value = part.partition('=')
+                try:
+                    fields[key] = int(value) if key == 'total' else float(value)
+                except ValueError:
+                    continue
+            
+            total = fields.get('total')
+            previous = self._last_totals.get((resource, kind))
+            self._last_totals[(resource, kind)] = total
+            
+            if total is not None and previous is not None and elapsed:
+                stall_us = max(0, total - previous)
+                fields['stall_us'] = stall_us
+                fields['stall_percent'] = round(min(100.0, stall_us / (elapsed * 1e6) * 100), 2)
+            else:
+                fields['stall_us'] = None
+                fields['stall_percent'] = None
+            
+            pressure[kind] = fields
+        
+        return pressure
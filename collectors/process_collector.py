@@ -10,29 +10,53 @@ import re
 from datetime import datetime
 
 from collectors.base_collector import BaseCollector
-from core.utils import get_timestamp, format_bytes
+from core.utils import get_timestamp
 from config.settings import Config
+from collectors.schema import GAUGE, BYTES, PERCENT, COUNT
 
 class ProcessCollector(BaseCollector):
     """Coleta informações sobre processos em execução."""
     
+    schema = {
+        "summary.*": (GAUGE, COUNT),
+        "top_processes.{rank}.cpu_percent": (GAUGE, PERCENT),
+        "top_processes.{rank}.mem_percent": (GAUGE, PERCENT),
+        "top_processes.{rank}.vsz": (GAUGE, BYTES),
+        "top_processes.{rank}.rss": (GAUGE, BYTES)
+    }
+    
+    commands = [
+        ['ps', 'aux'],
+        ['ps', 'aux', '--sort=-pcpu,-pmem'],
+        ['top', '-b', '-n', '1']
+    ]
+    
     def _collect_data(self):
         """Coleta dados de processos.
         
         Returns:
             Dicionário com informações de processos
         """
+        # Executa as duas listagens do ps concorrentemente
+        summary_output, top_output = self.run_commands([
+            ['ps', 'aux'],
+            ['ps', 'aux', '--sort=-pcpu,-pmem']
+        ])
+        
         data = {
             "timestamp": get_timestamp(),
-            "summary": self._get_process_summary(),
-            "top_processes": self._get_top_processes()
+            "summary": self._get_process_summary(summary_output),
+            "top_processes": self._get_top_processes(top_output)
         }
         
         return data
     
-    def _get_process_summary(self):
+    def _get_process_summary(self, ps_output):
         """Obtém resumo dos processos em execução.
         
+        Args:
+            ps_output: Saída de 'ps aux' ou exceção levantada ao executá-lo
+        
         Returns:
             Dicionário com resumo dos processos
         """
@@ -46,7 +70,9 @@ class ProcessCollector(BaseCollector):
         
         try:
             # Tenta via ps
-            output = self.run_command(['ps', 'aux'])
+            if isinstance(ps_output, Exception):
+                raise ps_output
+            output = ps_output
             
             # Conta total de processos
             lines = output.split('\n')
@@ -103,9 +129,12 @@ class ProcessCollector(BaseCollector):
                 
         return summary
     
-    def _get_top_processes(self):
+    def _get_top_processes(self, ps_output):
         """Obtém lista dos processos que mais consomem recursos.
         
+        Args:
+            ps_output: Saída de 'ps aux --sort' ou exceção levantada ao executá-lo
+        
         Returns:
             Lista de dicionários com informações dos processos
         """
@@ -114,7 +143,9 @@ class ProcessCollector(BaseCollector):
         
         try:
             # Tenta via ps
-            output = self.run_command(['ps', 'aux', '--sort=-pcpu,-pmem'])
+            if isinstance(ps_output, Exception):
+                raise ps_output
+            output = ps_output
             
             lines = output.split('\n')
             if len(lines) > 1:  # Ignora cabeçalho
@@ -129,8 +160,8 @@ class ProcessCollector(BaseCollector):
                             "pid": int(parts[1]),
                             "cpu_percent": float(parts[2]),
                             "mem_percent": float(parts[3]),
-                            "vsz": format_bytes(int(parts[4]) * 1024),
-                            "rss": format_bytes(int(parts[5]) * 1024),
+                            "vsz": int(parts[4]) * 1024,
+                            "rss": int(parts[5]) * 1024,
                             "tty": parts[6],
                             "stat": parts[7],
                             "start": parts[8],
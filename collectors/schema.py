@@ -0,0 +1,142 @@
+"""
+Esquema das métricas numéricas emitidas pelos coletores.
+
+Cada coletor declara, no atributo de classe `schema`, padrões de caminho
+relativos ao seu nome associados a um tipo (gauge ou counter) e a uma
+unidade. Os valores emitidos são sempre brutos (bytes, segundos,
+percentuais); a formatação fica na camada de apresentação.
+
+Os padrões usam um componente por nível do caminho, aceitando curingas
+no estilo fnmatch (ex: "interfaces.*.rx_bytes" ou "policies.*.*_mhz").
+O primeiro padrão que corresponder ao caminho é usado.
+
+Um componente entre chaves (ex: "interfaces.{interface}.rx_bytes")
+funciona como curinga e nomeia o rótulo que identifica a instância da
+métrica (interface, core, dispositivo, zona...). Exportadores que
+separam nome e rótulos, como o de Prometheus, usam essa declaração.
+"""
+
+from fnmatch import fnmatchcase
+
+# Tipos de métrica
+GAUGE = "gauge"
+COUNTER = "counter"
+
+# Unidades
+BYTES = "bytes"
+SECONDS = "seconds"
+MILLISECONDS = "milliseconds"
+MICROSECONDS = "microseconds"
+PERCENT = "percent"
+RATIO = "ratio"
+CELSIUS = "celsius"
+MHZ = "mhz"
+MBPS = "mbps"
+DBM = "dbm"
+COUNT = "count"
+
+class MetricSchema:
+    """Esquema combinado de todos os coletores registrados."""
+    
+    def __init__(self, collectors):
+        """Monta o esquema a partir dos coletores.
+        
+        Args:
+            collectors: Dicionário nome -> instância de BaseCollector
+        """
+        self._patterns = []
+        for name, collector in collectors.items():
+            for pattern, (kind, unit) in collector.schema.items():
+                segments = [name] + pattern.split('.')
+                self._patterns.append((segments, kind, unit))
+        self._cache = {}
+    
+    def register(self, name, schema):
+        """Acrescenta o esquema de uma fonte que não é um coletor.
+        
+        Args:
+            name: Primeiro componente dos caminhos (ex: "forecast")
+            schema: Dicionário padrão relativo -> (tipo, unidade)
+        """
+        for pattern, (kind, unit) in schema.items():
+            self._patterns.append(([name] + pattern.split('.'), kind, unit))
+        self._cache.clear()
+    
+    @staticmethod
+    def _label_name(segment):
+        """Retorna o nome do rótulo de um componente "{rótulo}" ou None."""
+        if segment.startswith('{') and segment.endswith('}'):
+            return segment[1:-1]
+        return None
+    
+    def _match(self, path):
+        """Retorna o padrão (segmentos, tipo, unidade) do caminho, memorizado."""
+        try:
+            return self._cache[path]
+        except KeyError:
+            pass
+        
+        parts = path.split('.')
+        match = None
+        for pattern in self._patterns:
+            segments = pattern[0]
+            if len(segments) == len(parts) and all(
+                segment == part or self._label_name(segment) is not None or fnmatchcase(part, segment)
+                for segment, part in zip(segments, parts)
+            ):
+                match = pattern
+                break
+        
+        self._cache[path] = match
+        return match
+    
+    def lookup(self, path):
+        """Retorna tipo e unidade de uma métrica.
+        
+        O resultado é memorizado por caminho, de modo que cada caminho é
+        resolvido contra os padrões uma única vez.
+        
+        Args:
+            path: Caminho completo da métrica (ex: "hardware.memory.used")
+        
+        Returns:
+            Tupla (tipo, unidade) ou None se a métrica não estiver declarada
+        """
+        match = self._match(path)
+        return match[1:] if match else None
+    
+    def split_labels(self, path):
+        """Separa um caminho em componentes do nome e rótulos.
+        
+        Args:
+            path: Caminho completo da métrica (ex: "network.interfaces.wlan0.rx_bytes")
+        
+        Returns:
+            Tupla (componentes do nome, lista de pares rótulo -> valor), ex:
+            (["network", "interfaces", "rx_bytes"], [("interface", "wlan0")]),
+            ou None se a métrica não estiver declarada
+        """
+        match = self._match(path)
+        if match is None:
+            return None
+        
+        name_parts = []
+        labels = []
+        for segment, part in zip(match[0], path.split('.')):
+            label = self._label_name(segment)
+            if label is None:
+                name_parts.append(part)
+            else:
+                labels.append((label, part))
+        return name_parts, labels
+    
+    def describe(self):
+        """Retorna os padrões declarados.
+        
+        Returns:
+            Lista de dicionários com padrão, tipo e unidade
+        """
+        return [
+            {"pattern": '.'.join(segments), "type": kind, "unit": unit}
+            for segments, kind, unit in self._patterns
+        ]
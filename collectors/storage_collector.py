@@ -7,14 +7,35 @@ como uso de disco, partições e estatísticas de I/O.
 
 import os
 import re
-from datetime import datetime
 
 from collectors.base_collector import BaseCollector
-from core.utils import get_timestamp, format_bytes
+from core.utils import get_timestamp
+from collectors.schema import GAUGE, COUNTER, BYTES, PERCENT, MILLISECONDS, COUNT
 
 class StorageCollector(BaseCollector):
     """Coleta informações de armazenamento do dispositivo."""
     
+    schema = {
+        "disk_usage.percent": (GAUGE, PERCENT),
+        "disk_usage.*": (GAUGE, BYTES),
+        "partitions.{mount_point}.percent": (GAUGE, PERCENT),
+        "partitions.{mount_point}.*": (GAUGE, BYTES),
+        "io_stats.{device}.io_in_progress": (GAUGE, COUNT),
+        "io_stats.{device}.*_latency_ms": (GAUGE, MILLISECONDS),
+        "io_stats.{device}.*_time_ms": (COUNTER, MILLISECONDS),
+        "io_stats.{device}.*": (COUNTER, COUNT)
+    }
+    
+    commands = [
+        ['df', '-kP', '.'],
+        ['df', '-kP']
+    ]
+    
+    def __init__(self):
+        """Inicializa o coletor."""
+        super().__init__()
+        self._last_io = {}
+    
     def _collect_data(self):
         """Coleta dados de armazenamento.
         
@@ -39,70 +60,121 @@ class StorageCollector(BaseCollector):
         return data
     
     def _get_disk_usage(self):
-        """Obtém informações de uso de disco.
+        """Obtém informações de uso de disco do diretório atual.
         
         Returns:
-            Dicionário com informações de uso de disco
+            Dicionário com total, usado e livre em bytes e percentual de uso
         """
         try:
-            # Usa df para obter uso do diretório atual
-            output = self.run_command(['df', '-h', '.'])
+            usage = self._statvfs_usage('.')
+            usage["mount_point"] = self._find_mount_point(os.getcwd())
+            return usage
+        except OSError:
+            pass
+        
+        # Método alternativo: df em blocos de 1 KiB (formato POSIX)
+        try:
+            partitions = self._parse_df(self.run_command(['df', '-kP', '.']), filter_devices=False)
+            if partitions:
+                usage = partitions[0]
+                usage.pop("device", None)
+                return usage
+        except Exception:
+            pass
+        
+        # Se tudo falhar
+        return {
+            "total": None,
+            "used": None,
+            "free": None,
+            "percent": 0
+        }
+    
+    def _statvfs_usage(self, path):
+        """Calcula o uso de um sistema de arquivos com os.statvfs.
+        
+        Args:
+            path: Caminho dentro do sistema de arquivos
             
-            lines = output.split('\n')
-            if len(lines) >= 2:
-                parts = lines[1].split()
-                if len(parts) >= 5:
-                    # Tenta extrair o número da porcentagem
-                    percent_str = parts[4].rstrip('%')
-                    try:
-                        percent_num = float(percent_str)
-                    except:
-                        percent_num = 0
-                        
-                    return {
-                        "total": parts[1],
-                        "used": parts[2],
-                        "free": parts[3],
-                        "percent": parts[4],
-                        "percent_num": percent_num,
-                        "mount_point": parts[5] if len(parts) >= 6 else "/"
-                    }
+        Returns:
+            Dicionário com total, usado e livre em bytes e percentual de uso
+            (calculado como o df, sobre o espaço disponível para usuários)
+        """
+        st = os.statvfs(path)
+        total = st.f_blocks * st.f_frsize
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        free = st.f_bavail * st.f_frsize
+        available = used + free
+        
+        return {
+            "total": total,
+            "used": used,
+            "free": free,
+            "percent": round(used / available * 100, 1) if available > 0 else 0
+        }
+    
+    def _find_mount_point(self, path):
+        """Encontra o ponto de montagem que contém um caminho.
+        
+        Args:
+            path: Caminho absoluto
+            
+        Returns:
+            Caminho do ponto de montagem
+        """
+        path = os.path.realpath(path)
+        while not os.path.ismount(path):
+            parent = os.path.dirname(path)
+            if parent == path:
+                break
+            path = parent
+        return path
+    
+    def _parse_df(self, output, filter_devices=True):
+        """Interpreta a saída de 'df -kP'.
+        
+        Args:
+            output: Saída do comando
+            filter_devices: Se True, ignora sistemas de arquivos especiais
+            
+        Returns:
+            Lista de dicionários com dispositivo, tamanhos em bytes,
+            percentual de uso e ponto de montagem
+        """
+        partitions = []
+        for line in output.split('\n')[1:]:  # Pula o cabeçalho
+            parts = line.split()
+            if len(parts) < 6:
+                continue
+            
+            # Ignora sistemas de arquivos especiais
+            device = parts[0]
+            if filter_devices and not (device.startswith('/dev/') or device in ['tmpfs', 'sdcard']):
+                continue
             
-            raise Exception("Não foi possível analisar a saída do comando 'df'")
-        except Exception as e:
-            # Tenta método alternativo
             try:
-                # Usa df com bytes para cálculos mais precisos
-                output = self.run_command(['df', '-B1', '.'])
-                
-                lines = output.split('\n')
-                if len(lines) >= 2:
-                    parts = lines[1].split()
-                    if len(parts) >= 4:
-                        total = int(parts[1])
-                        used = int(parts[2])
-                        free = int(parts[3])
-                        percent = (used / total) * 100 if total > 0 else 0
-                        
-                        return {
-                            "total": format_bytes(total),
-                            "used": format_bytes(used),
-                            "free": format_bytes(free),
-                            "percent": f"{percent:.1f}%",
-                            "percent_num": round(percent, 1),
-                            "mount_point": parts[5] if len(parts) >= 6 else "/"
-                        }
-            except Exception:
-                pass
-                
-            # Se tudo falhar
-            return {
-                "total": "Desconhecido", 
-                "used": "Desconhecido", 
-                "free": "Desconhecido",
-                "percent": "0%", 
-                "percent_num": 0
-            }
+                total = int(parts[1]) * 1024
+                used = int(parts[2]) * 1024
+                free = int(parts[3]) * 1024
+            except ValueError:
+                continue
+            
+            try:
+                percent = float(parts[4].rstrip('%'))
+            except ValueError:
+                percent = round(used / (used + free) * 100, 1) if used + free > 0 else 0
+            
+            partitions.append({
+                "device": device,
+                "total": total,
+                "used": used,
+                "free": free,
+                "percent": percent,
+                # Pontos de montagem podem conter espaços
+                "mount_point": ' '.join(parts[5:])
+            })
+        
+        return partitions
     
     def _get_partitions(self):
         """Obtém informações sobre partições.
@@ -110,80 +182,43 @@ class StorageCollector(BaseCollector):
         Returns:
             Lista de dicionários com informações das partições
         """
-        partitions = []
-        
         try:
             # Usa df para listar todas as partições
-            output = self.run_command(['df', '-h'])
-            
-            lines = output.split('\n')
-            if len(lines) >= 2:
-                for line in lines[1:]:  # Pula o cabeçalho
-                    if not line.strip():
-                        continue
-                        
-                    parts = line.split()
-                    if len(parts) >= 6:
-                        # Ignora sistemas de arquivos especiais
-                        if parts[0].startswith('/dev/') or parts[0] in ['tmpfs', 'sdcard']:
-                            # Tenta extrair o número da porcentagem
-                            percent_str = parts[4].rstrip('%')
-                            try:
-                                percent_num = float(percent_str)
-                            except:
-                                percent_num = 0
-                                
-                            partition = {
-                                "device": parts[0],
-                                "total": parts[1],
-                                "used": parts[2],
-                                "free": parts[3],
-                                "percent": parts[4],
-                                "percent_num": percent_num,
-                                "mount_point": parts[5]
-                            }
-                            partitions.append(partition)
+            return self._parse_df(self.run_command(['df', '-kP']))
         except Exception:
-            # Tenta método alternativo via mount
+            pass
+        
+        # Método alternativo: pontos de montagem de /proc/mounts e statvfs
+        partitions = []
+        try:
+            with open('/proc/mounts', 'r') as f:
+                mounts = f.readlines()
+        except OSError:
+            return partitions
+        
+        for line in mounts:
+            parts = line.split()
+            if len(parts) < 2:
+                continue
+            
+            # Ignora sistemas de arquivos especiais
+            device = parts[0]
+            if not (device.startswith('/dev/') or device in ['tmpfs', 'sdcard']):
+                continue
+            
+            # /proc/mounts codifica espaços como \040
+            mount_point = parts[1].replace('\\040', ' ')
+            partition = {
+                "device": device,
+                "mount_point": mount_point
+            }
             try:
-                mount_output = self.run_command(['mount'])
-                
-                for line in mount_output.split('\n'):
-                    if 'type ' in line:
-                        parts = line.split()
-                        if len(parts) >= 3:
-                            device = parts[0]
-                            mount_point = parts[2]
-                            
-                            # Ignora sistemas de arquivos especiais
-                            if device.startswith('/dev/') or device in ['tmpfs', 'sdcard']:
-                                # Tenta obter uso com df específico para este ponto de montagem
-                                try:
-                                    df_output = self.run_command(['df', '-h', mount_point])
-                                    df_lines = df_output.split('\n')
-                                    if len(df_lines) >= 2:
-                                        df_parts = df_lines[1].split()
-                                        if len(df_parts) >= 5:
-                                            partition = {
-                                                "device": device,
-                                                "total": df_parts[1],
-                                                "used": df_parts[2],
-                                                "free": df_parts[3],
-                                                "percent": df_parts[4],
-                                                "percent_num": float(df_parts[4].rstrip('%')),
-                                                "mount_point": mount_point
-                                            }
-                                            partitions.append(partition)
-                                except Exception:
-                                    # Se não conseguir obter uso, adiciona apenas informações básicas
-                                    partition = {
-                                        "device": device,
-                                        "mount_point": mount_point
-                                    }
-                                    partitions.append(partition)
-            except Exception:
+                partition.update(self._statvfs_usage(mount_point))
+            except OSError:
+                # Se não conseguir obter uso, mantém apenas informações básicas
                 pass
-                
+            partitions.append(partition)
+        
         return partitions
     
     def _get_io_stats(self):
@@ -219,7 +254,26 @@ class StorageCollector(BaseCollector):
                                 "io_time_ms": int(parts[12]),
                                 "weighted_io_time_ms": int(parts[13])
                             }
+                            self._add_latency(device, io_stats[device])
                 
                 return io_stats if io_stats else None
         except Exception:
             return None
+    
+    def _add_latency(self, device, stats):
+        """Acrescenta a latência média por operação desde a coleta anterior.
+        
+        Args:
+            device: Nome do dispositivo
+            stats: Contadores de /proc/diskstats do dispositivo (alterado no lugar)
+        """
+        previous = self._last_io.get(device)
+        self._last_io[device] = stats
+        if previous is None:
+            return
+        
+        for operation in ("read", "write"):
+            count = stats[f"{operation}s"] - previous[f"{operation}s"]
+            elapsed = stats[f"{operation}_time_ms"] - previous[f"{operation}_time_ms"]
+            if count > 0 and elapsed >= 0:
+                stats[f"{operation}_latency_ms"] = round(elapsed / count, 3)
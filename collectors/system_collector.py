@@ -6,15 +6,23 @@ como uptime, hostname e versão do Python.
 """
 
 import os
-import re
+import time
 from datetime import datetime
 
 from collectors.base_collector import BaseCollector
 from core.utils import get_timestamp
+from core.facts import facts
+from core.sysfs import sysfs
+from collectors.schema import GAUGE, SECONDS
 
 class SystemCollector(BaseCollector):
     """Coleta informações gerais do sistema."""
     
+    schema = {
+        "uptime": (GAUGE, SECONDS),
+        "load_average.*": (GAUGE, "load")
+    }
+    
     def _collect_data(self):
         """Coleta dados do sistema.
         
@@ -24,8 +32,9 @@ class SystemCollector(BaseCollector):
         data = {
             "timestamp": get_timestamp(),
             "uptime": self._get_uptime(),
-            "hostname": self._get_hostname(),
-            "python_version": self._get_python_version(),
+            "load_average": self._get_load_average(),
+            "hostname": facts.get("hostname", "Desconhecido"),
+            "python_version": facts.get("python_version"),
             "system_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "current_dir": os.getcwd()
         }
@@ -35,57 +44,29 @@ class SystemCollector(BaseCollector):
         """Obtém o uptime do sistema.
         
         Returns:
-            String com o uptime formatado
+            Segundos desde o boot (incluindo suspensão) ou None se não conseguir obter
         """
         try:
-            # Primeira tentativa: comando uptime
-            return self.run_command(['uptime'])
-        except:
+            return float(sysfs.read('/proc/uptime').split()[0])
+        except (OSError, ValueError, IndexError):
             try:
-                # Segunda tentativa: ler /proc/uptime
-                with open('/proc/uptime', 'r') as f:
-                    uptime_seconds = float(f.read().split()[0])
-                    
-                # Converter para formato legível
-                days = int(uptime_seconds // 86400)
-                hours = int((uptime_seconds % 86400) // 3600)
-                minutes = int((uptime_seconds % 3600) // 60)
-                
-                # Formatar
-                parts = []
-                if days > 0:
-                    parts.append(f"{days} dia{'s' if days != 1 else ''}")
-                if hours > 0 or days > 0:
-                    parts.append(f"{hours} hora{'s' if hours != 1 else ''}")
-                parts.append(f"{minutes} minuto{'s' if minutes != 1 else ''}")
-                
-                return "up " + ", ".join(parts)
-            except:
-                return "Desconhecido"
+                return time.clock_gettime(time.CLOCK_BOOTTIME)
+            except (AttributeError, OSError):
+                return None
     
-    def _get_hostname(self):
-        """Obtém o nome do host.
+    def _get_load_average(self):
+        """Obtém as médias de carga do sistema.
         
         Returns:
-            String com o nome do host
+            Dicionário com médias de 1, 5 e 15 minutos ou None se não conseguir obter
         """
         try:
-            return self.run_command(['hostname'])
-        except:
-            import socket
-            try:
-                return socket.gethostname()
-            except:
-                return "Desconhecido"
-    
-    def _get_python_version(self):
-        """Obtém a versão do Python.
+            load_1, load_5, load_15 = os.getloadavg()
+        except (AttributeError, OSError):
+            return None
         
-        Returns:
-            String com a versão do Python
-        """
-        try:
-            return self.run_command(['python', '--version'])
-        except:
-            import sys
-            return sys.version.split()[0]
+        return {
+            "1m": load_1,
+            "5m": load_5,
+            "15m": load_15
+        }
@@ -22,13 +22,99 @@ class Config:
     
     # Configurações de coleta
     COLLECTION_INTERVAL = 5  # segundos
-    HISTORY_SIZE = 60  # pontos de dados para histórico
+    HISTORY_SIZE = 720  # pontos de dados para histórico (1 hora a cada 5s)
+    # Armazenamento persistente do histórico: "segments" (arquivos binários
+    # somente de acréscimo), "sqlite" ou None (apenas em memória)
+    HISTORY_BACKEND = "segments"
+    HISTORY_EXCLUDE = ["process.top_processes"]  # caminhos não armazenados no histórico
+    # Níveis de agregação do histórico: (resolução, retenção) em segundos,
+    # com mínimo/máximo/média/contagem por intervalo
+    HISTORY_TIERS = [
+        (60, 2 * 86400),  # 1 minuto por 2 dias
+        (900, 60 * 86400)  # 15 minutos por 60 dias
+    ]
+    
+    # Histórico persistente
+    HISTORY_DIR = os.path.expanduser("~/.dashboard/history")
+    HISTORY_SQLITE_PATH = os.path.expanduser("~/.dashboard/history.db")
+    HISTORY_SEGMENT_SECONDS = 3600  # janela de cada arquivo de segmento
+    HISTORY_RETENTION = 2 * 86400  # segundos mantidos em disco
+    HISTORY_FLUSH_INTERVAL = 30  # segundos entre gravações em lote
+    HISTORY_BLOCK_POINTS = 120  # pontos por bloco comprimido nos segmentos encerrados
+    PSI_SAMPLE_INTERVAL = 1  # segundos entre amostras de Pressure Stall Information
+    
+    # Estatísticas contínuas por métrica (/api/stats/<caminho>)
+    STATS_METRICS = [  # caminhos ou padrões fnmatch acompanhados
+        "hardware.cpu.usage",
+        "hardware.temperature.*",
+        "hardware.battery.temperature",
+        "android.battery.temperature",
+        "storage.io_stats.*.*_latency_ms",
+        "pressure.*.some.avg10"
+    ]
+    STATS_WINDOWS = {"5m": 300, "1h": 3600, "24h": 86400}  # janelas em segundos
+    STATS_BUCKETS = 12  # períodos por janela (granularidade do deslizamento)
+    STATS_ACCURACY = 0.01  # erro relativo máximo dos quantis
+    STATS_QUANTILES = [0.5, 0.95, 0.99]
+    
+    # Regras de alerta avaliadas a cada ponto do histórico: métrica (caminho
+    # ou padrão fnmatch), comparador (>, >=, <, <=, ==, !=), limite, tempo
+    # mínimo em segundos com a condição verdadeira e histerese para encerrar
+    ALERT_RULES = [
+        {"name": "bateria_quente", "metric": "hardware.battery.temperature", "op": ">", "value": 42, "for": 120, "hysteresis": 1},
+        {"name": "disco_cheio", "metric": "storage.partitions.*.percent", "op": ">", "value": 90, "hysteresis": 2},
+        {"name": "processos_zumbis", "metric": "process.summary.zombie", "op": ">", "value": 0}
+    ]
+    # Comando executado a cada evento de alerta (None desativa), ex:
+    # ["termux-notification", "--id", "{rule}", "--title", "{rule}", "--content", "{message}"]
+    ALERT_COMMAND = None
+    ALERT_HISTORY = 100  # eventos recentes mantidos em /api/alerts
+    
+    # Previsão de esgotamento: métrica (com "{rótulo}" para séries por
+    # instância), limite ao subir (número ou métrica irmã), piso ao descer e
+    # constante de tempo em segundos com que amostras antigas perdem peso
+    FORECAST_RULES = [
+        {"name": "disk", "metric": "storage.partitions.{mount_point}.used", "limit": "total", "window": 6 * 3600},
+        {"name": "battery", "metric": "hardware.battery.percentage", "limit": 100, "floor": 0, "window": 1800}
+    ]
+    FORECAST_MIN_POINTS = 10  # amostras efetivas antes da primeira previsão
+    
+    # Exposição para Prometheus (/metrics)
+    PROMETHEUS_NAMESPACE = "dashboard"  # prefixo dos nomes das métricas
+    PROMETHEUS_EXCLUDE = ["process.top_processes"]  # caminhos não exportados
     
     # Configurações de recursos
     MAX_PROCESSES = 50  # número máximo de processos a monitorar
+    SYSFS_MAX_OPEN_FILES = 256  # descritores sysfs/procfs mantidos abertos
     
     # Timeouts
     COMMAND_TIMEOUT = 3  # segundos para timeout de comandos
+    RESPONSE_DEADLINE = 2.0  # segundos que uma resposta aguarda os coletores
+    COLLECTOR_WORKERS = 6  # threads para execução paralela dos coletores
+    MAX_CONCURRENT_COMMANDS = 4  # processos filhos simultâneos (todos os comandos)
+    
+    # Execução de comandos: "subprocess" (fork+exec por comando) ou
+    # "shell" (coprocesso sh persistente)
+    COMMAND_BACKEND = "subprocess"
+    SHELL_PATH = "sh"
+    
+    # Cadeias de fallback: backoff exponencial de métodos que falham
+    FALLBACK_BACKOFF_BASE = 5  # segundos após a primeira falha
+    FALLBACK_BACKOFF_MAX = 300  # limite do backoff em segundos
+    
+    # Leitura da bateria compartilhada pelos coletores de hardware e Android
+    BATTERY_CACHE_TTL = 2  # segundos em que a última leitura é reaproveitada
+    
+    # Instrumentação interna (/api/_perf e /metrics): tempos por coletor,
+    # método de fallback, comando, serialização e rota
+    PERF_ENABLED = True
+    
+    # Profiler sob demanda (/api/_profile?seconds=N); expõe detalhes
+    # internos, por isso fica desativado até ser necessário
+    PROFILE_ENABLED = False
+    PROFILE_MAX_SECONDS = 60  # duração máxima de um profile
+    PROFILE_INTERVAL = 0.005  # segundos entre amostras de pilhas
+    PROFILE_PSTATS_LINES = 60  # funções listadas no modo cprofile
     
     # Diretórios
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
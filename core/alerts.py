@@ -0,0 +1,280 @@
+"""
+Motor de regras de alerta avaliadas na ingestão.
+
+As regras (Config.ALERT_RULES) são declarativas e compiladas uma única
+vez. Cada regra compara uma métrica (caminho exato ou padrão fnmatch, ex:
+"storage.partitions.*.percent") com um limite:
+
+    {"name": "bateria_quente", "metric": "hardware.battery.temperature",
+     "op": ">", "value": 42, "for": 120, "hysteresis": 1}
+
+A cada ponto do histórico apenas as regras associadas aos caminhos
+recebidos são avaliadas (a associação caminho -> regras é memorizada),
+sem reler o histórico. Cada par regra/caminho passa pelos estados:
+
+    inactive -> pending (condição verdadeira, aguardando "for" segundos)
+             -> firing (evento "firing")
+             -> inactive (condição falsa além da histerese, evento "resolved")
+
+Os eventos vão para o log, para os clientes do canal SSE
+(/api/alerts/stream) e, opcionalmente, para um comando local
+(Config.ALERT_COMMAND, ex: termux-notification).
+"""
+
+import queue
+import logging
+import operator
+import threading
+from collections import deque
+from fnmatch import fnmatchcase
+
+from config.settings import Config
+from core.utils import run_command
+
+INACTIVE = "inactive"
+PENDING = "pending"
+FIRING = "firing"
+RESOLVED = "resolved"
+
+# Comparadores: (função, sinal da histerese ao permanecer disparado)
+COMPARATORS = {
+    ">": (operator.gt, -1),
+    ">=": (operator.ge, -1),
+    "<": (operator.lt, 1),
+    "<=": (operator.le, 1),
+    "==": (operator.eq, 0),
+    "!=": (operator.ne, 0)
+}
+
+class AlertRule:
+    """Regra compilada."""
+    
+    def __init__(self, spec):
+        """Valida e compila uma regra.
+        
+        Args:
+            spec: Dicionário com name, metric, op, value e, opcionalmente,
+                for (segundos) e hysteresis
+        
+        Raises:
+            ValueError: Se a regra for inválida
+        """
+        try:
+            self.name = spec["name"]
+            self.metric = spec["metric"]
+            self.op = spec["op"]
+            self.threshold = float(spec["value"])
+            self.duration = float(spec.get("for", 0))
+            self.hysteresis = abs(float(spec.get("hysteresis", 0)))
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Regra de alerta inválida {spec!r}: {e}")
+        if self.op not in COMPARATORS:
+            raise ValueError(f"Comparador inválido na regra {self.name}: {self.op}")
+        
+        compare, sign = COMPARATORS[self.op]
+        threshold = self.threshold
+        release = self.threshold + sign * self.hysteresis
+        self.triggers = lambda value: compare(value, threshold)
+        # Permanece disparada até a condição falhar também com a histerese
+        self.holds = lambda value: compare(value, release)
+    
+    def matches(self, path):
+        """Indica se a regra se aplica ao caminho."""
+        return path == self.metric or fnmatchcase(path, self.metric)
+    
+    def describe(self):
+        """Retorna a regra em formato serializável."""
+        return {
+            "name": self.name,
+            "metric": self.metric,
+            "op": self.op,
+            "value": self.threshold,
+            "for": self.duration,
+            "hysteresis": self.hysteresis
+        }
+
+class _AlertState:
+    """Estado de uma regra para um caminho."""
+    
+    __slots__ = ("state", "since", "value")
+    
+    def __init__(self):
+        self.state = INACTIVE
+        self.since = None
+        self.value = None
+
+class AlertEngine:
+    """Avalia as regras a cada ponto e distribui os eventos."""
+    
+    def __init__(self, rules=None, command=None, max_events=None):
+        """Inicializa o motor.
+        
+        Args:
+            rules: Lista de especificações de regra (usa Config.ALERT_RULES se None)
+            command: Comando executado a cada evento, com campos {rule},
+                {metric}, {state}, {value}, {threshold} e {message}
+                (usa Config.ALERT_COMMAND se None)
+            max_events: Eventos recentes mantidos (usa Config.ALERT_HISTORY se None)
+        """
+        self.rules = []
+        for spec in Config.ALERT_RULES if rules is None else rules:
+            try:
+                self.rules.append(AlertRule(spec))
+            except ValueError as e:
+                logging.error(str(e))
+        self.command = Config.ALERT_COMMAND if command is None else command
+        self.events = deque(maxlen=max_events or Config.ALERT_HISTORY)
+        
+        # Caminho -> regras aplicáveis (memorizado na primeira ocorrência)
+        self._rules_by_path = {}
+        self._states = {}
+        self._subscribers = set()
+        self._lock = threading.Lock()
+    
+    def evaluate(self, timestamp, values):
+        """Avalia as regras para um ponto (ouvinte de MetricsHistory.add_listener).
+        
+        Args:
+            timestamp: Epoch em segundos
+            values: Lista de pares caminho -> valor numérico
+        """
+        if not self.rules:
+            return
+        
+        events = []
+        with self._lock:
+            for path, value in values:
+                rules = self._rules_by_path.get(path)
+                if rules is None:
+                    rules = self._rules_by_path[path] = [rule for rule in self.rules if rule.matches(path)]
+                for rule in rules:
+                    event = self._step(rule, path, value, timestamp)
+                    if event is not None:
+                        events.append(event)
+            self.events.extend(events)
+        
+        for event in events:
+            self._dispatch(event)
+    
+    def _step(self, rule, path, value, timestamp):
+        """Avança a máquina de estados de uma regra para um caminho.
+        
+        Returns:
+            Evento gerado ou None
+        """
+        key = (rule.name, path)
+        alert = self._states.get(key)
+        if alert is None:
+            alert = self._states[key] = _AlertState()
+        alert.value = value
+        
+        if alert.state == FIRING:
+            if not rule.holds(value):
+                alert.state = INACTIVE
+                alert.since = None
+                return self._event(rule, path, value, timestamp, RESOLVED)
+            return None
+        
+        if not rule.triggers(value):
+            alert.state = INACTIVE
+            alert.since = None
+            return None
+        
+        if alert.state == INACTIVE:
+            alert.state = PENDING
+            alert.since = timestamp
+        if timestamp - alert.since >= rule.duration:
+            alert.state = FIRING
+            alert.since = timestamp
+            return self._event(rule, path, value, timestamp, FIRING)
+        return None
+    
+    @staticmethod
+    def _event(rule, path, value, timestamp, state):
+        """Monta um evento de alerta."""
+        if state == FIRING:
+            message = f"{path} = {value:g} ({rule.op} {rule.threshold:g})"
+        else:
+            message = f"{path} normalizado: {value:g}"
+        return {
+            "rule": rule.name,
+            "metric": path,
+            "state": state,
+            "value": value,
+            "threshold": rule.threshold,
+            "timestamp": timestamp,
+            "message": message
+        }
+    
+    def _dispatch(self, event):
+        """Envia um evento ao log, aos assinantes SSE e ao comando."""
+        log = logging.warning if event["state"] == FIRING else logging.info
+        log(f"Alerta {event['rule']} {event['state']}: {event['message']}")
+        
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                # Cliente lento: perde eventos em vez de atrasar a ingestão
+                pass
+        
+        if self.command:
+            command = [str(arg).format(**event) for arg in self.command]
+            threading.Thread(target=self._run_command, args=(command,), name="alert-command", daemon=True).start()
+    
+    @staticmethod
+    def _run_command(command):
+        """Executa o comando de notificação (em thread própria)."""
+        try:
+            run_command(command)
+        except Exception as e:
+            logging.error(f"Erro no comando de alerta: {e}")
+    
+    def active(self):
+        """Retorna os alertas pendentes e disparados.
+        
+        Returns:
+            Lista de dicionários com regra, caminho, estado, desde e valor
+        """
+        with self._lock:
+            return [
+                {"rule": name, "metric": path, "state": alert.state, "since": alert.since, "value": alert.value}
+                for (name, path), alert in self._states.items()
+                if alert.state != INACTIVE
+            ]
+    
+    def describe(self):
+        """Retorna regras, alertas ativos e eventos recentes."""
+        with self._lock:
+            events = list(self.events)
+        return {
+            "rules": [rule.describe() for rule in self.rules],
+            "active": self.active(),
+            "events": events
+        }
+    
+    def iter_events(self, heartbeat=15):
+        """Gera eventos para um cliente do canal SSE.
+        
+        O primeiro item é a lista de alertas ativos; depois, cada evento
+        conforme ocorre, ou None a cada heartbeat segundos sem eventos.
+        A assinatura é removida quando o gerador é fechado.
+        
+        Yields:
+            Tuplas (nome do evento, dados) ou None
+        """
+        subscriber = queue.Queue(maxsize=100)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        try:
+            yield "active", self.active()
+            while True:
+                try:
+                    yield "alert", subscriber.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield None
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscriber)
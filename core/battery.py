@@ -0,0 +1,131 @@
+"""
+Leitura da bateria compartilhada pelos coletores do Dashboard S10+.
+
+Os coletores de hardware e Android publicam os mesmos dados de bateria.
+Este módulo mantém uma única cadeia de fallback (termux-api e, em
+seguida, sysfs) e reaproveita a última leitura por alguns segundos, de
+modo que a bateria é consultada uma vez por ciclo de coleta.
+"""
+
+import time
+import threading
+
+from config.settings import Config
+from core.utils import run_command, safe_parse_json, extract_value_with_regex
+from core.fallback import FallbackChain
+from core.sysfs import sysfs
+
+# Arquivos de bateria lidos em lote via sysfs
+BATTERY_SYSFS_FILES = [
+    '/sys/class/power_supply/battery/capacity',
+    '/sys/class/power_supply/battery/status',
+    '/sys/class/power_supply/battery/temp',
+    '/sys/class/power_supply/battery/health'
+]
+
+def _get_battery_termux():
+    """Obtém informações da bateria via termux-api.
+    
+    Returns:
+        Dicionário com informações da bateria
+    """
+    output = run_command(['termux-battery-status'])
+    battery_info = safe_parse_json(output)
+    
+    if battery_info:
+        return battery_info
+    
+    # Se não conseguiu parsear JSON, tenta extrair manualmente
+    battery_info = {}
+    
+    percentage = extract_value_with_regex(output, r'percentage.*?(\d+)')
+    if percentage:
+        battery_info["percentage"] = int(percentage)
+    
+    status = extract_value_with_regex(output, r'status.*?(\w+)')
+    if status:
+        battery_info["status"] = status
+    
+    temperature = extract_value_with_regex(output, r'temperature.*?(\d+)')
+    if temperature:
+        battery_info["temperature"] = float(temperature) / 10
+    
+    health = extract_value_with_regex(output, r'health.*?(\w+)')
+    if health:
+        battery_info["health"] = health
+    
+    return battery_info
+
+def _get_battery_sysfs():
+    """Obtém informações da bateria via arquivos do sistema.
+    
+    Returns:
+        Dicionário com informações da bateria
+    """
+    battery_info = {}
+    values = sysfs.read_many(BATTERY_SYSFS_FILES)
+    
+    # Verificar capacidade
+    try:
+        battery_info["percentage"] = int(values[BATTERY_SYSFS_FILES[0]])
+    except (TypeError, ValueError):
+        pass
+    
+    # Verificar status
+    if values[BATTERY_SYSFS_FILES[1]]:
+        battery_info["status"] = values[BATTERY_SYSFS_FILES[1]]
+    
+    # Verificar temperatura
+    try:
+        temp = int(values[BATTERY_SYSFS_FILES[2]])
+        # A maioria dos dispositivos armazena em millicelsius
+        if temp > 1000:
+            temp /= 10
+        battery_info["temperature"] = temp / 10
+    except (TypeError, ValueError):
+        pass
+    
+    # Verificar saúde
+    if values[BATTERY_SYSFS_FILES[3]]:
+        battery_info["health"] = values[BATTERY_SYSFS_FILES[3]]
+    
+    return battery_info
+
+class BatteryReader:
+    """Leitura da bateria com cache curto e uma única cadeia de fallback."""
+    
+    def __init__(self, ttl=None):
+        """Inicializa o leitor.
+        
+        Args:
+            ttl: Segundos durante os quais a última leitura é reaproveitada
+                (usa Config.BATTERY_CACHE_TTL se None)
+        """
+        self.ttl = ttl if ttl is not None else Config.BATTERY_CACHE_TTL
+        self._chain = FallbackChain("battery", [
+            _get_battery_termux,
+            _get_battery_sysfs
+        ])
+        self._value = None
+        self._read_at = None
+        self._lock = threading.Lock()
+    
+    def read(self):
+        """Retorna as informações da bateria.
+        
+        Chamadas simultâneas aguardam a mesma leitura em vez de repeti-la.
+        
+        Returns:
+            Cópia do dicionário com informações da bateria ou None se
+            nenhum método funcionar
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._read_at is None or now - self._read_at >= self.ttl:
+                self._value = self._chain.run()
+                self._read_at = time.monotonic()
+            return dict(self._value) if self._value else self._value
+
+
+# Instância global compartilhada pelos coletores
+battery = BatteryReader()
@@ -0,0 +1,215 @@
+"""
+Cache de fatos estáticos para o Dashboard S10+.
+
+Este módulo concentra informações que não mudam durante a execução
+do servidor (versão do Python, modelo da CPU, dados do dispositivo),
+calculadas uma única vez na inicialização. Fatos que podem mudar,
+como o hostname, são marcados como voláteis e podem ser invalidados
+explicitamente.
+"""
+
+import os
+import socket
+import logging
+import platform
+import threading
+
+from core.utils import run_command, safe_parse_json, extract_value_with_regex
+
+class StaticFacts:
+    """Registro de fatos calculados uma vez e mantidos em cache."""
+    
+    def __init__(self):
+        """Inicializa o registro vazio."""
+        self._loaders = {}
+        self._volatile = set()
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def register(self, name, loader, volatile=False):
+        """Registra um fato e a função que o calcula.
+        
+        Args:
+            name: Nome do fato (ex: "hostname")
+            loader: Função sem argumentos que retorna o valor do fato
+            volatile: Se True, o fato é invalidado por invalidate() sem argumentos
+        """
+        self._loaders[name] = loader
+        if volatile:
+            self._volatile.add(name)
+        else:
+            self._volatile.discard(name)
+        self._values.pop(name, None)
+    
+    def get(self, name, default=None):
+        """Retorna o valor de um fato, calculando-o apenas na primeira vez.
+        
+        Args:
+            name: Nome do fato
+            default: Valor retornado se o fato não existir ou falhar
+        
+        Returns:
+            Valor em cache do fato
+        """
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+        
+        with self._lock:
+            if name not in self._values:
+                loader = self._loaders.get(name)
+                if loader is None:
+                    return default
+                try:
+                    self._values[name] = loader()
+                except Exception as e:
+                    logging.warning(f"Erro ao calcular fato estático {name}: {e}")
+                    return default
+            return self._values[name]
+    
+    def invalidate(self, name=None):
+        """Invalida fatos em cache para que sejam recalculados no próximo acesso.
+        
+        Args:
+            name: Nome do fato a invalidar (None invalida todos os fatos voláteis)
+        """
+        with self._lock:
+            if name is None:
+                for volatile_name in self._volatile:
+                    self._values.pop(volatile_name, None)
+            else:
+                self._values.pop(name, None)
+        logging.info(f"Fatos estáticos invalidados: {name or ', '.join(sorted(self._volatile))}")
+    
+    def preload(self):
+        """Calcula todos os fatos registrados (chamado na inicialização)."""
+        for name in list(self._loaders):
+            self.get(name)
+    
+    def snapshot(self):
+        """Retorna uma cópia de todos os fatos já calculados.
+        
+        Returns:
+            Dicionário com nome e valor de cada fato em cache
+        """
+        return dict(self._values)
+
+
+def _load_hostname():
+    """Obtém o nome do host.
+    
+    Returns:
+        String com o nome do host
+    """
+    try:
+        hostname = socket.gethostname()
+        if hostname:
+            return hostname
+    except Exception:
+        pass
+    
+    try:
+        return run_command(['hostname'])
+    except Exception:
+        return "Desconhecido"
+
+def _load_python_version():
+    """Obtém a versão do Python em execução.
+    
+    Returns:
+        String com a versão do Python (ex: "Python 3.11.7")
+    """
+    return f"Python {platform.python_version()}"
+
+def _load_cpu_cores():
+    """Obtém informações sobre os cores da CPU.
+    
+    Returns:
+        Dicionário com informações dos cores ou None se não conseguir obter
+    """
+    try:
+        # Tenta ler /proc/cpuinfo
+        if os.path.exists('/proc/cpuinfo'):
+            with open('/proc/cpuinfo', 'r') as f:
+                cpuinfo = f.read()
+            
+            # Conta o número de processadores
+            processors = cpuinfo.count('processor')
+            if processors > 0:
+                # Extrai modelo do processador (em ARM o campo é "Hardware")
+                model_name = extract_value_with_regex(cpuinfo, r'model name\s+:\s+(.*)')
+                if not model_name:
+                    model_name = extract_value_with_regex(cpuinfo, r'Hardware\s+:\s+(.*)', 'Desconhecido')
+                
+                return {
+                    "count": processors,
+                    "model": model_name
+                }
+    except Exception:
+        pass
+    
+    # Tenta via os.cpu_count (sem fork)
+    core_count = os.cpu_count()
+    if core_count:
+        return {
+            "count": core_count,
+            "model": "Desconhecido"
+        }
+    
+    return None
+
+def _load_device_info():
+    """Obtém informações do dispositivo Android.
+    
+    Returns:
+        Dicionário com informações do dispositivo
+    """
+    device_info = {}
+    
+    # Tenta via termux-api
+    try:
+        output = run_command(['termux-info'])
+        info = safe_parse_json(output)
+        
+        if info:
+            # Extrai informações relevantes
+            if "DEVICE_MANUFACTURER" in info:
+                device_info["manufacturer"] = info["DEVICE_MANUFACTURER"]
+            if "DEVICE_MODEL" in info:
+                device_info["model"] = info["DEVICE_MODEL"]
+            if "ANDROID_VERSION" in info:
+                device_info["android_version"] = info["ANDROID_VERSION"]
+            if "ANDROID_SDK" in info:
+                device_info["android_sdk"] = info["ANDROID_SDK"]
+            
+            return device_info
+    except Exception:
+        pass
+    
+    # Tenta método alternativo via getprop
+    properties = {
+        "manufacturer": "ro.product.manufacturer",
+        "model": "ro.product.model",
+        "android_version": "ro.build.version.release",
+        "android_sdk": "ro.build.version.sdk"
+    }
+    
+    try:
+        for key, prop in properties.items():
+            value = run_command(['getprop', prop])
+            if value:
+                device_info[key] = value
+        
+        return device_info
+    except Exception:
+        # Informações mínimas
+        return {"model": "Galaxy S10+"}
+
+
+# Instância global compartilhada por todos os coletores
+facts = StaticFacts()
+facts.register("hostname", _load_hostname, volatile=True)
+facts.register("python_version", _load_python_version)
+facts.register("cpu_cores", _load_cpu_cores)
+facts.register("device_info", _load_device_info)
@@ -0,0 +1,173 @@
+"""
+Cadeias de fallback adaptativas para o Dashboard S10+.
+
+Este módulo implementa uma estratégia reutilizável para coletores que
+tentam vários métodos alternativos até obter um resultado. A cadeia
+lembra qual método funcionou por último e o tenta primeiro, aplica
+backoff exponencial aos métodos que falham e mantém estatísticas de
+sucesso e latência por método.
+"""
+
+import time
+import logging
+import threading
+
+from config.settings import Config
+from core import perf
+
+# Registro global de cadeias, usado para expor estatísticas
+_chains = {}
+_chains_lock = threading.Lock()
+
+class _MethodState:
+    """Estado e estatísticas de um método da cadeia."""
+    
+    def __init__(self, name, func):
+        self.name = name
+        self.func = func
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.total_latency = 0.0
+        self.last_latency = None
+        self.retry_at = 0.0
+        self.last_error = None
+
+class FallbackChain:
+    """Executa métodos alternativos, priorizando o último que funcionou."""
+    
+    def __init__(self, name, methods, validator=None, backoff_base=None, backoff_max=None):
+        """Inicializa a cadeia e a registra para consulta de estatísticas.
+        
+        Args:
+            name: Nome único da cadeia (ex: "network.ip")
+            methods: Lista de funções sem argumentos, em ordem de prioridade
+            validator: Função que recebe o resultado e retorna True se ele é
+                válido (padrão: resultado não vazio)
+            backoff_base: Backoff inicial em segundos após uma falha
+                (usa Config.FALLBACK_BACKOFF_BASE se None)
+            backoff_max: Backoff máximo em segundos
+                (usa Config.FALLBACK_BACKOFF_MAX se None)
+        """
+        self.name = name
+        self.methods = [_MethodState(method.__name__.lstrip('_'), method) for method in methods]
+        self.validator = validator or bool
+        self.backoff_base = backoff_base or Config.FALLBACK_BACKOFF_BASE
+        self.backoff_max = backoff_max or Config.FALLBACK_BACKOFF_MAX
+        self.preferred = None
+        # Último método que funcionou (mantido mesmo após falhas)
+        self.last_success = None
+        
+        with _chains_lock:
+            _chains[name] = self
+    
+    def run(self, default=None):
+        """Executa os métodos até obter um resultado válido.
+        
+        O último método bem-sucedido é tentado primeiro. Métodos em backoff
+        são ignorados até que o prazo de nova tentativa expire; se todos
+        estiverem em backoff, o último que funcionou (ou o de prazo mais
+        próximo) é tentado mesmo assim, para que a cadeia se recupere logo
+        após uma falha passageira.
+        
+        Args:
+            default: Valor retornado se nenhum método produzir resultado válido
+        
+        Returns:
+            Resultado do primeiro método bem-sucedido ou default
+        """
+        now = time.monotonic()
+        candidates = self.methods
+        if self.preferred is not None:
+            candidates = [self.preferred] + [m for m in self.methods if m is not self.preferred]
+        
+        ready = [method for method in candidates if method.retry_at <= now]
+        if not ready and candidates:
+            ready = [self.last_success or min(candidates, key=lambda method: method.retry_at)]
+        
+        for method in ready:
+            valid, result = self._attempt(method)
+            if valid:
+                return result
+        
+        return default
+    
+    def _attempt(self, method):
+        """Executa um método e atualiza suas estatísticas e backoff.
+        
+        Returns:
+            Tupla (resultado válido, resultado)
+        """
+        start = time.perf_counter()
+        method.calls += 1
+        try:
+            result = method.func()
+            valid = self.validator(result)
+            error = None if valid else "resultado inválido"
+        except Exception as e:
+            result = None
+            valid = False
+            error = str(e)
+        latency = time.perf_counter() - start
+        method.total_latency += latency
+        method.last_latency = latency
+        if perf.enabled:
+            perf.observe("method_duration_seconds", f"{self.name}.{method.name}", latency)
+        
+        if valid:
+            if perf.enabled and method is not self.methods[0]:
+                perf.count("fallback_used_total", self.name)
+            method.successes += 1
+            method.consecutive_failures = 0
+            method.retry_at = 0.0
+            self.preferred = self.last_success = method
+            return True, result
+        
+        method.failures += 1
+        method.consecutive_failures += 1
+        method.last_error = error
+        if perf.enabled:
+            perf.count("method_failures_total", f"{self.name}.{method.name}")
+        backoff = min(self.backoff_max, self.backoff_base * 2 ** (method.consecutive_failures - 1))
+        method.retry_at = time.monotonic() + backoff
+        logging.debug(f"Fallback {self.name}: {method.name} falhou ({error}), nova tentativa em {backoff}s")
+        
+        if method is self.preferred:
+            self.preferred = None
+        return False, result
+    
+    def stats(self):
+        """Retorna estatísticas por método.
+        
+        Returns:
+            Dicionário com método preferido e estatísticas de cada método
+        """
+        now = time.monotonic()
+        methods = {}
+        for method in self.methods:
+            methods[method.name] = {
+                "calls": method.calls,
+                "successes": method.successes,
+                "failures": method.failures,
+                "consecutive_failures": method.consecutive_failures,
+                "avg_latency_ms": round(method.total_latency / method.calls * 1000, 2) if method.calls else None,
+                "last_latency_ms": round(method.last_latency * 1000, 2) if method.last_latency is not None else None,
+                "backoff_remaining": round(max(0.0, method.retry_at - now), 1),
+                "last_error": method.last_error
+            }
+        
+        return {
+            "preferred": self.preferred.name if self.preferred else None,
+            "methods": methods
+        }
+
+def get_fallback_stats():
+    """Retorna estatísticas de todas as cadeias registradas.
+    
+    Returns:
+        Dicionário nome da cadeia -> estatísticas
+    """
+    with _chains_lock:
+        chains = dict(_chains)
+    return {name: chain.stats() for name, chain in chains.items()}
@@ -0,0 +1,332 @@
+"""
+Previsão de esgotamento de recursos (disco cheio, bateria vazia/cheia).
+
+Para cada série selecionada em Config.FORECAST_RULES mantém uma regressão
+linear ponderada exponencialmente (pontos antigos perdem peso com
+constante de tempo "window"), atualizada em O(1) por amostra a partir de
+somas acumuladas. Amostras muito distantes da reta (mais de
+ROBUST_SIGMAS desvios) são limitadas antes de entrar nas somas, para que
+um pico isolado não distorça a tendência; um desvio que persiste na
+amostra seguinte é aceito como mudança real.
+
+A partir da inclinação e do seu erro padrão calcula o tempo estimado até
+o limite (subindo) ou o piso (descendo), com intervalo de ~95%:
+
+    forecast.disk./data.eta_seconds       estimativa central
+    forecast.disk./data.eta_low_seconds   com a tendência mais acentuada
+    forecast.disk./data.eta_high_seconds  com a mais suave (ausente se a
+                                          tendência pode ser nula)
+    forecast.disk./data.rate              unidades por segundo
+
+As previsões voltam ao histórico como a fonte "forecast", de modo que
+podem ser consultadas, exportadas, usadas em alertas e expostas em
+/metrics como qualquer outra métrica.
+"""
+
+import math
+import logging
+import threading
+from fnmatch import fnmatchcase
+
+from config.settings import Config
+from collectors.schema import GAUGE, SECONDS
+
+SOURCE = "forecast"
+
+# Quantil da normal para o intervalo de ~95%
+Z_95 = 1.96
+
+# Amostras além deste número de desvios da reta são limitadas
+ROBUST_SIGMAS = 4
+
+# Limite mínimo, relativo ao valor previsto, para séries sem variação
+# (ex: bateria parada em 100%), em que o desvio dos resíduos é ~0
+ROBUST_FLOOR = 0.001
+
+# Variação (inclinação x dispersão dos tempos), relativa à média, abaixo
+# da qual a inclinação é considerada nula
+SLOPE_EPSILON = 1e-12
+
+class _Trend:
+    """Regressão linear com esquecimento exponencial, em O(1) por amostra."""
+    
+    __slots__ = ("window", "t0", "last_t", "outlier", "sw", "sw2", "st", "sy", "stt", "sty", "syy")
+    
+    def __init__(self, window):
+        """Inicializa a regressão.
+        
+        Args:
+            window: Constante de tempo do esquecimento em segundos
+        """
+        self.window = window
+        self.t0 = None
+        self.last_t = None
+        # Lado (-1/1) da última amostra limitada, ou 0
+        self.outlier = 0
+        self.sw = self.sw2 = self.st = self.sy = self.stt = self.sty = self.syy = 0.0
+    
+    def add(self, timestamp, value):
+        """Acrescenta uma amostra."""
+        if self.t0 is None:
+            self.t0 = timestamp
+        elif timestamp <= self.last_t:
+            return
+        else:
+            decay = math.exp(-(timestamp - self.last_t) / self.window)
+            self.sw *= decay
+            self.sw2 *= decay * decay
+            self.st *= decay
+            self.sy *= decay
+            self.stt *= decay
+            self.sty *= decay
+            self.syy *= decay
+            
+            fit = self.fit()
+            if fit is not None:
+                intercept, slope, sigma, _ = fit
+                predicted = intercept + slope * (timestamp - self.t0)
+                limit = max(ROBUST_SIGMAS * sigma, ROBUST_FLOOR * max(abs(predicted), 1.0))
+                side = (value > predicted + limit) - (value < predicted - limit)
+                # Só picos isolados são limitados: um desvio que persiste na
+                # amostra seguinte é uma mudança real de nível ou tendência
+                if side and side != self.outlier:
+                    value = predicted + side * limit
+                    self.outlier = side
+                else:
+                    self.outlier = 0
+        
+        x = timestamp - self.t0
+        self.last_t = timestamp
+        self.sw += 1
+        self.sw2 += 1
+        self.st += x
+        self.sy += value
+        self.stt += x * x
+        self.sty += x * value
+        self.syy += value * value
+    
+    def effective_points(self):
+        """Número efetivo de amostras (Kish) considerando os pesos."""
+        return self.sw * self.sw / self.sw2 if self.sw2 else 0.0
+    
+    def fit(self):
+        """Ajusta a reta.
+        
+        Returns:
+            Tupla (intercepto, inclinação, desvio dos resíduos, erro padrão
+            da inclinação) ou None se ainda não houver amostras suficientes
+        """
+        points = self.effective_points()
+        if points < Config.FORECAST_MIN_POINTS:
+            return None
+        
+        sxx = self.stt - self.st * self.st / self.sw
+        if sxx <= 0:
+            return None
+        slope = (self.sty - self.st * self.sy / self.sw) / sxx
+        # Resto do cancelamento numérico em séries constantes (ex: bateria
+        # parada em 100%), que de outra forma viraria um ETA de bilhões de anos
+        if abs(slope) * math.sqrt(sxx / self.sw) <= SLOPE_EPSILON * max(abs(self.sy / self.sw), 1.0):
+            slope = 0.0
+        intercept = (self.sy - slope * self.st) / self.sw
+        
+        # Soma ponderada dos quadrados dos resíduos, a partir das somas
+        sse = (
+            self.syy - 2 * intercept * self.sy - 2 * slope * self.sty
+            + intercept * intercept * self.sw + 2 * intercept * slope * self.st
+            + slope * slope * self.stt
+        )
+        variance = max(0.0, sse) / self.sw * points / (points - 2)
+        slope_error = math.sqrt(variance * self.sw / (sxx * points))
+        return intercept, slope, math.sqrt(variance), slope_error
+    
+    def forecast(self, limit, floor):
+        """Estima o tempo até o limite (subindo) ou o piso (descendo).
+        
+        Args:
+            limit: Valor máximo (ex: capacidade) ou None
+            floor: Valor mínimo (ex: 0% de bateria) ou None
+        
+        Returns:
+            Dicionário com rate, eta_seconds, eta_low_seconds e
+            eta_high_seconds (ausentes quando não se aplicam), ou None
+        """
+        fit = self.fit()
+        if fit is None:
+            return None
+        
+        intercept, slope, _, slope_error = fit
+        current = intercept + slope * (self.last_t - self.t0)
+        result = {"rate": slope}
+        
+        if slope > 0:
+            target, steep, gentle = limit, slope + Z_95 * slope_error, slope - Z_95 * slope_error
+        elif slope < 0:
+            target, steep, gentle = floor, slope - Z_95 * slope_error, slope + Z_95 * slope_error
+        else:
+            return result
+        if target is None:
+            return result
+        
+        remaining = target - current
+        if remaining * slope <= 0:
+            # Já atingiu o alvo
+            result.update(eta_seconds=0.0, eta_low_seconds=0.0, eta_high_seconds=0.0)
+            return result
+        
+        result["eta_seconds"] = remaining / slope
+        result["eta_low_seconds"] = remaining / steep
+        if gentle * slope > 0:
+            result["eta_high_seconds"] = remaining / gentle
+        return result
+
+class _ForecastRule:
+    """Regra de previsão compilada."""
+    
+    def __init__(self, spec):
+        """Valida e compila uma regra.
+        
+        Args:
+            spec: Dicionário com name, metric (caminho, com componentes
+                "{rótulo}" para séries por instância), limit (número ou
+                nome de uma métrica irmã, ex: "total"), floor e window
+        
+        Raises:
+            ValueError: Se a regra for inválida
+        """
+        try:
+            self.name = spec["name"]
+            self.segments = spec["metric"].split('.')
+            self.limit = spec.get("limit")
+            self.floor = spec.get("floor")
+            self.window = float(spec.get("window", 3600))
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            raise ValueError(f"Regra de previsão inválida {spec!r}: {e}")
+        
+        self.labels = [segment[1:-1] for segment in self.segments if segment.startswith('{') and segment.endswith('}')]
+    
+    def match(self, path):
+        """Retorna os valores dos rótulos se o caminho corresponder, ou None."""
+        parts = path.split('.')
+        if len(parts) != len(self.segments):
+            return None
+        
+        captured = []
+        for segment, part in zip(self.segments, parts):
+            if segment.startswith('{') and segment.endswith('}'):
+                captured.append(part)
+            elif segment != part and not fnmatchcase(part, segment):
+                return None
+        return tuple(captured)
+    
+    def resolve(self, value, path, values):
+        """Resolve um limite numérico ou o valor de uma métrica irmã."""
+        if value is None or isinstance(value, (int, float)):
+            return value
+        return values.get(path.rsplit('.', 1)[0] + '.' + value)
+    
+    def schema(self):
+        """Retorna o esquema das métricas derivadas desta regra."""
+        prefix = '.'.join([self.name] + [f"{{{label}}}" for label in self.labels])
+        return {
+            f"{prefix}.*_seconds": (GAUGE, SECONDS),
+            f"{prefix}.rate": (GAUGE, None)
+        }
+
+class Forecaster:
+    """Mantém as previsões e as publica no histórico."""
+    
+    def __init__(self, history, rules=None):
+        """Inicializa as previsões e registra a fonte no histórico.
+        
+        Args:
+            history: Instância de MetricsHistory
+            rules: Lista de especificações de regra (usa Config.FORECAST_RULES se None)
+        """
+        self.history = history
+        self.rules = []
+        for spec in Config.FORECAST_RULES if rules is None else rules:
+            try:
+                self.rules.append(_ForecastRule(spec))
+            except ValueError as e:
+                logging.error(str(e))
+        
+        self.schema = {}
+        for rule in self.rules:
+            self.schema.update(rule.schema())
+        
+        # Caminho -> (regra, rótulos) ou None, memorizado na primeira ocorrência
+        self._rules_by_path = {}
+        self._trends = {}
+        # Último conjunto de previsões publicado (substituído a cada ponto)
+        self.latest = {}
+        self._lock = threading.Lock()
+        
+        history.register_source(SOURCE, Config.COLLECTION_INTERVAL)
+    
+    def _lookup(self, path):
+        """Retorna a regra e os rótulos aplicáveis a um caminho."""
+        try:
+            return self._rules_by_path[path]
+        except KeyError:
+            pass
+        
+        match = None
+        for rule in self.rules:
+            labels = rule.match(path)
+            if labels is not None:
+                match = (rule, labels)
+                break
+        self._rules_by_path[path] = match
+        return match
+    
+    def update(self, timestamp, values):
+        """Atualiza as regressões com um ponto (ouvinte de MetricsHistory.add_listener).
+        
+        Args:
+            timestamp: Epoch em segundos
+            values: Lista de pares caminho -> valor numérico
+        """
+        if not self.rules:
+            return
+        
+        by_path = None
+        changed = False
+        with self._lock:
+            for path, value in values:
+                match = self._lookup(path)
+                if match is None:
+                    continue
+                if by_path is None:
+                    by_path = dict(values)
+                
+                rule, labels = match
+                trend = self._trends.get(path)
+                if trend is None:
+                    trend = self._trends[path] = _Trend(rule.window)
+                trend.add(timestamp, value)
+                
+                result = trend.forecast(
+                    rule.resolve(rule.limit, path, by_path),
+                    rule.resolve(rule.floor, path, by_path)
+                )
+                if result is None:
+                    continue
+                
+                # forecast -> regra -> rótulos... -> campos, copiando os
+                # níveis alterados (leitores podem estar serializando o anterior)
+                latest = dict(self.latest)
+                container, key = latest, rule.name
+                for label in labels:
+                    container[key] = dict(container.get(key, {}))
+                    container, key = container[key], label
+                container[key] = result
+                self.latest = latest
+                changed = True
+            
+            latest = self.latest
+        
+        if changed:
+            # Fora do lock: o histórico chama de volta os ouvintes (inclusive
+            # este, que ignora os caminhos da própria fonte)
+            self.history.add_data_point({SOURCE: latest}, source=SOURCE)
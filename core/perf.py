@@ -0,0 +1,214 @@
+"""
+Instrumentação interna do Dashboard S10+.
+
+Mede onde o próprio dashboard gasta tempo: coletores, métodos das
+cadeias de fallback, comandos externos, serialização das respostas e
+rotas HTTP. Os valores vão para histogramas de buckets fixos (como os do
+Prometheus) e contadores, expostos em /api/_perf e em /metrics.
+
+Com Config.PERF_ENABLED = False os pontos de medição se resumem à
+verificação de `perf.enabled`, sem chamadas a relógio nem locks.
+"""
+
+import os
+import time
+import bisect
+import threading
+from contextlib import contextmanager, nullcontext
+
+from config.settings import Config
+
+# Verificado pelos pontos de medição antes de qualquer trabalho
+enabled = Config.PERF_ENABLED
+
+# Limites superiores dos buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Métricas: nome -> (rótulo, buckets ou None para contador, descrição)
+METRICS = {
+    "collector_duration_seconds": ("collector", LATENCY_BUCKETS, "Tempo de coleta por coletor"),
+    "method_duration_seconds": ("method", LATENCY_BUCKETS, "Tempo por método das cadeias de fallback"),
+    "method_failures_total": ("method", None, "Falhas por método das cadeias de fallback"),
+    "fallback_used_total": ("chain", None, "Resultados obtidos por um método alternativo"),
+    "command_duration_seconds": ("command", LATENCY_BUCKETS, "Tempo de execução por comando externo"),
+    "command_timeouts_total": ("command", None, "Comandos externos encerrados por timeout"),
+    "serialization_duration_seconds": ("route", LATENCY_BUCKETS, "Tempo de serialização JSON por rota"),
+    "response_size_bytes": ("route", SIZE_BUCKETS, "Tamanho das respostas JSON por rota"),
+    "request_duration_seconds": ("route", LATENCY_BUCKETS, "Tempo de atendimento por rota")
+}
+
+class Histogram:
+    """Histograma de buckets fixos com soma, contagem e máximo."""
+    
+    __slots__ = ("bounds", "counts", "sum", "count", "max")
+    
+    def __init__(self, bounds):
+        """Inicializa o histograma.
+        
+        Args:
+            bounds: Limites superiores dos buckets, em ordem crescente
+        """
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+    
+    def observe(self, value):
+        """Registra um valor."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+    
+    def quantile(self, q):
+        """Estima um quantil por interpolação linear dentro do bucket."""
+        if not self.count:
+            return None
+        
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for bound, count in zip(self.bounds, self.counts):
+            if count and seen + count >= rank:
+                return min(self.max, lower + (bound - lower) * (rank - seen) / count)
+            seen += count
+            lower = bound
+        return self.max
+
+_histograms = {}
+_counters = {}
+_lock = threading.Lock()
+_NULL_CONTEXT = nullcontext()
+
+def observe(metric, label, value):
+    """Registra um valor no histograma de uma métrica.
+    
+    Args:
+        metric: Nome da métrica em METRICS
+        label: Valor do rótulo (ex: nome do coletor)
+        value: Valor medido (segundos ou bytes)
+    """
+    key = (metric, label)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram(METRICS[metric][1])
+        histogram.observe(value)
+
+def count(metric, label, amount=1):
+    """Incrementa um contador.
+    
+    Args:
+        metric: Nome da métrica em METRICS
+        label: Valor do rótulo
+        amount: Incremento
+    """
+    key = (metric, label)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+def command_name(command):
+    """Retorna o nome do programa de um comando (lista ou string)."""
+    if isinstance(command, str):
+        command = command.split()
+    return os.path.basename(command[0]) if command else ""
+
+def timed_command(command):
+    """Retorna um contexto que mede a duração de um comando externo.
+    
+    Sem instrumentação, retorna um contexto nulo compartilhado.
+    """
+    if not enabled:
+        return _NULL_CONTEXT
+    return _timed_command(command_name(command))
+
+@contextmanager
+def _timed_command(name):
+    """Mede a duração de um comando e conta seus timeouts."""
+    start = time.perf_counter()
+    try:
+        yield
+    except TimeoutError:
+        count("command_timeouts_total", name)
+        raise
+    finally:
+        observe("command_duration_seconds", name, time.perf_counter() - start)
+
+def snapshot():
+    """Retorna todas as medições.
+    
+    Returns:
+        Dicionário com "enabled", "histograms" (métrica -> rótulo -> count,
+        sum, avg, max, p50, p95 e p99, com tempos em milissegundos nas
+        métricas de duração) e "counters" (métrica -> rótulo -> valor)
+    """
+    with _lock:
+        histograms = {key: (h.count, h.sum, h.max, h.quantile(0.5), h.quantile(0.95), h.quantile(0.99))
+                      for key, h in _histograms.items()}
+        counters = dict(_counters)
+    
+    result = {"enabled": enabled, "histograms": {}, "counters": {}}
+    for (metric, label), (total, value_sum, maximum, p50, p95, p99) in sorted(histograms.items()):
+        # Durações em milissegundos, tamanhos em bytes
+        scale = 1000 if metric.endswith("_seconds") else 1
+        result["histograms"].setdefault(metric, {})[label] = {
+            "count": total,
+            "sum": round(value_sum * scale, 3),
+            "avg": round(value_sum / total * scale, 3) if total else None,
+            "max": round(maximum * scale, 3),
+            "p50": round(p50 * scale, 3) if p50 is not None else None,
+            "p95": round(p95 * scale, 3) if p95 is not None else None,
+            "p99": round(p99 * scale, 3) if p99 is not None else None
+        }
+    for (metric, label), value in sorted(counters.items()):
+        result["counters"].setdefault(metric, {})[label] = value
+    return result
+
+def render_prometheus(namespace=""):
+    """Renderiza as medições no formato texto do Prometheus.
+    
+    Args:
+        namespace: Prefixo dos nomes das métricas
+    
+    Returns:
+        Texto com histogramas (_bucket, _sum, _count) e contadores
+    """
+    with _lock:
+        histograms = {key: (list(h.counts), h.sum, h.count) for key, h in _histograms.items()}
+        counters = dict(_counters)
+    
+    lines = []
+    for metric, (label_name, bounds, help_text) in METRICS.items():
+        name = f"{namespace}_{metric}" if namespace else metric
+        if bounds is None:
+            samples = sorted((label, value) for (m, label), value in counters.items() if m == metric)
+        else:
+            samples = sorted((label, value) for (m, label), value in histograms.items() if m == metric)
+        if not samples:
+            continue
+        
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {'counter' if bounds is None else 'histogram'}")
+        for label, value in samples:
+            label_text = f'{label_name}="{_escape(label)}"'
+            if bounds is None:
+                lines.append(f"{name}{{{label_text}}} {value}")
+                continue
+            
+            counts, value_sum, total = value
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{{{label_text},le="{bound:g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{label_text},le="+Inf"}} {total}')
+            lines.append(f"{name}_sum{{{label_text}}} {value_sum!r}")
+            lines.append(f"{name}_count{{{label_text}}} {total}")
+    
+    return '\n'.join(lines) + '\n' if lines else ""
+
+def _escape(value):
+    """Escapa um valor de rótulo."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -0,0 +1,199 @@
+"""
+Profiler sob demanda do Dashboard S10+.
+
+Permite investigar lentidão no próprio dispositivo, sem depurador, por
+meio de /api/_profile?seconds=N. Dois modos:
+
+- "sample" (padrão): a thread da requisição lê as pilhas das demais
+  threads do servidor (sys._current_frames) a cada Config.PROFILE_INTERVAL
+  segundos e conta as pilhas idênticas. O resultado está no formato "collapsed"
+  (uma linha "thread;função (arquivo:linha);... contagem" por pilha),
+  aceito por flamegraph.pl, speedscope e similares. O custo é uma leitura
+  de pilhas por intervalo, sem instrumentar as chamadas;
+- "cprofile": cProfile em cada requisição HTTP atendida durante a
+  janela, na thread da própria requisição, com saída do pstats. É o
+  modo usado quando sys._current_frames não está disponível.
+
+Apenas um profile roda por vez. Fora de uma chamada, o módulo não
+mantém threads nem profilers ativos; o servidor apenas consulta se há
+uma janela "cprofile" aberta a cada requisição.
+"""
+
+import io
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+from config.settings import Config
+
+SAMPLE = "sample"
+CPROFILE = "cprofile"
+MODES = (SAMPLE, CPROFILE)
+
+_lock = threading.Lock()
+_local = threading.local()
+_NULL_CONTEXT = nullcontext()
+
+# Profilers das requisições da janela "cprofile" em andamento, ou None
+_session = None
+
+class ProfilerBusy(Exception):
+    """Já existe um profile em andamento."""
+
+def profile(seconds, mode=None):
+    """Executa um profile por alguns segundos, bloqueando a thread atual.
+    
+    Args:
+        seconds: Duração da janela em segundos
+        mode: "sample" ou "cprofile" (usa "sample" se None e disponível)
+    
+    Returns:
+        Tupla (modo usado, texto do resultado)
+    
+    Raises:
+        ProfilerBusy: Se outro profile estiver em andamento
+        ValueError: Se o modo for inválido
+    """
+    if mode is None:
+        mode = SAMPLE if hasattr(sys, "_current_frames") else CPROFILE
+    if mode not in MODES:
+        raise ValueError(f"Modo de profile inválido: {mode}")
+    
+    if not _lock.acquire(blocking=False):
+        raise ProfilerBusy()
+    try:
+        if mode == SAMPLE:
+            return mode, format_collapsed(sample_stacks(seconds))
+        return mode, profile_requests(seconds)
+    finally:
+        _lock.release()
+
+def sample_stacks(seconds, interval=None):
+    """Amostra as pilhas de todas as threads, exceto a atual.
+    
+    Args:
+        seconds: Duração da amostragem
+        interval: Segundos entre amostras (usa Config.PROFILE_INTERVAL se None)
+    
+    Returns:
+        Counter pilha collapsed -> número de amostras
+    """
+    interval = interval or Config.PROFILE_INTERVAL
+    own = threading.get_ident()
+    names = {}
+    labels = {}
+    stacks = Counter()
+    
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                stack.append(label)
+                frame = frame.f_back
+            
+            name = names.get(ident)
+            if name is None:
+                names.update((thread.ident, thread.name) for thread in threading.enumerate())
+                name = names.setdefault(ident, f"thread-{ident}")
+            stack.append(name)
+            stack.reverse()
+            stacks[';'.join(stack)] += 1
+        
+        time.sleep(interval)
+    
+    return stacks
+
+def format_collapsed(stacks):
+    """Formata as pilhas no formato collapsed, da mais frequente à menos."""
+    return ''.join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+def profile_requests(seconds):
+    """Executa cProfile nas requisições HTTP atendidas durante a janela.
+    
+    Cada requisição iniciada na janela é medida na sua própria thread
+    (ver request_profile), e o profiler é desativado ao fim da requisição
+    ou ao iniciar um canal SSE. Requisições ainda em andamento no fim da
+    janela entram no resultado com o que executaram até ali.
+    
+    Args:
+        seconds: Duração da janela
+    
+    Returns:
+        Texto do pstats ordenado por tempo acumulado
+    """
+    global _session
+    session = _session = []
+    try:
+        time.sleep(seconds)
+    finally:
+        _session = None
+    
+    output = io.StringIO()
+    if not session:
+        output.write("Nenhuma requisição atendida durante a janela\n")
+        return output.getvalue()
+    
+    stats = pstats.Stats(*[_Snapshot(profiler) for profiler in list(session)], stream=output)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(Config.PROFILE_PSTATS_LINES)
+    return output.getvalue()
+
+def request_profile():
+    """Retorna um contexto que mede a requisição atual com cProfile.
+    
+    Fora de um profile "cprofile", retorna um contexto nulo compartilhado.
+    """
+    session = _session
+    if session is None:
+        return _NULL_CONTEXT
+    return _profile_request(session)
+
+@contextmanager
+def _profile_request(session):
+    """Mede a thread atual até o fim do bloco."""
+    profiler = cProfile.Profile()
+    session.append(profiler)
+    _local.profiler = profiler
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        _local.profiler = None
+
+def suspend():
+    """Desativa o profiler da requisição atual, se houver.
+    
+    Usado por respostas de duração indefinida (canais SSE), que de outra
+    forma continuariam medidas após a janela.
+    """
+    profiler = getattr(_local, "profiler", None)
+    if profiler is not None:
+        profiler.disable()
+        _local.profiler = None
+
+class _Snapshot:
+    """Estatísticas copiadas de um profiler, aceitas por pstats.Stats.
+    
+    pstats.Stats desativaria o profiler na thread atual; a cópia evita
+    mexer no profiler, que pode continuar ativo em outra thread.
+    """
+    
+    def __init__(self, profiler):
+        profiler.snapshot_stats()
+        self.stats = dict(profiler.stats)
+    
+    def create_stats(self):
+        """Mantém as estatísticas já copiadas."""
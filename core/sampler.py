@@ -0,0 +1,105 @@
+"""
+Amostragem em segundo plano para o Dashboard S10+.
+
+Este módulo implementa threads que coletam dados de um coletor em
+intervalo fixo e os armazenam no histórico, independentemente das
+requisições dos clientes.
+"""
+
+import time
+import logging
+import threading
+
+class BackgroundSampler:
+    """Coleta periodicamente um coletor e alimenta o histórico."""
+    
+    def __init__(self, name, collector, history, interval):
+        """Inicializa o amostrador.
+        
+        Args:
+            name: Nome do coletor (chave no snapshot e fonte no histórico)
+            collector: Instância de BaseCollector
+            history: Instância de MetricsHistory
+            interval: Intervalo de amostragem em segundos
+        """
+        self.name = name
+        # Fonte no histórico (None para o histórico principal)
+        self.source = name
+        self.collector = collector
+        self.history = history
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        """Inicia a thread de amostragem."""
+        if self._thread is not None:
+            return
+        
+        if self.source is not None:
+            self.history.register_source(self.source, self.interval)
+        self._thread = threading.Thread(target=self._run, name=f"sampler-{self.name}", daemon=True)
+        self._thread.start()
+        logging.info(f"Amostragem de {self.name} iniciada a cada {self.interval}s")
+    
+    def stop(self):
+        """Sinaliza a thread para encerrar."""
+        self._stop_event.set()
+    
+    def _run(self):
+        """Laço de amostragem com ticks alinhados ao intervalo (sem deriva)."""
+        next_tick = time.monotonic()
+        while not self._stop_event.is_set():
+            try:
+                self._sample()
+            except Exception as e:
+                logging.error(f"Erro na amostragem de {self.name}: {e}")
+            
+            next_tick += self.interval
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                # Atrasou mais de um intervalo: realinha em vez de acumular
+                next_tick = time.monotonic()
+                delay = 0
+            self._stop_event.wait(delay)
+    
+    def _sample(self):
+        """Coleta uma amostra e a acrescenta ao histórico."""
+        data = self.collector.collect(force=True)
+        if data and "error" not in data:
+            self.history.add_data_point({self.name: data}, source=self.source)
+
+class SnapshotSampler(BackgroundSampler):
+    """Coleta periodicamente o snapshot principal e alimenta o histórico.
+    
+    Mantém o histórico (e com ele alertas, previsões e estatísticas)
+    atualizado sem depender de clientes consultando /api/status.
+    """
+    
+    def __init__(self, pool, history, interval, names=None):
+        """Inicializa o amostrador.
+        
+        Args:
+            pool: Instância de CollectorPool
+            history: Instância de MetricsHistory
+            interval: Intervalo de amostragem em segundos
+            names: Coletores incluídos (todos os do pool se None)
+        """
+        super().__init__("main", None, history, interval)
+        self.source = None
+        self.pool = pool
+        self.names = names
+    
+    def _sample(self):
+        """Coleta os coletores em paralelo e acrescenta o snapshot ao histórico.
+        
+        Coletores com erro ou atrasados (dados desatualizados) ficam de fora
+        do ponto, para não repetir valores antigos com um timestamp novo.
+        """
+        data = self.pool.collect_all(self.names)
+        data = {
+            name: value for name, value in data.items()
+            if value and "error" not in value and not value.get("stale")
+        }
+        if data:
+            self.history.add_data_point(data)
@@ -4,7 +4,7 @@ Servidor HTTP base para o Dashboard S10+.
 Este módulo implementa o servidor HTTP base com tratamento de erros aprimorado.
 """
 
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import json
 import traceback
 import logging
@@ -13,10 +13,15 @@ import time
 from datetime import datetime
 
 from config.settings import Config
+from core import perf
+from core import profiler
 
 class BaseHandler(BaseHTTPRequestHandler):
     """Manipulador base para todas as requisições HTTP."""
     
+    # Rótulo da rota nas medições de desempenho (definido pelas subclasses)
+    route_label = "other"
+    
     def log_message(self, format, *args):
         """Sobrescreve o log padrão para usar o sistema de logging."""
         if Config.DEBUG:
@@ -34,7 +39,91 @@ class BaseHandler(BaseHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
         self.end_headers()
-        self.wfile.write(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+        if not perf.enabled:
+            self.wfile.write(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+            return
+        
+        start = time.perf_counter()
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        perf.observe("serialization_duration_seconds", self.route_label, time.perf_counter() - start)
+        perf.observe("response_size_bytes", self.route_label, len(body))
+        self.wfile.write(body)
+    
+    def send_bytes_response(self, content, content_type, status=200):
+        """Envia um corpo já serializado.
+        
+        Args:
+            content: Corpo da resposta em bytes
+            content_type: Tipo de conteúdo MIME
+            status: Código de status HTTP (padrão: 200)
+        """
+        self.send_response(status)
+        self.send_header('Content-type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
+        self.end_headers()
+        self.wfile.write(content)
+    
+    def send_chunked_response(self, chunks, content_type, filename=None):
+        """Envia uma resposta em streaming com Transfer-Encoding: chunked.
+        
+        Args:
+            chunks: Iterável de pedaços de bytes
+            content_type: Tipo de conteúdo MIME
+            filename: Nome sugerido para download (opcional)
+        """
+        # Codificação chunked exige HTTP/1.1; a conexão é fechada ao final
+        self.protocol_version = 'HTTP/1.1'
+        self.send_response(200)
+        self.send_header('Content-type', content_type)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('Connection', 'close')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
+        if filename:
+            self.send_header('Content-Disposition', f'attachment; filename="{filename}"')
+        self.end_headers()
+        
+        try:
+            for chunk in chunks:
+                if chunk:
+                    self.wfile.write(b"%X\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            logging.info(f"Cliente {self.address_string()} encerrou o download")
+    
+    def send_event_stream(self, events):
+        """Envia um canal Server-Sent Events até o cliente desconectar.
+        
+        Args:
+            events: Iterável de tuplas (nome do evento, dados serializáveis
+                em JSON) ou None para enviar apenas um comentário de
+                keep-alive; é fechado ao final se for um gerador
+        """
+        self.send_response(200)
+        self.send_header('Content-type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        # Canal de duração indefinida: não continua medido após a janela
+        profiler.suspend()
+        
+        try:
+            for item in events:
+                if item is None:
+                    self.wfile.write(b": keep-alive\n\n")
+                else:
+                    name, data = item
+                    payload = json.dumps(data, ensure_ascii=False)
+                    self.wfile.write(f"event: {name}\ndata: {payload}\n\n".encode('utf-8'))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            logging.info(f"Cliente {self.address_string()} desconectou do canal de eventos")
+        finally:
+            close = getattr(events, 'close', None)
+            if close is not None:
+                close()
     
     def send_html_response(self, content=None, status=200):
         """Envia resposta HTML.
@@ -105,6 +194,15 @@ class BaseHandler(BaseHTTPRequestHandler):
         return datetime.now().isoformat()
 
 
+class ProfiledHTTPServer(ThreadingHTTPServer):
+    """Servidor com uma thread por requisição, medida pelo profiler sob demanda."""
+    
+    def process_request_thread(self, request, client_address):
+        """Atende a requisição, com cProfile se houver janela "cprofile" aberta."""
+        with profiler.request_profile():
+            super().process_request_thread(request, client_address)
+
+
 class DashboardServer:
     """Servidor principal do dashboard."""
     
@@ -122,7 +220,8 @@ class DashboardServer:
     def start(self):
         """Inicia o servidor HTTP."""
         try:
-            self.httpd = HTTPServer((Config.SERVER_HOST, self.port), self.handler)
+            # Uma thread por requisição: exportações longas não bloqueiam o painel
+            self.httpd = ProfiledHTTPServer((Config.SERVER_HOST, self.port), self.handler)
             logging.info(f"Servidor iniciado em {Config.SERVER_HOST}:{self.port}")
             self.httpd.serve_forever()
         except KeyboardInterrupt:
@@ -0,0 +1,366 @@
+"""
+Leitura eficiente de arquivos sysfs/procfs para o Dashboard S10+.
+
+Este módulo mantém descritores de arquivo abertos para os arquivos de
+sysfs/procfs lidos a cada coleta e os relê com os.pread, evitando o
+ciclo stat/open/read/close em cada leitura. Também descobre as zonas
+térmicas uma única vez, redescobrindo-as quando os caminhos somem.
+"""
+
+import os
+import re
+import errno
+import logging
+import threading
+
+from config.settings import Config
+
+# Erros que indicam que o caminho deixou de existir (ex: sensor removido)
+_GONE_ERRNOS = (errno.ENOENT, errno.ENODEV, errno.ENXIO, errno.EBADF)
+
+class SysfsReader:
+    """Leitor de arquivos sysfs/procfs com descritores persistentes."""
+    
+    def __init__(self, max_open_files=None):
+        """Inicializa o leitor.
+        
+        Args:
+            max_open_files: Número máximo de descritores mantidos abertos
+                (usa Config.SYSFS_MAX_OPEN_FILES se None)
+        """
+        self.max_open_files = max_open_files or Config.SYSFS_MAX_OPEN_FILES
+        self._fds = {}
+        self._lock = threading.Lock()
+    
+    def _pread_all(self, fd):
+        """Lê todo o conteúdo de um descritor a partir do início.
+        
+        Lê até o fim do arquivo (pread vazio): arquivos seq_file do procfs
+        (ex: /proc/cpuinfo, /proc/meminfo) podem devolver leituras curtas
+        mesmo havendo mais dados.
+        """
+        chunks = []
+        offset = 0
+        while True:
+            chunk = os.pread(fd, 65536 if offset else 4096, offset)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            offset += len(chunk)
+        return chunks[0] if len(chunks) == 1 else b"".join(chunks)
+    
+    def _discard(self, path):
+        """Fecha e esquece o descritor de um caminho."""
+        fd = self._fds.pop(path, None)
+        if fd is not None:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+    
+    def read(self, path):
+        """Lê o conteúdo de um arquivo mantendo o descritor aberto.
+        
+        Se a leitura pelo descritor em cache falhar, o arquivo é reaberto
+        uma vez antes de desistir.
+        
+        Args:
+            path: Caminho do arquivo
+        
+        Returns:
+            String com o conteúdo do arquivo, sem espaços nas extremidades
+        
+        Raises:
+            OSError: Se o arquivo não puder ser lido
+        """
+        with self._lock:
+            for attempt in (0, 1):
+                fd = self._fds.get(path)
+                cached = fd is not None
+                try:
+                    if fd is None:
+                        fd = os.open(path, os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0))
+                        if len(self._fds) < self.max_open_files:
+                            self._fds[path] = fd
+                            cached = True
+                    try:
+                        data = self._pread_all(fd)
+                    finally:
+                        if not cached:
+                            os.close(fd)
+                    return data.decode('utf-8', 'replace').strip()
+                except OSError:
+                    self._discard(path)
+                    if attempt or not cached:
+                        raise
+    
+    def read_int(self, path, default=None):
+        """Lê um arquivo contendo um número inteiro.
+        
+        Args:
+            path: Caminho do arquivo
+            default: Valor retornado se a leitura falhar
+        
+        Returns:
+            Valor inteiro ou default
+        """
+        try:
+            return int(self.read(path))
+        except (OSError, ValueError):
+            return default
+    
+    def read_many(self, paths):
+        """Lê vários arquivos em lote (um pread por arquivo já aberto).
+        
+        Args:
+            paths: Lista de caminhos
+        
+        Returns:
+            Dicionário caminho -> conteúdo (None para arquivos que falharam)
+        """
+        values = {}
+        for path in paths:
+            try:
+                values[path] = self.read(path)
+            except OSError:
+                values[path] = None
+        return values
+    
+    def close(self):
+        """Fecha todos os descritores abertos."""
+        with self._lock:
+            for path in list(self._fds):
+                self._discard(path)
+
+class ThermalZones:
+    """Zonas térmicas descobertas uma vez e relidas via SysfsReader."""
+    
+    def __init__(self, reader, thermal_dir='/sys/class/thermal'):
+        """Inicializa as zonas (a descoberta ocorre na primeira leitura).
+        
+        Args:
+            reader: Instância de SysfsReader
+            thermal_dir: Diretório das zonas térmicas
+        """
+        self.reader = reader
+        self.thermal_dir = thermal_dir
+        self._zones = None
+    
+    def discover(self):
+        """Descobre as zonas térmicas e armazena o tipo de cada uma.
+        
+        Returns:
+            Lista de tuplas (tipo da zona, caminho do arquivo temp)
+        """
+        zones = []
+        try:
+            entries = sorted(os.listdir(self.thermal_dir))
+        except OSError:
+            entries = []
+        
+        for zone in entries:
+            if not zone.startswith('thermal_zone'):
+                continue
+            zone_path = os.path.join(self.thermal_dir, zone)
+            
+            # O tipo da zona não muda: lê uma vez sem manter o descritor
+            try:
+                with open(os.path.join(zone_path, 'type'), 'r') as f:
+                    zone_type = f.read().strip() or zone
+            except OSError:
+                zone_type = zone
+            
+            temp_path = os.path.join(zone_path, 'temp')
+            if os.path.exists(temp_path):
+                zones.append((zone_type, temp_path))
+        
+        logging.debug(f"{len(zones)} zonas térmicas descobertas em {self.thermal_dir}")
+        self._zones = zones
+        return zones
+    
+    def read_temperatures(self):
+        """Lê a temperatura de todas as zonas.
+        
+        Returns:
+            Dicionário tipo da zona -> temperatura em °C
+        """
+        if self._zones is None:
+            self.discover()
+        
+        temps = {}
+        rediscover = False
+        for zone_type, temp_path in self._zones:
+            try:
+                temp_value = int(self.reader.read(temp_path))
+            except ValueError:
+                continue
+            except OSError as e:
+                # Sensores desativados retornam EINVAL/EAGAIN; caminhos sumidos exigem redescoberta
+                if e.errno in _GONE_ERRNOS:
+                    rediscover = True
+                continue
+            
+            # Converte para Celsius (geralmente em millicelsius)
+            if temp_value > 1000:
+                temp_value /= 1000
+            temps[zone_type] = round(temp_value, 1)
+        
+        if rediscover:
+            self._zones = None
+        
+        return temps
+
+class CpuFreqPolicies:
+    """Frequências por core e por cluster (policy) do cpufreq."""
+    
+    def __init__(self, reader, cpu_dir='/sys/devices/system/cpu'):
+        """Inicializa as policies (a descoberta ocorre na primeira leitura).
+        
+        Args:
+            reader: Instância de SysfsReader
+            cpu_dir: Diretório base das CPUs no sysfs
+        """
+        self.reader = reader
+        self.cpu_dir = cpu_dir
+        self._policies = None
+        self._last_time_in_state = {}
+    
+    def discover(self):
+        """Descobre as policies do cpufreq e os cores de cada uma.
+        
+        Kernels antigos sem diretórios policyN têm cada cpuN/cpufreq
+        tratado como uma policy própria.
+        
+        Returns:
+            Dicionário nome da policy -> (diretório, lista de cores)
+        """
+        policies = {}
+        policy_dir = os.path.join(self.cpu_dir, 'cpufreq')
+        
+        try:
+            entries = sorted(os.listdir(policy_dir), key=lambda name: int(re.sub(r'\D', '', name) or 0))
+        except OSError:
+            entries = []
+        
+        for entry in entries:
+            if not re.match(r'^policy\d+$', entry):
+                continue
+            path = os.path.join(policy_dir, entry)
+            cpus = None
+            for cpus_file in ('related_cpus', 'affected_cpus'):
+                try:
+                    cpus = [int(cpu) for cpu in self.reader.read(os.path.join(path, cpus_file)).split()]
+                    break
+                except (OSError, ValueError):
+                    continue
+            policies[entry] = (path, cpus or [int(entry[6:])])
+        
+        if not policies:
+            try:
+                cpu_entries = [e for e in os.listdir(self.cpu_dir) if re.match(r'^cpu\d+$', e)]
+            except OSError:
+                cpu_entries = []
+            for entry in sorted(cpu_entries, key=lambda name: int(name[3:])):
+                path = os.path.join(self.cpu_dir, entry, 'cpufreq')
+                if os.path.isdir(path):
+                    policies[entry] = (path, [int(entry[3:])])
+        
+        logging.debug(f"{len(policies)} policies de cpufreq descobertas")
+        self._policies = policies
+        self._last_time_in_state = {}
+        return policies
+    
+    def _read_mhz(self, path, name):
+        """Lê um arquivo de frequência em KHz e converte para MHz."""
+        value = self.reader.read_int(os.path.join(path, name))
+        return value / 1000 if value is not None else None
+    
+    def _read_residency(self, policy, path):
+        """Calcula a fração de tempo em cada frequência desde a leitura anterior.
+        
+        Args:
+            policy: Nome da policy
+            path: Diretório da policy
+            
+        Returns:
+            Dicionário frequência em MHz -> fração do intervalo, ou None na
+            primeira leitura e quando stats/time_in_state não existe
+        """
+        try:
+            content = self.reader.read(os.path.join(path, 'stats', 'time_in_state'))
+        except OSError:
+            return None
+        
+        current = {}
+        for line in content.split('\n'):
+            parts = line.split()
+            if len(parts) == 2:
+                try:
+                    current[int(parts[0])] = int(parts[1])
+                except ValueError:
+                    continue
+        
+        previous = self._last_time_in_state.get(policy)
+        self._last_time_in_state[policy] = current
+        if not previous:
+            return None
+        
+        deltas = {freq: max(0, ticks - previous.get(freq, 0)) for freq, ticks in current.items()}
+        total = sum(deltas.values())
+        if total <= 0:
+            return None
+        
+        return {
+            f"{freq / 1000:g}": round(delta / total, 4)
+            for freq, delta in sorted(deltas.items())
+        }
+    
+    def read(self):
+        """Lê as frequências atuais de todos os cores e policies.
+        
+        Returns:
+            Dicionário com "policies" (frequências atual/mín/máx em MHz,
+            limite de hardware e residência por frequência) e "cores"
+            (frequência atual e policy de cada core), ou None se não houver
+            cpufreq
+        """
+        if self._policies is None:
+            self.discover()
+        if not self._policies:
+            return None
+        
+        policies = {}
+        cores = {}
+        for policy, (path, cpus) in self._policies.items():
+            cur_mhz = self._read_mhz(path, 'scaling_cur_freq')
+            if cur_mhz is None and not os.path.isdir(path):
+                # Policy sumiu (ex: hotplug): redescobre na próxima leitura
+                self._policies = None
+                continue
+            
+            max_mhz = self._read_mhz(path, 'scaling_max_freq')
+            hw_max_mhz = self._read_mhz(path, 'cpuinfo_max_freq')
+            policies[policy] = {
+                "cpus": cpus,
+                "cur_mhz": cur_mhz,
+                "min_mhz": self._read_mhz(path, 'scaling_min_freq'),
+                "max_mhz": max_mhz,
+                "hw_min_mhz": self._read_mhz(path, 'cpuinfo_min_freq'),
+                "hw_max_mhz": hw_max_mhz,
+                # Limite máximo abaixo do hardware indica throttling térmico
+                "max_capped": bool(max_mhz and hw_max_mhz and max_mhz < hw_max_mhz),
+                "time_in_state": self._read_residency(policy, path)
+            }
+            
+            for cpu in cpus:
+                core_mhz = self._read_mhz(os.path.join(self.cpu_dir, f'cpu{cpu}', 'cpufreq'), 'scaling_cur_freq')
+                cores[f"cpu{cpu}"] = {
+                    "cur_mhz": core_mhz if core_mhz is not None else cur_mhz,
+                    "policy": policy
+                }
+        
+        return {"policies": policies, "cores": cores}
+
+
+# Instância global compartilhada por todos os coletores
+sysfs = SysfsReader()
@@ -5,19 +5,41 @@ Este módulo contém funções utilitárias usadas em todo o sistema.
 """
 
 import subprocess
+import asyncio
 import logging
 import os
 import re
 import json
+import signal
+import select
+import shlex
+import threading
+import time
+import uuid
 from datetime import datetime
 from config.settings import Config
+from core import perf
+
+# Loop asyncio dedicado aos comandos e semáforo global que limita o
+# número de processos filhos simultâneos (síncronos e assíncronos)
+_command_loop = None
+_command_semaphore = None
+_command_loop_lock = threading.Lock()
+
+# Coprocesso sh persistente (Config.COMMAND_BACKEND = "shell"); após uma
+# falha ao iniciá-lo, usa subprocess até _shell_retry_at (backoff exponencial)
+_shell_coprocess = None
+_shell_coprocess_lock = threading.Lock()
+_shell_retry_at = 0.0
+_shell_failures = 0
 
 def run_command(command, timeout=None, shell=False):
     """Executa comando shell com timeout e tratamento de erros.
     
     Args:
         command: Comando a ser executado (lista ou string)
-        timeout: Timeout em segundos (usa Config.COMMAND_TIMEOUT se None)
+        timeout: Orçamento de tempo em segundos, incluindo a espera na fila
+            (usa Config.COMMAND_TIMEOUT se None)
         shell: Se True, executa comando em shell
         
     Returns:
@@ -25,34 +47,351 @@ def run_command(command, timeout=None, shell=False):
         
     Raises:
         TimeoutError: Se o comando exceder o timeout
-        subprocess.SubprocessError: Se o comando falhar
+        OSError: Se o comando não puder ser iniciado
     """
     timeout = timeout or Config.COMMAND_TIMEOUT
     
-    try:
+    with perf.timed_command(command):
+        if Config.COMMAND_BACKEND == "shell":
+            coprocess = get_shell_coprocess()
+            if coprocess is not None:
+                return coprocess.run(command, timeout, shell)
+        
         # Se command for string e shell=False, converte para lista
         if isinstance(command, str) and not shell:
             command = command.split()
+        
+        # Executa no loop dedicado para dividir com os comandos assíncronos
+        # o limite de processos filhos e o encerramento do grupo no timeout
+        try:
+            return asyncio.run_coroutine_threadsafe(
+                _run_command_on_loop(command, timeout, shell),
+                _get_command_loop()
+            ).result()
+        except TimeoutError:
+            raise
+        except Exception as e:
+            logging.error(f"Erro ao executar comando {command}: {e}")
+            raise
+
+def _get_command_loop():
+    """Retorna o loop asyncio dedicado a comandos, iniciando-o se necessário.
+    
+    Returns:
+        Loop asyncio executando em uma thread daemon própria
+    """
+    global _command_loop, _command_semaphore
+    
+    with _command_loop_lock:
+        if _command_loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="command-loop", daemon=True)
+            thread.start()
+            
+            async def create_semaphore():
+                return asyncio.Semaphore(Config.MAX_CONCURRENT_COMMANDS)
             
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            shell=shell
+            _command_semaphore = asyncio.run_coroutine_threadsafe(create_semaphore(), loop).result()
+            _command_loop = loop
+        
+        return _command_loop
+
+def _kill_process_group(process):
+    """Encerra um processo filho e todos os seus descendentes.
+    
+    Args:
+        process: Processo asyncio iniciado em uma nova sessão
+    """
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+    except Exception:
+        process.kill()
+
+async def _run_command_on_loop(command, timeout, shell):
+    """Executa um comando no loop dedicado respeitando o semáforo global.
+    
+    O timeout é um orçamento total da chamada, incluindo a espera por
+    uma vaga no semáforo.
+    """
+    deadline = time.monotonic() + timeout
+    
+    try:
+        await asyncio.wait_for(_command_semaphore.acquire(), timeout)
+    except asyncio.TimeoutError:
+        logging.warning(f"Timeout aguardando vaga para executar comando: {command}")
+        raise TimeoutError(f"Comando excedeu timeout de {timeout}s na fila: {command}")
+    
+    try:
+        if shell:
+            process = await asyncio.create_subprocess_shell(
+                command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True
+            )
+        else:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True
+            )
+        
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                process.communicate(),
+                max(0, deadline - time.monotonic())
+            )
+        except asyncio.TimeoutError:
+            # Mata o grupo de processos inteiro (ex: filhos de um shell)
+            _kill_process_group(process)
+            await process.wait()
+            logging.warning(f"Timeout ao executar comando: {command}")
+            raise TimeoutError(f"Comando excedeu timeout de {timeout}s: {command}")
+    finally:
+        _command_semaphore.release()
+    
+    if process.returncode != 0:
+        logging.warning(f"Comando retornou código {process.returncode}: {command}")
+        logging.debug(f"Stderr: {stderr.decode('utf-8', 'replace')}")
+    
+    return stdout.decode('utf-8', 'replace').strip()
+
+async def run_command_async(command, timeout=None, shell=False):
+    """Versão assíncrona de run_command baseada em asyncio.
+    
+    Pode ser aguardada a partir de qualquer loop asyncio. A execução ocorre
+    no loop dedicado a comandos, onde um semáforo global limita o número
+    de processos filhos simultâneos (Config.MAX_CONCURRENT_COMMANDS). Em caso
+    de timeout, todo o grupo de processos do comando é encerrado.
+    
+    Args:
+        command: Comando a ser executado (lista ou string)
+        timeout: Orçamento de tempo em segundos, incluindo a espera na fila
+            (usa Config.COMMAND_TIMEOUT se None)
+        shell: Se True, executa comando em shell
+        
+    Returns:
+        String com a saída do comando
+        
+    Raises:
+        TimeoutError: Se o comando exceder o timeout
+        OSError: Se o comando não puder ser iniciado
+    """
+    timeout = timeout or Config.COMMAND_TIMEOUT
+    
+    # Se command for string e shell=False, converte para lista
+    if isinstance(command, str) and not shell:
+        command = command.split()
+    
+    loop = _get_command_loop()
+    coroutine = _run_command_on_loop(command, timeout, shell)
+    
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+    
+    with perf.timed_command(command):
+        if running_loop is loop:
+            return await coroutine
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coroutine, loop))
+
+def run_commands(commands, timeout=None, shell=False):
+    """Executa vários comandos concorrentemente a partir de código síncrono.
+    
+    Args:
+        commands: Lista de comandos (cada um lista ou string)
+        timeout: Orçamento de tempo por comando em segundos
+            (usa Config.COMMAND_TIMEOUT se None)
+        shell: Se True, executa os comandos em shell
+        
+    Returns:
+        Lista, na mesma ordem dos comandos, com a saída de cada comando
+        ou a exceção que ele levantou
+    """
+    async def run_all():
+        return await asyncio.gather(
+            *(run_command_async(command, timeout, shell) for command in commands),
+            return_exceptions=True
         )
+    
+    loop = _get_command_loop()
+    return asyncio.run_coroutine_threadsafe(run_all(), loop).result()
+
+class ShellCoprocess:
+    """Shell sh de longa duração para execução barata de comandos.
+    
+    Cada comando é escrito na entrada padrão do shell seguido de um
+    delimitador único; a saída e o código de retorno são lidos de volta
+    até o delimitador. Evita o fork+exec do processo Python (grande) a
+    cada comando. Em caso de timeout o shell é encerrado e recriado na
+    próxima chamada.
+    """
+    
+    def __init__(self, shell_path="sh"):
+        """Inicializa o coprocesso (o shell é iniciado sob demanda).
         
-        if result.returncode != 0:
-            logging.warning(f"Comando retornou código {result.returncode}: {command}")
-            logging.debug(f"Stderr: {result.stderr}")
+        Args:
+            shell_path: Executável do shell
+        """
+        self.shell_path = shell_path
+        self.process = None
+        self._lock = threading.Lock()
+    
+    def _start(self):
+        """Inicia o processo do shell em uma nova sessão."""
+        self.process = subprocess.Popen(
+            [self.shell_path],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0,
+            start_new_session=True
+        )
+        logging.debug(f"Coprocesso shell iniciado (PID {self.process.pid})")
+    
+    def close(self):
+        """Encerra o shell e todos os seus processos filhos."""
+        if self.process is None:
+            return
+        
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        self.process.wait()
+        self.process.stdin.close()
+        self.process.stdout.close()
+        self.process = None
+    
+    def run(self, command, timeout=None, shell=False):
+        """Executa um comando no shell persistente.
+        
+        Args:
+            command: Comando a ser executado (lista ou string)
+            timeout: Timeout em segundos (usa Config.COMMAND_TIMEOUT se None),
+                incluindo a espera por outros comandos em execução
+            shell: Se True, a string é interpretada pelo shell sem escape
+            
+        Returns:
+            String com a saída do comando
+            
+        Raises:
+            TimeoutError: Se o comando exceder o timeout
+            FileNotFoundError: Se o comando não existir
+            PermissionError: Se o comando não puder ser executado
+        """
+        timeout = timeout or Config.COMMAND_TIMEOUT
+        deadline = time.monotonic() + timeout
+        
+        if isinstance(command, str):
+            script = command if shell else shlex.join(command.split())
+        else:
+            script = shlex.join(command)
+        
+        if not self._lock.acquire(timeout=timeout):
+            logging.warning(f"Timeout aguardando o coprocesso shell: {command}")
+            raise TimeoutError(f"Comando excedeu timeout de {timeout}s na fila: {command}")
+        
+        try:
+            if self.process is None or self.process.poll() is not None:
+                self._start()
+            
+            marker = f"__S10_END_{uuid.uuid4().hex}__"
+            # stdin do comando vem de /dev/null para não consumir o canal de controle
+            request = f"{{ {script}\n}} </dev/null 2>/dev/null; printf '\\n%s %d\\n' {marker} $?\n"
+            os.write(self.process.stdin.fileno(), request.encode('utf-8'))
             
-        return result.stdout.strip()
-    except subprocess.TimeoutExpired:
-        logging.warning(f"Timeout ao executar comando: {command}")
-        raise TimeoutError(f"Comando excedeu timeout de {timeout}s: {command}")
-    except Exception as e:
-        logging.error(f"Erro ao executar comando {command}: {e}")
-        raise
+            output = self._read_until(f"\n{marker} ".encode(), deadline)
+            if output is None:
+                logging.warning(f"Timeout ao executar comando: {command}")
+                self.close()
+                raise TimeoutError(f"Comando excedeu timeout de {timeout}s: {command}")
+        except OSError:
+            # Shell morreu ou pipe quebrado: recria na próxima chamada
+            self.close()
+            raise
+        finally:
+            self._lock.release()
+        
+        stdout, returncode = output
+        if returncode == 127:
+            raise FileNotFoundError(f"Comando não encontrado: {command}")
+        if returncode == 126:
+            raise PermissionError(f"Comando não executável: {command}")
+        if returncode != 0:
+            logging.warning(f"Comando retornou código {returncode}: {command}")
+        
+        return stdout.decode('utf-8', 'replace').strip()
+    
+    def _read_until(self, separator, deadline):
+        """Lê a saída do shell até o delimitador do comando atual.
+        
+        Args:
+            separator: Bytes que precedem o código de retorno
+            deadline: Instante (time.monotonic) limite para a leitura
+            
+        Returns:
+            Tupla (saída em bytes, código de retorno) ou None em caso de timeout
+        """
+        fd = self.process.stdout.fileno()
+        buffer = bytearray()
+        
+        while True:
+            index = buffer.find(separator)
+            if index >= 0:
+                tail = buffer[index + len(separator):]
+                if tail.endswith(b"\n"):
+                    return bytes(buffer[:index]), int(tail.strip())
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                return None
+            
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise OSError("Coprocesso shell encerrou inesperadamente")
+            buffer.extend(chunk)
+
+def get_shell_coprocess():
+    """Retorna o coprocesso shell global, criando-o se necessário.
+    
+    Se o shell não puder ser iniciado, os comandos usam subprocess e uma
+    nova tentativa só é feita após um backoff exponencial
+    (Config.FALLBACK_BACKOFF_BASE a Config.FALLBACK_BACKOFF_MAX).
+    
+    Returns:
+        Instância de ShellCoprocess ou None se o shell não estiver disponível
+    """
+    global _shell_coprocess, _shell_retry_at, _shell_failures
+    
+    with _shell_coprocess_lock:
+        if _shell_coprocess is None:
+            if time.monotonic() < _shell_retry_at:
+                return None
+            
+            coprocess = ShellCoprocess(Config.SHELL_PATH)
+            try:
+                coprocess.run(['true'])
+            except Exception as e:
+                coprocess.close()
+                _shell_failures += 1
+                backoff = min(Config.FALLBACK_BACKOFF_MAX, Config.FALLBACK_BACKOFF_BASE * 2 ** (_shell_failures - 1))
+                _shell_retry_at = time.monotonic() + backoff
+                logging.error(f"Coprocesso shell indisponível, usando subprocess por {backoff}s: {e}")
+                return None
+            
+            _shell_coprocess = coprocess
+            _shell_failures = 0
+        
+        return _shell_coprocess
 
 def format_bytes(bytes_value, precision=2):
     """Formata bytes para unidades legíveis (KB, MB, GB).
@@ -84,6 +423,28 @@ def format_bytes(bytes_value, precision=2):
         
     return f"{bytes_value:.{precision}f} {units[unit_index]}"
 
+def format_duration(seconds):
+    """Formata uma duração em segundos (ex: "2 dias, 3 horas, 15 minutos").
+    
+    Args:
+        seconds: Duração em segundos
+        
+    Returns:
+        String formatada
+    """
+    seconds = int(seconds)
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes = seconds // 60
+    
+    parts = []
+    if days:
+        parts.append(f"{days} dia{'s' if days != 1 else ''}")
+    if hours:
+        parts.append(f"{hours} hora{'s' if hours != 1 else ''}")
+    parts.append(f"{minutes} minuto{'s' if minutes != 1 else ''}")
+    return ", ".join(parts)
+
 def safe_parse_json(json_str):
     """Analisa JSON com tratamento de erros.
     
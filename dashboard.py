@@ -11,6 +11,7 @@ rodando Termux.
 import os
 import sys
 import signal
+import threading
 import logging
 import argparse
 from datetime import datetime
@@ -58,6 +59,21 @@ def signal_handler(sig, frame):
     remove_pid_file()
     sys.exit(0)
 
+def reload_handler(sig, frame):
+    """Invalida fatos estáticos voláteis (ex: hostname) ao receber SIGHUP.
+    
+    A invalidação obtém o lock dos fatos, que a thread principal pode
+    estar segurando quando o sinal chega; por isso roda em outra thread,
+    fora do contexto do manipulador.
+    """
+    logging.info(f"Sinal recebido: {sig}")
+    threading.Thread(target=reload_facts, name="facts-reload", daemon=True).start()
+
+def reload_facts():
+    """Invalida os fatos estáticos voláteis."""
+    from core.facts import facts
+    facts.invalidate()
+
 def parse_arguments():
     """Processa argumentos de linha de comando."""
     parser = argparse.ArgumentParser(description='Dashboard para servidor S10+')
@@ -82,6 +98,8 @@ def main():
     # Registra manipuladores de sinal
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
+    if hasattr(signal, 'SIGHUP'):
+        signal.signal(signal.SIGHUP, reload_handler)
     
     # Escreve arquivo PID
     write_pid_file()
@@ -90,6 +108,13 @@ def main():
         # Importa e inicia o servidor
         from api.routes import ApiHandler
         from core.server import DashboardServer
+        from core.facts import facts
+        
+        from api.routes import start_background_tasks
+        
+        # Calcula fatos estáticos uma única vez antes de aceitar requisições
+        facts.preload()
+        start_background_tasks()
         
         logging.info(f"Iniciando Dashboard S10+ na porta {Config.SERVER_PORT}")
         server = DashboardServer(ApiHandler, Config.SERVER_PORT)
@@ -99,6 +124,11 @@ def main():
         import traceback
         logging.error(traceback.format_exc())
     finally:
+        try:
+            from api.routes import stop_background_tasks
+            stop_background_tasks()
+        except Exception as e:
+            logging.error(f"Erro ao encerrar tarefas em segundo plano: {e}")
         remove_pid_file()
 
 if __name__ == "__main__":
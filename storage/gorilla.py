@@ -0,0 +1,204 @@
+"""
+Codificação comprimida de séries temporais (estilo Gorilla).
+
+Este módulo implementa a compressão descrita no artigo "Gorilla: A Fast,
+Scalable, In-Memory Time Series Database" (Facebook, 2015):
+
+- timestamps (em milissegundos) codificados como delta-of-delta, com
+  prefixos de tamanho variável; amostras em intervalo regular custam 1 bit;
+- valores float64 codificados pelo XOR com o valor anterior; valores
+  repetidos custam 1 bit e valores próximos reaproveitam a janela de bits
+  significativos do valor anterior.
+
+Cada bloco é independente: começa com o primeiro timestamp e o primeiro
+valor completos, de modo que pode ser decodificado isoladamente.
+"""
+
+import struct
+
+_DOUBLE = struct.Struct('>d')
+_UINT64 = struct.Struct('>Q')
+
+# Faixas do delta-of-delta: (prefixo, bits do prefixo, bits do valor)
+_DOD_RANGES = (
+    (0b10, 2, 7),
+    (0b110, 3, 9),
+    (0b1110, 4, 12)
+)
+
+def _float_bits(value):
+    """Retorna a representação binária de um float64 como inteiro."""
+    return _UINT64.unpack(_DOUBLE.pack(value))[0]
+
+def _bits_float(bits):
+    """Converte a representação binária de um float64 de volta para float."""
+    return _DOUBLE.unpack(_UINT64.pack(bits))[0]
+
+class BitWriter:
+    """Acumula bits em um bytearray."""
+    
+    def __init__(self):
+        """Inicializa o escritor vazio."""
+        self.buffer = bytearray()
+        self._acc = 0
+        self._bits = 0
+    
+    def write(self, value, nbits):
+        """Escreve os nbits menos significativos de value."""
+        self._acc = (self._acc << nbits) | (value & ((1 << nbits) - 1))
+        self._bits += nbits
+        while self._bits >= 8:
+            self._bits -= 8
+            self.buffer.append((self._acc >> self._bits) & 0xFF)
+        self._acc &= (1 << self._bits) - 1
+    
+    def getvalue(self):
+        """Retorna os bytes escritos, completando o último byte com zeros."""
+        if self._bits:
+            return bytes(self.buffer) + bytes([(self._acc << (8 - self._bits)) & 0xFF])
+        return bytes(self.buffer)
+
+class BitReader:
+    """Lê bits sequencialmente de um buffer."""
+    
+    def __init__(self, data):
+        """Inicializa o leitor.
+        
+        Args:
+            data: bytes (ou memoryview) com os bits codificados
+        """
+        self._value = int.from_bytes(data, 'big')
+        self._remaining = len(data) * 8
+    
+    def read(self, nbits):
+        """Lê nbits e retorna o inteiro correspondente."""
+        self._remaining -= nbits
+        if self._remaining < 0:
+            raise ValueError("Bloco comprimido truncado")
+        return (self._value >> self._remaining) & ((1 << nbits) - 1)
+    
+    def read_bit(self):
+        """Lê um único bit."""
+        return self.read(1)
+
+def encode_block(points):
+    """Codifica uma série de pontos em um bloco comprimido.
+    
+    Args:
+        points: Lista de tuplas (timestamp em segundos, valor float) em
+            ordem cronológica (os timestamps são arredondados para ms)
+    
+    Returns:
+        bytes com o bloco codificado
+    """
+    writer = BitWriter()
+    if not points:
+        return writer.getvalue()
+    
+    first_ts = round(points[0][0] * 1000)
+    first_bits = _float_bits(points[0][1])
+    writer.write(first_ts, 64)
+    writer.write(first_bits, 64)
+    
+    previous_ts = first_ts
+    previous_delta = 0
+    previous_bits = first_bits
+    previous_leading = previous_trailing = -1
+    
+    for timestamp, value in points[1:]:
+        # Timestamp: delta-of-delta
+        ts = round(timestamp * 1000)
+        delta = ts - previous_ts
+        dod = delta - previous_delta
+        previous_ts = ts
+        previous_delta = delta
+        
+        if dod == 0:
+            writer.write(0, 1)
+        else:
+            for prefix, prefix_bits, value_bits in _DOD_RANGES:
+                limit = 1 << (value_bits - 1)
+                if -limit < dod <= limit:
+                    writer.write(prefix, prefix_bits)
+                    writer.write(dod + limit - 1, value_bits)
+                    break
+            else:
+                writer.write(0b1111, 4)
+                writer.write(dod, 64)
+        
+        # Valor: XOR com o anterior
+        bits = _float_bits(value)
+        xor = bits ^ previous_bits
+        previous_bits = bits
+        
+        if xor == 0:
+            writer.write(0, 1)
+            continue
+        
+        leading = min(64 - xor.bit_length(), 31)
+        trailing = (xor & -xor).bit_length() - 1
+        
+        if previous_leading >= 0 and leading >= previous_leading and trailing >= previous_trailing:
+            # Cabe na janela de bits significativos do valor anterior
+            writer.write(0b10, 2)
+            writer.write(xor >> previous_trailing, 64 - previous_leading - previous_trailing)
+        else:
+            significant = 64 - leading - trailing
+            writer.write(0b11, 2)
+            writer.write(leading, 5)
+            # 64 bits significativos não cabem em 6 bits: grava como 0
+            writer.write(significant & 0x3F, 6)
+            writer.write(xor >> trailing, significant)
+            previous_leading = leading
+            previous_trailing = trailing
+    
+    return writer.getvalue()
+
+def decode_block(data, count):
+    """Decodifica um bloco comprimido.
+    
+    Args:
+        data: bytes com o bloco codificado
+        count: Número de pontos no bloco
+    
+    Returns:
+        Lista de tuplas (timestamp em segundos, valor float)
+    """
+    if count <= 0:
+        return []
+    
+    reader = BitReader(data)
+    ts = reader.read(64)
+    bits = reader.read(64)
+    points = [(ts / 1000, _bits_float(bits))]
+    
+    delta = 0
+    leading = trailing = 0
+    
+    for _ in range(count - 1):
+        # Timestamp
+        if reader.read_bit() == 0:
+            dod = 0
+        else:
+            for _, _, value_bits in _DOD_RANGES:
+                if reader.read_bit() == 0:
+                    dod = reader.read(value_bits) - (1 << (value_bits - 1)) + 1
+                    break
+            else:
+                dod = reader.read(64)
+                if dod >= 1 << 63:
+                    dod -= 1 << 64
+        delta += dod
+        ts += delta
+        
+        # Valor
+        if reader.read_bit() == 1:
+            if reader.read_bit() == 1:
+                leading = reader.read(5)
+                significant = reader.read(6) or 64
+                trailing = 64 - leading - significant
+            bits ^= reader.read(64 - leading - trailing) << trailing
+        
+        points.append((ts / 1000, _bits_float(bits)))
+    
+    return points
@@ -3,83 +3,887 @@ Armazenamento de métricas históricas para o Dashboard S10+.
 
 Este módulo implementa o armazenamento e recuperação de dados históricos
 para visualização de tendências e gráficos.
+
+O histórico é colunar: cada snapshot é achatado em caminhos de métrica
+("hardware.memory.used") e cada métrica numérica ocupa um buffer circular
+array('d') de tamanho fixo, compartilhando uma única coluna de timestamps
+(epoch em segundos) por fonte. Campos não numéricos são guardados apenas
+quando mudam de valor.
 """
 
+import math
+import time
+import heapq
+import logging
+import operator
+import threading
+from array import array
+from itertools import compress
 from collections import deque
-from datetime import datetime
 
 from config.settings import Config
 
+NAN = float('nan')
+
+# Chaves usadas para identificar itens de listas (ex: interfaces, partições)
+LIST_ITEM_KEYS = ("mount_point", "name", "device")
+
+# Funções de agregação por intervalo (step) das consultas de histórico
+AGGREGATIONS = {
+    "avg": lambda values: sum(values) / len(values),
+    "min": min,
+    "max": max,
+    "last": lambda values: values[-1]
+}
+
+def aggregate_points(points, step, aggregation="avg"):
+    """Agrega pontos em intervalos de tempo fixos.
+    
+    Args:
+        points: Lista de tuplas (timestamp, valor) em ordem cronológica
+        step: Tamanho do intervalo em segundos
+        aggregation: Nome da função em AGGREGATIONS (valores não numéricos
+            usam sempre "last")
+    
+    Returns:
+        Lista de tuplas (início do intervalo, valor agregado)
+    """
+    buckets = []
+    for timestamp, value in points:
+        start = timestamp - timestamp % step
+        if not buckets or buckets[-1][0] != start:
+            buckets.append((start, []))
+        buckets[-1][1].append(value)
+    
+    aggregated = []
+    for start, values in buckets:
+        func = AGGREGATIONS[aggregation] if isinstance(values[-1], (int, float)) else AGGREGATIONS["last"]
+        aggregated.append((start, func(values)))
+    return aggregated
+
+def downsample_lttb(timestamps, values, threshold):
+    """Reduz uma série numérica com Largest-Triangle-Three-Buckets.
+    
+    Mantém o primeiro e o último ponto e, de cada intervalo intermediário,
+    o ponto que forma o maior triângulo com o ponto escolhido no intervalo
+    anterior e a média do intervalo seguinte. Picos e vales são
+    preservados, ao contrário de uma média por intervalo.
+    
+    Args:
+        timestamps: Sequência de timestamps em ordem cronológica
+            (ex: array('d') copiado do buffer circular)
+        values: Sequência dos valores numéricos correspondentes
+        threshold: Número máximo de pontos no resultado
+    
+    Returns:
+        Lista de tuplas (timestamp, valor) com no máximo threshold pontos
+        da série original
+    """
+    count = len(timestamps)
+    if threshold >= count:
+        return list(zip(timestamps, values))
+    if threshold < 3:
+        return [(timestamps[0], values[0]), (timestamps[-1], values[-1])][:threshold]
+    
+    bucket_size = (count - 2) / (threshold - 2)
+    
+    indices = [0]
+    selected = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        next_end = min(int((bucket + 2) * bucket_size) + 1, count)
+        
+        # Terceiro vértice: média do próximo intervalo
+        size = next_end - end
+        avg_x = sum(timestamps[end:next_end]) / size
+        avg_y = sum(values[end:next_end]) / size
+        
+        # Área (dobrada) do triângulo = |dx * (y - ay) - dy * (x - ax)|
+        ax = timestamps[selected]
+        ay = values[selected]
+        dx = ax - avg_x
+        dy = ay - avg_y
+        areas = [abs(dx * (y - ay) - dy * (x - ax)) for x, y in zip(timestamps[start:end], values[start:end])]
+        selected = start + areas.index(max(areas))
+        indices.append(selected)
+    
+    indices.append(count - 1)
+    return [(timestamps[index], values[index]) for index in indices]
+
+def aggregate_rollups(rollups, step, aggregation="avg"):
+    """Agrega intervalos de um nível de rollup no step pedido.
+    
+    Args:
+        rollups: Lista de tuplas (início, mín, máx, soma, contagem)
+        step: Tamanho do intervalo em segundos (None mantém a resolução do nível)
+        aggregation: avg, min, max ou last ("last" usa a média do último
+            intervalo, já que os rollups não guardam o valor final)
+    
+    Returns:
+        Lista de tuplas (início do intervalo, valor agregado)
+    """
+    buckets = []
+    for timestamp, minimum, maximum, total, count in rollups:
+        start = timestamp - timestamp % step if step else timestamp
+        if not buckets or buckets[-1][0] != start:
+            buckets.append([start, minimum, maximum, 0.0, 0, 0.0])
+        bucket = buckets[-1]
+        bucket[1] = min(bucket[1], minimum)
+        bucket[2] = max(bucket[2], maximum)
+        bucket[3] += total
+        bucket[4] += count
+        bucket[5] = total / count
+    
+    if aggregation == "min":
+        return [(bucket[0], bucket[1]) for bucket in buckets]
+    if aggregation == "max":
+        return [(bucket[0], bucket[2]) for bucket in buckets]
+    if aggregation == "last":
+        return [(bucket[0], bucket[5]) for bucket in buckets]
+    return [(bucket[0], bucket[3] / bucket[4]) for bucket in buckets]
+
+def flatten_snapshot(data, exclude=(), prefix=""):
+    """Achata um snapshot aninhado em pares caminho -> valor.
+    
+    Itens de listas são identificados pela primeira chave de LIST_ITEM_KEYS
+    presente no item ou, na falta dela, pela posição. Campos "timestamp"
+    são ignorados (o histórico tem sua própria coluna de tempo).
+    
+    Args:
+        data: Dicionário aninhado
+        exclude: Caminhos a ignorar (ex: "process.top_processes")
+        prefix: Caminho do nível atual (uso interno na recursão)
+    
+    Yields:
+        Tuplas (caminho, valor) com valores escalares
+    """
+    if isinstance(data, dict):
+        items = data.items()
+    else:
+        items = []
+        for index, item in enumerate(data):
+            key = index
+            if isinstance(item, dict):
+                key = next((item[k] for k in LIST_ITEM_KEYS if item.get(k)), index)
+            items.append((key, item))
+    
+    for key, value in items:
+        if key == "timestamp":
+            continue
+        path = f"{prefix}.{key}" if prefix else str(key)
+        if path in exclude:
+            continue
+        if isinstance(value, (dict, list)):
+            yield from flatten_snapshot(value, exclude, path)
+        elif value is not None:
+            yield path, value
+
+class _Ring:
+    """Base dos buffers circulares com coluna de tempo monotônica."""
+    
+    def __init__(self, capacity):
+        """Inicializa o buffer.
+        
+        Args:
+            capacity: Número máximo de pontos mantidos
+        """
+        self.capacity = capacity
+        self.timestamps = array('d', [NAN]) * capacity
+        self.head = 0
+        self.count = 0
+    
+    def _advance(self, timestamp):
+        """Ocupa o próximo slot com o timestamp informado.
+        
+        Returns:
+            Índice do slot ocupado
+        """
+        slot = self.head
+        self.timestamps[slot] = timestamp
+        self.head = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        return slot
+    
+    def last_timestamp(self):
+        """Retorna o timestamp do ponto mais recente (None se vazio)."""
+        return self.timestamps[(self.head - 1) % self.capacity] if self.count else None
+    
+    def first_timestamp(self):
+        """Retorna o timestamp do ponto mais antigo (None se vazio)."""
+        return self.timestamps[(self.head - self.count) % self.capacity] if self.count else None
+    
+    def covers(self, start):
+        """Indica se o buffer ainda guarda tudo desde o início informado.
+        
+        Um buffer que não deu a volta guarda tudo o que já foi registrado.
+        """
+        return start is None or self.count < self.capacity or self.first_timestamp() <= start
+    
+    def slots(self, start=None, end=None):
+        """Retorna os índices dos pontos em ordem cronológica.
+        
+        Args:
+            start: Epoch inicial (inclusivo) ou None para o início
+            end: Epoch final (inclusivo) ou None para o fim
+        """
+        first = self._bisect(start) if start is not None else 0
+        last = self._bisect(math.nextafter(end, math.inf)) if end is not None else self.count
+        offset = self.head - self.count
+        return [(offset + position) % self.capacity for position in range(first, last)]
+    
+    def window(self, column, start=None, end=None):
+        """Copia um trecho de uma coluna em ordem cronológica.
+        
+        O trecho é copiado com fatias de array (no máximo duas, quando ele
+        passa pelo fim do buffer), sem iterar pelos slots em Python.
+        
+        Args:
+            column: Coluna (array('d')) deste buffer, ou a própria coluna de tempo
+            start: Epoch inicial (inclusivo) ou None para o início
+            end: Epoch final (inclusivo) ou None para o fim
+        
+        Returns:
+            array('d') com os valores do período
+        """
+        first = self._bisect(start) if start is not None else 0
+        last = self._bisect(math.nextafter(end, math.inf)) if end is not None else self.count
+        begin = (self.head - self.count + first) % self.capacity
+        stop = begin + max(0, last - first)
+        if stop <= self.capacity:
+            return column[begin:stop]
+        return column[begin:] + column[:stop - self.capacity]
+    
+    def _bisect(self, timestamp):
+        """Busca binária na coluna de tempo.
+        
+        Args:
+            timestamp: Epoch em segundos
+        
+        Returns:
+            Posição cronológica (0 = ponto mais antigo) do primeiro ponto
+            com timestamp maior ou igual ao informado
+        """
+        start = (self.head - self.count) % self.capacity
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.timestamps[(start + middle) % self.capacity] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+class _RollupTier(_Ring):
+    """Agregados (mín/máx/soma/contagem) por intervalo fixo, calculados na ingestão.
+    
+    As colunas crescem sob demanda (dobrando) até a capacidade, de modo que
+    a memória acompanha o período efetivamente coberto, e não a retenção.
+    """
+    
+    # Slots alocados inicialmente em cada coluna
+    INITIAL_SLOTS = 64
+    
+    def __init__(self, resolution, retention):
+        """Inicializa o nível.
+        
+        Args:
+            resolution: Duração de cada intervalo em segundos
+            retention: Período mantido em segundos
+        """
+        super().__init__(max(1, int(retention // resolution)))
+        self.timestamps = array('d')
+        self.resolution = resolution
+        self.columns = {}
+    
+    def _advance(self, timestamp):
+        """Ocupa o próximo slot, ampliando as colunas se necessário.
+        
+        Antes de dar a volta, o buffer é preenchido em ordem (head ==
+        count), então basta estender as colunas no final.
+        """
+        allocated = len(self.timestamps)
+        if self.head == allocated:
+            extra = min(self.capacity, max(self.INITIAL_SLOTS, 2 * allocated)) - allocated
+            self.timestamps.extend(array('d', [NAN]) * extra)
+            for minimum, maximum, total, count in self.columns.values():
+                minimum.extend(array('d', [NAN]) * extra)
+                maximum.extend(array('d', [NAN]) * extra)
+                total.extend(array('d', [0.0]) * extra)
+                count.extend(array('I', [0]) * extra)
+        return super()._advance(timestamp)
+    
+    def _bucket_slot(self, bucket):
+        """Retorna o slot do intervalo, abrindo um novo se for posterior ao último."""
+        last = self.last_timestamp()
+        if last is not None and bucket <= last:
+            return (self.head - 1) % self.capacity
+        
+        slot = self._advance(bucket)
+        for minimum, maximum, total, count in self.columns.values():
+            minimum[slot] = maximum[slot] = NAN
+            total[slot] = 0.0
+            count[slot] = 0
+        return slot
+    
+    def _column(self, path):
+        """Retorna as colunas (mín, máx, soma, contagem) de uma métrica, criando-as."""
+        columns = self.columns.get(path)
+        if columns is None:
+            size = len(self.timestamps)
+            columns = self.columns[path] = (
+                array('d', [NAN]) * size,
+                array('d', [NAN]) * size,
+                array('d', [0.0]) * size,
+                array('I', [0]) * size
+            )
+        return columns
+    
+    def add(self, timestamp, values):
+        """Incorpora os valores de um ponto ao intervalo corrente.
+        
+        Args:
+            timestamp: Epoch em segundos
+            values: Dicionário caminho -> valor numérico
+        """
+        slot = self._bucket_slot(timestamp - timestamp % self.resolution)
+        
+        for path, value in values.items():
+            minimum, maximum, total, count = self._column(path)
+            if count[slot]:
+                if value < minimum[slot]:
+                    minimum[slot] = value
+                if value > maximum[slot]:
+                    maximum[slot] = value
+            else:
+                minimum[slot] = maximum[slot] = value
+            total[slot] += value
+            count[slot] += 1
+    
+    def merged(self, older):
+        """Combina os intervalos de um nível mais antigo com os deste.
+        
+        Usado para acrescentar agregados reconstruídos do disco antes dos
+        calculados desde o início do processo; um intervalo presente nos
+        dois (a fronteira entre eles) tem os agregados combinados.
+        
+        Args:
+            older: _RollupTier com a mesma resolução e intervalos anteriores
+        
+        Returns:
+            Novo _RollupTier
+        """
+        tier = _RollupTier(self.resolution, self.capacity * self.resolution)
+        for source in (older, self):
+            for slot in source.slots():
+                target = tier._bucket_slot(source.timestamps[slot])
+                for path, (minimum, maximum, total, count) in source.columns.items():
+                    if not count[slot]:
+                        continue
+                    t_minimum, t_maximum, t_total, t_count = tier._column(path)
+                    if t_count[target]:
+                        t_minimum[target] = min(t_minimum[target], minimum[slot])
+                        t_maximum[target] = max(t_maximum[target], maximum[slot])
+                    else:
+                        t_minimum[target] = minimum[slot]
+                        t_maximum[target] = maximum[slot]
+                    t_total[target] += total[slot]
+                    t_count[target] += count[slot]
+        return tier
+    
+    def series(self, path, start=None, end=None):
+        """Retorna os agregados de uma métrica em ordem cronológica.
+        
+        Returns:
+            Lista de tuplas (início do intervalo, mín, máx, soma, contagem)
+        """
+        columns = self.columns.get(path)
+        if columns is None:
+            return []
+        
+        minimum, maximum, total, count = columns
+        return [
+            (self.timestamps[slot], minimum[slot], maximum[slot], total[slot], count[slot])
+            for slot in self.slots(start, end)
+            if count[slot]
+        ]
+
+class _SeriesGroup(_Ring):
+    """Buffers circulares de uma fonte, com coluna de tempo compartilhada."""
+    
+    def __init__(self, capacity, tiers=()):
+        """Inicializa o grupo.
+        
+        Args:
+            capacity: Número máximo de pontos brutos mantidos
+            tiers: Lista de tuplas (resolução, retenção) dos níveis de agregação
+        """
+        super().__init__(capacity)
+        self.columns = {}
+        self.changes = {}
+        self.tiers = [_RollupTier(resolution, retention) for resolution, retention in sorted(tiers)]
+    
+    def append(self, timestamp, values):
+        """Adiciona um ponto em O(número de métricas), sem realocar.
+        
+        Args:
+            timestamp: Epoch em segundos
+            values: Iterável de pares caminho -> valor escalar
+        
+        Returns:
+            Lista de caminhos vistos pela primeira vez neste grupo
+        """
+        last = self.last_timestamp()
+        if last is not None:
+            # Mantém a coluna de tempo monotônica (relógio ajustado para trás)
+            timestamp = max(timestamp, last)
+        slot = self._advance(timestamp)
+        numeric = {}
+        created = []
+        
+        for path, value in values:
+            if isinstance(value, (int, float)):
+                column = self.columns.get(path)
+                if column is None:
+                    column = self.columns[path] = array('d', [NAN]) * self.capacity
+                    created.append(path)
+                column[slot] = value
+                numeric[path] = value
+            else:
+                # Não numéricos: armazenados apenas quando mudam
+                changes = self.changes.get(path)
+                if changes is None:
+                    changes = self.changes[path] = deque(maxlen=self.capacity)
+                    created.append(path)
+                if not changes or changes[-1][1] != value:
+                    changes.append((timestamp, value))
+        
+        # Métricas ausentes neste ponto não podem herdar o valor antigo do slot
+        for path, column in self.columns.items():
+            if path not in numeric:
+                column[slot] = NAN
+        
+        for tier in self.tiers:
+            tier.add(timestamp, numeric)
+        
+        return created
+    
+    def select_tier(self, start=None, step=None):
+        """Escolhe o nível que atende uma consulta.
+        
+        Usa o nível mais grosso cuja resolução não exceda o step pedido;
+        se o início pedido for anterior ao que esse nível ainda guarda,
+        passa aos níveis mais grossos que o cobrem.
+        
+        Args:
+            start: Epoch inicial da consulta (None para o início do histórico)
+            step: Intervalo de agregação pedido (None para pontos brutos)
+        
+        Returns:
+            Instância de _RollupTier, ou None para os pontos brutos
+        """
+        levels = [None] + self.tiers
+        chosen = 0
+        if step:
+            for index, tier in enumerate(self.tiers, 1):
+                if tier.resolution <= step:
+                    chosen = index
+        
+        for level in levels[chosen:]:
+            if (level or self).covers(start):
+                return level
+        
+        # Nenhum nível cobre todo o período: usa o de maior retenção
+        return levels[-1]
+    
+    def series(self, path, start=None, end=None):
+        """Retorna os pontos brutos de uma métrica em ordem cronológica.
+        
+        Args:
+            path: Caminho da métrica
+            start: Epoch inicial (inclusivo) ou None para o início do histórico
+            end: Epoch final (inclusivo) ou None para o fim do histórico
+        
+        Returns:
+            Lista de tuplas (timestamp, valor), ou None se a métrica não
+            existir neste grupo
+        """
+        column = self.columns.get(path)
+        if column is not None:
+            timestamps = self.timestamps
+            return [
+                (timestamps[slot], column[slot])
+                for slot in self.slots(start, end)
+                if not math.isnan(column[slot])
+            ]
+        
+        changes = self.changes.get(path)
+        if changes is not None:
+            oldest = self.first_timestamp() or 0
+            if start is not None:
+                oldest = max(oldest, start)
+            points = []
+            for ts, value in changes:
+                if end is not None and ts > end:
+                    break
+                if ts > oldest:
+                    points.append((ts, value))
+                else:
+                    # Valor em vigor no início do período
+                    points = [(oldest, value)]
+            return points
+        
+        return None
+    
+    def column_window(self, path, start=None, end=None):
+        """Retorna as colunas de tempo e de valor de uma métrica numérica.
+        
+        Equivale a series() para métricas numéricas, mas devolve as colunas
+        separadas, sem criar uma tupla por ponto. Slots sem valor (NaN) são
+        removidos com compress/map, também sem laço em Python.
+        
+        Args:
+            path: Caminho de uma métrica numérica deste grupo
+            start: Epoch inicial (inclusivo) ou None para o início do histórico
+            end: Epoch final (inclusivo) ou None para o fim do histórico
+        
+        Returns:
+            Tupla (timestamps, valores) de array('d') em ordem cronológica
+        """
+        timestamps = self.window(self.timestamps, start, end)
+        values = self.window(self.columns[path], start, end)
+        if math.isnan(sum(values)):
+            present = list(map(operator.not_, map(math.isnan, values)))
+            timestamps = array('d', compress(timestamps, present))
+            values = array('d', compress(values, present))
+        return timestamps, values
+    
+    def latest(self, path):
+        """Retorna o valor mais recente de uma métrica.
+        
+        Args:
+            path: Caminho da métrica
+        
+        Returns:
+            Tupla (timestamp, valor); valor None se a métrica não estava
+            presente no último ponto
+        """
+        column = self.columns.get(path)
+        if column is not None:
+            slot = (self.head - 1) % self.capacity
+            value = column[slot]
+            return self.timestamps[slot], None if math.isnan(value) else value
+        
+        changes = self.changes[path]
+        return changes[-1]
+
 class MetricsHistory:
     """Gerencia o histórico de métricas coletadas."""
     
-    def __init__(self, max_size=None):
+    def __init__(self, max_size=None, exclude=None, tiers=None):
         """Inicializa o armazenamento de histórico.
         
         Args:
-            max_size: Tamanho máximo do histórico (usa Config.HISTORY_SIZE se None)
+            max_size: Tamanho máximo do histórico bruto (usa Config.HISTORY_SIZE se None)
+            exclude: Caminhos não armazenados (usa Config.HISTORY_EXCLUDE se None)
+            tiers: Níveis de agregação (resolução, retenção) em segundos
+                (usa Config.HISTORY_TIERS se None)
         """
         self.max_size = max_size or Config.HISTORY_SIZE
-        self.history = deque(maxlen=self.max_size)
+        self.exclude = frozenset(Config.HISTORY_EXCLUDE if exclude is None else exclude)
+        self.tiers = Config.HISTORY_TIERS if tiers is None else tiers
+        self.history = _SeriesGroup(self.max_size, self.tiers)
+        self._sources = {}
+        # Índice caminho da métrica -> grupo que a armazena, montado na ingestão
+        self._index = {}
+        self.store = None
+        self._listeners = []
+        self._lock = threading.Lock()
+    
+    def add_listener(self, callback):
+        """Registra uma função chamada a cada novo ponto.
+        
+        A função é chamada fora do lock do histórico, na thread que
+        adicionou o ponto, e deve ser rápida (ela faz parte da ingestão).
+        
+        Args:
+            callback: Função (timestamp, lista de pares caminho -> valor
+                numérico)
+        """
+        self._listeners.append(callback)
+    
+    def register_source(self, name, interval):
+        """Registra uma fonte amostrada em intervalo próprio.
+        
+        Fontes amostradas com frequência maior que a coleta principal
+        (ex: PSI) têm histórico separado, dimensionado para cobrir a mesma
+        janela de tempo, para não expulsar os pontos do histórico principal.
+        
+        Args:
+            name: Nome da fonte (primeiro componente dos caminhos de métrica)
+            interval: Intervalo de amostragem da fonte em segundos
+        """
+        size = max(self.max_size, int(self.max_size * Config.COLLECTION_INTERVAL / interval))
+        with self._lock:
+            if name not in self._sources:
+                self._sources[name] = _SeriesGroup(size, self.tiers)
+    
+    def attach_store(self, store):
+        """Associa um armazenamento em disco e recarrega os dados recentes.
+        
+        Os pontos gravados dentro da janela do histórico bruto são
+        reinseridos nos buffers em memória (alimentando também os níveis
+        de agregação); a partir daí, cada novo ponto é gravado no store.
+        Os pontos anteriores, até a retenção do maior nível (limitada ao
+        que o store ainda guarda, ver HISTORY_RETENTION), reconstroem os
+        níveis de agregação em segundo plano (ver _rebuild_tiers), sem
+        atrasar o início do servidor. Fontes com histórico próprio devem
+        ser registradas antes.
+        
+        Args:
+            store: Instância de SegmentStore ou SqliteStore
+        """
+        since = time.time() - self.max_size * Config.COLLECTION_INTERVAL
+        points = store.read(start=since)
+        
+        with self._lock:
+            for timestamp, values in points:
+                for group, group_values in self._split_by_group(values):
+                    for path in group.append(timestamp, group_values):
+                        self._index[path] = group
+            self.store = store
+        
+        logging.info(f"{len(points)} pontos de histórico recarregados do disco")
+        
+        if self.tiers and points:
+            threading.Thread(
+                target=self._rebuild_tiers, args=(store, points[0][0]),
+                name="history-rollups", daemon=True
+            ).start()
     
-    def add_data_point(self, data):
+    def _split_by_group(self, values):
+        """Separa os valores de um ponto pelo grupo da sua fonte (com o lock obtido).
+        
+        Returns:
+            Lista de tuplas (grupo, lista de pares caminho -> valor)
+        """
+        by_group = {}
+        for path, value in values:
+            group = self._sources.get(path.split('.', 1)[0], self.history)
+            by_group.setdefault(id(group), (group, []))[1].append((path, value))
+        return list(by_group.values())
+    
+    def _rebuild_tiers(self, store, until):
+        """Reconstrói os níveis de agregação com os pontos anteriores a until.
+        
+        Os agregados são calculados em níveis novos, fora do lock, e
+        combinados no fim com os níveis em uso, que continuam recebendo
+        os pontos novos durante a reconstrução.
+        
+        Args:
+            store: Armazenamento de onde os pontos são lidos
+            until: Epoch do primeiro ponto já recarregado nos buffers
+        """
+        since = time.time() - max(retention for _, retention in self.tiers)
+        rebuilt = {}
+        count = 0
+        try:
+            for timestamp, values in store.iter_points(start=since, end=until):
+                if timestamp >= until:
+                    break
+                with self._lock:
+                    groups = self._split_by_group(values)
+                for group, group_values in groups:
+                    entry = rebuilt.get(id(group))
+                    if entry is None:
+                        entry = rebuilt[id(group)] = (group, [
+                            _RollupTier(tier.resolution, tier.capacity * tier.resolution)
+                            for tier in group.tiers
+                        ])
+                    numeric = dict(group_values)
+                    for tier in entry[1]:
+                        tier.add(timestamp, numeric)
+                count += 1
+        except Exception as e:
+            logging.error(f"Erro ao reconstruir os níveis de agregação: {e}")
+            return
+        
+        with self._lock:
+            for group, tiers in rebuilt.values():
+                group.tiers = [current.merged(older) for current, older in zip(group.tiers, tiers)]
+        
+        logging.info(f"Níveis de agregação reconstruídos com {count} pontos do disco")
+    
+    def add_data_point(self, data, source=None):
         """Adiciona um novo ponto de dados ao histórico.
         
         Args:
             data: Dicionário com dados a serem armazenados
+            source: Fonte registrada com register_source (None para o histórico principal)
         """
-        # Adiciona timestamp se não existir
-        if "timestamp" not in data:
-            from datetime import datetime
-            data["timestamp"] = datetime.now().isoformat()
+        timestamp = time.time()
         
-        # Adiciona ao histórico
-        self.history.append(data)
+        with self._lock:
+            if source is not None:
+                group = self._sources[source]
+            else:
+                group = self.history
+                # Fontes com histórico próprio não são duplicadas no principal
+                if self._sources:
+                    data = {key: value for key, value in data.items() if key not in self._sources}
+            
+            values = list(flatten_snapshot(data, self.exclude))
+            for path in group.append(timestamp, values):
+                self._index[path] = group
+            
+            numeric = [(path, value) for path, value in values if isinstance(value, (int, float))]
+            if self.store is not None:
+                self.store.append(timestamp, numeric)
+        
+        for callback in self._listeners:
+            try:
+                callback(timestamp, numeric)
+            except Exception as e:
+                logging.error(f"Erro ao processar ponto do histórico: {e}")
     
     def get_history(self):
-        """Retorna todo o histórico de dados.
+        """Retorna todo o histórico de dados em formato colunar.
         
         Returns:
-            Lista com todos os pontos de dados armazenados
+            Dicionário fonte ("main" para o histórico principal) ->
+            {"timestamps": [...], "metrics": {caminho: [...]}}, com None
+            onde a métrica não estava presente
         """
-        return list(self.history)
+        groups = {"main": self.history}
+        with self._lock:
+            groups.update(self._sources)
+            
+            result = {}
+            for name, group in groups.items():
+                slots = group.slots()
+                result[name] = {
+                    "timestamps": [group.timestamps[slot] for slot in slots],
+                    "metrics": {
+                        path: [None if math.isnan(column[slot]) else column[slot] for slot in slots]
+                        for path, column in group.columns.items()
+                    }
+                }
+            return result
     
-    def get_metric_history(self, metric_path):
+    def get_metric_history(self, metric_path, start=None, end=None, step=None, aggregation="avg", max_points=None):
         """Retorna histórico de uma métrica específica.
         
         Args:
-            metric_path: Caminho para a métrica (ex: "cpu.usage")
-            
+            metric_path: Caminho para a métrica (ex: "hardware.cpu.usage")
+            start: Epoch inicial (inclusivo) ou None para o início do histórico
+            end: Epoch final (inclusivo) ou None para o fim do histórico
+            step: Intervalo de agregação em segundos (None retorna os pontos brutos)
+            aggregation: Função de agregação por intervalo (avg, min, max ou last)
+            max_points: Número máximo de pontos retornados; séries numéricas
+                maiores são reduzidas com LTTB (ver downsample_lttb)
+        
+        A consulta é atendida pelo nível de agregação mais grosso que
+        satisfaça o step (ver _SeriesGroup.select_tier).
+        
         Returns:
-            Lista de dicionários com timestamp e valor da métrica
+            Lista de dicionários com timestamp (epoch) e valor da métrica
         """
-        result = []
-        for point in self.history:
-            value = self._get_nested_value(point, metric_path)
-            if value is not None:
-                result.append({
-                    "timestamp": point.get("timestamp"),
-                    "value": value
-                })
-        return result
-    
-    def _get_nested_value(self, data, path):
-        """Obtém valor aninhado a partir de um caminho.
+        with self._lock:
+            group = self._index.get(metric_path)
+            if group is None:
+                return []
+            
+            # Pontos brutos anteriores ao histórico em memória vêm do store,
+            # se ele oferecer consultas por métrica (ex: SQLite)
+            query = getattr(self.store, "query", None)
+            oldest = group.first_timestamp()
+            numeric = metric_path in group.columns
+            from_store = (
+                numeric and not step and query is not None
+                and start is not None and oldest is not None and start < oldest
+            )
+            
+            tier = group.select_tier(start, step) if numeric and not from_store else None
+            columns = None
+            if tier is not None:
+                rollups = tier.series(metric_path, start, end)
+            elif max_points and numeric and not step and not from_store:
+                # Pontos brutos reduzidos direto das colunas do buffer
+                columns = group.column_window(metric_path, start, end)
+            else:
+                points = group.series(metric_path, start, end)
         
-        Args:
-            data: Dicionário com dados
-            path: Caminho para o valor (ex: "hardware.cpu.usage")
+        if columns is not None:
+            points = downsample_lttb(columns[0], columns[1], max_points)
+        else:
+            if from_store:
+                limit = oldest if end is None else min(end, oldest)
+                points = [point for point in query(metric_path, start, limit) if point[0] < oldest] + points
             
+            if tier is not None:
+                points = aggregate_rollups(rollups, step, aggregation)
+            elif step:
+                points = aggregate_points(points, step, aggregation)
+            
+            if max_points and numeric:
+                points = downsample_lttb([point[0] for point in points], [point[1] for point in points], max_points)
+        
+        return [{"timestamp": timestamp, "value": value} for timestamp, value in points]
+    
+    def get_latest(self):
+        """Retorna o valor mais recente de cada métrica do histórico.
+        
         Returns:
-            Valor encontrado ou None se não existir
+            Dicionário caminho -> (timestamp, valor), ordenado pelo caminho
         """
-        parts = path.split('.')
-        current = data
+        with self._lock:
+            return {
+                path: self._index[path].latest(path)
+                for path in sorted(self._index)
+            }
+    
+    def iter_points(self, start=None, end=None):
+        """Gera os pontos do histórico sem copiá-lo inteiro.
         
-        for part in parts:
-            if isinstance(current, dict) and part in current:
-                current = current[part]
-            else:
-                return None
+        Com armazenamento persistente, os pontos vêm do store (após gravar
+        os pendentes); sem ele, dos buffers em memória, lidos em blocos
+        curtos para não segurar o lock durante o consumo.
         
-        return current
+        Args:
+            start: Epoch inicial (inclusivo) ou None
+            end: Epoch final (inclusivo) ou None
+        
+        Yields:
+            Tuplas (timestamp, lista de pares caminho -> valor) em ordem
+            cronológica
+        """
+        if self.store is not None:
+            self.store.flush()
+            yield from self.store.iter_points(start, end)
+            return
+        
+        with self._lock:
+            groups = [self.history] + list(self._sources.values())
+        yield from heapq.merge(
+            *(self._iter_group(group, start, end) for group in groups),
+            key=lambda point: point[0]
+        )
+    
+    def _iter_group(self, group, start, end, chunk_size=256):
+        """Gera os pontos numéricos de um grupo em memória, em blocos."""
+        cursor = start
+        while True:
+            with self._lock:
+                slots = group.slots(cursor, end)[:chunk_size]
+                points = [
+                    (group.timestamps[slot], [
+                        (path, column[slot])
+                        for path, column in group.columns.items()
+                        if not math.isnan(column[slot])
+                    ])
+                    for slot in slots
+                ]
+            if not points:
+                return
+            yield from points
+            cursor = math.nextafter(points[-1][0], math.inf)
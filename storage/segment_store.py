@@ -0,0 +1,413 @@
+"""
+Armazenamento persistente de métricas em disco para o Dashboard S10+.
+
+Este módulo implementa um armazenamento somente de acréscimo (append-only)
+dividido em segmentos por janela de tempo. Cada segmento é um arquivo
+binário autocontido com dois tipos de registro:
+
+    D  definição de métrica: id (uint16), tamanho (uint16), caminho UTF-8
+    P  ponto: timestamp (float64), quantidade (uint16) e pares
+       id (uint16) + valor (float64)
+
+Os registros são acumulados em memória e gravados em lote a cada
+Config.HISTORY_FLUSH_INTERVAL segundos, reduzindo o desgaste da memória
+flash. Segmentos são lidos via mmap e a retenção apaga segmentos inteiros.
+
+Quando a janela de um segmento termina, ele é compactado em segundo
+plano: os pontos de cada métrica são regravados em blocos comprimidos
+(ver storage.gorilla) de até Config.HISTORY_BLOCK_POINTS pontos, com
+um terceiro tipo de registro:
+
+    B  bloco: id (uint16), quantidade (uint16), primeiro e último
+       timestamp (float64), tamanho (uint32) e os bytes comprimidos
+
+Blocos só são decodificados quando o período consultado os alcança.
+"""
+
+import os
+import mmap
+import time
+import struct
+import logging
+import threading
+
+from config.settings import Config
+from storage.gorilla import encode_block, decode_block
+
+SEGMENT_MAGIC = b'TSG1'
+COMPACT_MAGIC = b'TSC1'
+SEGMENT_SUFFIX = '.seg'
+
+_DEFINE = struct.Struct('<cHH')
+_POINT = struct.Struct('<cdH')
+_VALUE = struct.Struct('<Hd')
+_BLOCK = struct.Struct('<cHHddI')
+
+def parse_segment(buffer, on_point=None, on_block=None):
+    """Interpreta o conteúdo de um segmento.
+    
+    Um registro final incompleto (ex: processo morto durante a escrita)
+    encerra a leitura sem erro.
+    
+    Args:
+        buffer: bytes ou mmap com o conteúdo do segmento
+        on_point: Função chamada com (timestamp, lista de pares caminho ->
+            valor) para cada ponto (None apenas valida)
+        on_block: Função chamada com (caminho, primeiro timestamp, último
+            timestamp, quantidade, load) para cada bloco comprimido; load()
+            retorna os bytes do bloco, lidos apenas se chamada
+    
+    Returns:
+        Tupla (dicionário caminho -> id, tamanho válido em bytes)
+    """
+    if buffer[:len(SEGMENT_MAGIC)] not in (SEGMENT_MAGIC, COMPACT_MAGIC):
+        return {}, 0
+    
+    paths = {}
+    offset = len(SEGMENT_MAGIC)
+    size = len(buffer)
+    while offset < size:
+        kind = buffer[offset:offset + 1]
+        if kind == b'D':
+            if offset + _DEFINE.size > size:
+                break
+            _, metric_id, length = _DEFINE.unpack_from(buffer, offset)
+            end = offset + _DEFINE.size + length
+            if end > size:
+                break
+            paths[metric_id] = bytes(buffer[offset + _DEFINE.size:end]).decode('utf-8')
+        elif kind == b'P':
+            if offset + _POINT.size > size:
+                break
+            _, timestamp, count = _POINT.unpack_from(buffer, offset)
+            end = offset + _POINT.size + count * _VALUE.size
+            if end > size:
+                break
+            if on_point is not None:
+                values = []
+                for position in range(offset + _POINT.size, end, _VALUE.size):
+                    metric_id, value = _VALUE.unpack_from(buffer, position)
+                    values.append((paths[metric_id], value))
+                on_point(timestamp, values)
+        elif kind == b'B':
+            if offset + _BLOCK.size > size:
+                break
+            _, metric_id, count, first_ts, last_ts, length = _BLOCK.unpack_from(buffer, offset)
+            begin = offset + _BLOCK.size
+            end = begin + length
+            if end > size:
+                break
+            if on_block is not None:
+                on_block(paths[metric_id], first_ts, last_ts, count,
+                         lambda begin=begin, end=end: buffer[begin:end])
+        else:
+            break
+        offset = end
+    
+    return {path: metric_id for metric_id, path in paths.items()}, offset
+
+def compact_segment(path, block_points=None):
+    """Regrava um segmento encerrado em blocos comprimidos por métrica.
+    
+    O novo conteúdo é gravado em um arquivo temporário e substitui o
+    original atomicamente.
+    
+    Args:
+        path: Caminho do segmento
+        block_points: Pontos por bloco (usa Config.HISTORY_BLOCK_POINTS se None)
+    
+    Returns:
+        Tupla (tamanho original, tamanho compactado) em bytes, ou None se
+        o segmento já estava compactado
+    """
+    block_points = block_points or Config.HISTORY_BLOCK_POINTS
+    with open(path, 'rb') as f:
+        content = f.read()
+    if content[:len(SEGMENT_MAGIC)] != SEGMENT_MAGIC:
+        return None
+    
+    series = {}
+    
+    def on_point(timestamp, values):
+        for metric_path, value in values:
+            series.setdefault(metric_path, []).append((timestamp, value))
+    
+    parse_segment(content, on_point)
+    
+    compacted = bytearray(COMPACT_MAGIC)
+    for metric_id, (metric_path, points) in enumerate(series.items()):
+        encoded = metric_path.encode('utf-8')
+        compacted += _DEFINE.pack(b'D', metric_id, len(encoded)) + encoded
+        for index in range(0, len(points), block_points):
+            block = points[index:index + block_points]
+            payload = encode_block(block)
+            compacted += _BLOCK.pack(b'B', metric_id, len(block), block[0][0], block[-1][0], len(payload))
+            compacted += payload
+    
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(compacted)
+    os.replace(temp_path, path)
+    return len(content), len(compacted)
+
+class SegmentStore:
+    """Armazenamento de pontos em segmentos binários por janela de tempo."""
+    
+    def __init__(self, directory=None, segment_seconds=None, retention=None, flush_interval=None):
+        """Inicializa o armazenamento.
+        
+        Args:
+            directory: Diretório dos segmentos (usa Config.HISTORY_DIR se None)
+            segment_seconds: Janela de cada segmento (usa Config.HISTORY_SEGMENT_SECONDS se None)
+            retention: Segundos mantidos em disco (usa Config.HISTORY_RETENTION se None)
+            flush_interval: Segundos entre gravações (usa Config.HISTORY_FLUSH_INTERVAL se None)
+        """
+        self.directory = directory or Config.HISTORY_DIR
+        self.segment_seconds = segment_seconds or Config.HISTORY_SEGMENT_SECONDS
+        self.retention = retention or Config.HISTORY_RETENTION
+        self.flush_interval = flush_interval if flush_interval is not None else Config.HISTORY_FLUSH_INTERVAL
+        
+        self._segment_start = None
+        self._ids = {}
+        self._pending = bytearray()
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        
+        os.makedirs(self.directory, exist_ok=True)
+        self.apply_retention()
+        # Segmentos encerrados sem compactação (ex: processo morto na virada)
+        self._start_compaction()
+    
+    def _segment_path(self, start):
+        """Retorna o caminho do segmento que começa em start."""
+        return os.path.join(self.directory, f"{int(start):010d}{SEGMENT_SUFFIX}")
+    
+    def segments(self):
+        """Lista os segmentos existentes.
+        
+        Returns:
+            Lista ordenada de tuplas (início em epoch, caminho)
+        """
+        segments = []
+        for entry in os.listdir(self.directory):
+            name, suffix = os.path.splitext(entry)
+            if suffix == SEGMENT_SUFFIX and name.isdigit():
+                segments.append((int(name), os.path.join(self.directory, entry)))
+        return sorted(segments)
+    
+    def apply_retention(self):
+        """Apaga os segmentos inteiramente fora do período de retenção."""
+        limit = time.time() - self.retention
+        for start, path in self.segments():
+            if start + self.segment_seconds <= limit:
+                try:
+                    os.remove(path)
+                    logging.info(f"Segmento de histórico removido: {path}")
+                except OSError as e:
+                    logging.warning(f"Erro ao remover segmento {path}: {e}")
+    
+    def _open_segment(self, start):
+        """Prepara a escrita no segmento que começa em start.
+        
+        Um segmento já existente (ex: reinício dentro da mesma janela) tem
+        o dicionário de métricas recarregado e um registro final incompleto
+        descartado antes de receber novos registros.
+        """
+        path = self._segment_path(start)
+        self._segment_start = start
+        self._ids = {}
+        
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            content = b''
+        
+        if content:
+            self._ids, valid = parse_segment(content)
+            if valid < len(content):
+                os.truncate(path, valid)
+            if valid:
+                return
+        
+        self._pending += SEGMENT_MAGIC
+    
+    def append(self, timestamp, values):
+        """Acrescenta um ponto (gravado em disco no próximo flush).
+        
+        Args:
+            timestamp: Epoch em segundos
+            values: Lista de pares caminho -> valor numérico
+        """
+        if not values:
+            return
+        
+        with self._lock:
+            start = timestamp - timestamp % self.segment_seconds
+            if self._segment_start is not None and start < self._segment_start:
+                # Ponto atrasado de outra fonte (o timestamp é obtido antes do
+                # lock do histórico): os segmentos só avançam, pois o anterior
+                # pode estar sendo compactado. O timestamp é limitado ao início
+                # do segmento atual para manter cada segmento na sua janela.
+                timestamp = start = self._segment_start
+            if start != self._segment_start:
+                # Grava o que pertence ao segmento anterior antes de trocar
+                self._write_pending()
+                previous = self._segment_start
+                self._open_segment(start)
+                self.apply_retention()
+                if previous is not None:
+                    self._start_compaction()
+            
+            record = bytearray(_POINT.pack(b'P', timestamp, len(values)))
+            for path, value in values:
+                metric_id = self._ids.get(path)
+                if metric_id is None:
+                    metric_id = self._ids[path] = len(self._ids)
+                    encoded = path.encode('utf-8')
+                    self._pending += _DEFINE.pack(b'D', metric_id, len(encoded)) + encoded
+                record += _VALUE.pack(metric_id, value)
+            self._pending += record
+            
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self._write_pending()
+    
+    def _start_compaction(self):
+        """Compacta em segundo plano os segmentos cuja janela terminou."""
+        threading.Thread(target=self._compact_closed_segments, name="history-compaction", daemon=True).start()
+    
+    def _compact_closed_segments(self):
+        """Compacta os segmentos encerrados ainda não compactados."""
+        with self._compact_lock:
+            now = time.time()
+            for start, path in self.segments():
+                if start + self.segment_seconds > now or start == self._segment_start:
+                    continue
+                try:
+                    sizes = compact_segment(path)
+                except (OSError, ValueError, KeyError) as e:
+                    logging.warning(f"Erro ao compactar segmento {path}: {e}")
+                    continue
+                if sizes:
+                    logging.info(f"Segmento {path} compactado: {sizes[0]} -> {sizes[1]} bytes")
+    
+    def flush(self):
+        """Grava os registros pendentes em disco."""
+        with self._lock:
+            self._write_pending()
+    
+    def _write_pending(self):
+        """Grava os registros pendentes no segmento atual (com o lock obtido)."""
+        self._last_flush = time.monotonic()
+        if not self._pending or self._segment_start is None:
+            return
+        
+        try:
+            with open(self._segment_path(self._segment_start), 'ab') as f:
+                f.write(self._pending)
+        except OSError as e:
+            logging.error(f"Erro ao gravar histórico em disco: {e}")
+        self._pending = bytearray()
+    
+    def _scan(self, start, end, on_point, on_block):
+        """Percorre via mmap os segmentos que alcançam o período pedido.
+        
+        É um gerador: após cada segmento lido, retorna o controle ao
+        chamador (que pode consumir o que os callbacks acumularam).
+        """
+        for segment_start, path in self.segments():
+            if start is not None and segment_start + self.segment_seconds <= start:
+                continue
+            if end is not None and segment_start > end:
+                break
+            
+            try:
+                with open(path, 'rb') as f:
+                    if os.fstat(f.fileno()).st_size == 0:
+                        continue
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                        parse_segment(buffer, on_point, on_block)
+            except FileNotFoundError:
+                # Removido pela retenção durante a leitura
+                continue
+            except (OSError, ValueError, KeyError) as e:
+                logging.warning(f"Segmento de histórico ilegível {path}: {e}")
+            yield segment_start
+    
+    def iter_points(self, start=None, end=None):
+        """Gera os pontos gravados em disco, um segmento por vez.
+        
+        A memória usada é limitada ao conteúdo de um segmento,
+        independentemente do período pedido.
+        
+        Args:
+            start: Epoch inicial (inclusivo) ou None para todos os segmentos
+            end: Epoch final (inclusivo) ou None
+        
+        Yields:
+            Tuplas (timestamp, lista de pares caminho -> valor) em ordem
+            cronológica
+        """
+        lower = start if start is not None else float('-inf')
+        upper = end if end is not None else float('inf')
+        points = {}
+        
+        def on_point(timestamp, values):
+            if lower <= timestamp <= upper:
+                points.setdefault(timestamp, []).extend(values)
+        
+        def on_block(path, first_ts, last_ts, count, load):
+            if last_ts < lower or first_ts > upper:
+                return
+            for timestamp, value in decode_block(load(), count):
+                if lower <= timestamp <= upper:
+                    points.setdefault(timestamp, []).append((path, value))
+        
+        for _ in self._scan(start, end, on_point, on_block):
+            yield from sorted(points.items())
+            points.clear()
+    
+    def read(self, start=None, end=None):
+        """Lê os pontos gravados em disco.
+        
+        Args:
+            start: Epoch inicial (inclusivo) ou None para todos os segmentos
+            end: Epoch final (inclusivo) ou None
+        
+        Returns:
+            Lista de tuplas (timestamp, lista de pares caminho -> valor) em
+            ordem cronológica
+        """
+        return list(self.iter_points(start, end))
+    
+    def query(self, path, start=None, end=None):
+        """Consulta a série de uma métrica.
+        
+        Nos segmentos compactados apenas os blocos da métrica que alcançam
+        o período são decodificados.
+        
+        Args:
+            path: Caminho da métrica
+            start: Epoch inicial (inclusivo) ou None
+            end: Epoch final (inclusivo) ou None
+        
+        Returns:
+            Lista de tuplas (timestamp, valor) em ordem cronológica
+        """
+        lower = start if start is not None else float('-inf')
+        upper = end if end is not None else float('inf')
+        points = []
+        
+        def on_point(timestamp, values):
+            if lower <= timestamp <= upper:
+                points.extend((timestamp, value) for metric_path, value in values if metric_path == path)
+        
+        def on_block(metric_path, first_ts, last_ts, count, load):
+            if metric_path != path or last_ts < lower or first_ts > upper:
+                return
+            points.extend(point for point in decode_block(load(), count) if lower <= point[0] <= upper)
+        
+        for _ in self._scan(start, end, on_point, on_block):
+            pass
+        return sorted(points)
@@ -0,0 +1,121 @@
+"""
+Sketch de quantis com erro relativo garantido (DDSketch).
+
+Implementação do sketch descrito em "DDSketch: A Fast and Fully-Mergeable
+Quantile Sketch with Relative-Error Guarantees" (Datadog, VLDB 2019):
+
+- cada valor cai em um intervalo logarítmico de razão gamma, de modo que
+  qualquer quantil é estimado com erro relativo de no máximo
+  relative_accuracy (ex: 1% -> p99 de 40,0°C reportado entre 39,6 e 40,4);
+- inserir custa um logaritmo e um incremento em dicionário;
+- dois sketches com o mesmo mapeamento se combinam somando as contagens
+  de cada intervalo, o que permite janelas deslizantes compostas por
+  sketches de períodos menores.
+"""
+
+import math
+
+class LogMapping:
+    """Mapeamento entre valores e índices de intervalos logarítmicos."""
+    
+    # Valores com módulo abaixo disto são contados como zero
+    MIN_INDEXABLE = 1e-9
+    
+    def __init__(self, relative_accuracy):
+        """Inicializa o mapeamento.
+        
+        Args:
+            relative_accuracy: Erro relativo máximo dos quantis (ex: 0.01)
+        """
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._multiplier = 1 / math.log(self.gamma)
+    
+    def key(self, value):
+        """Retorna o índice do intervalo de um valor positivo."""
+        return math.ceil(math.log(value) * self._multiplier)
+    
+    def value(self, key):
+        """Retorna o representante do intervalo (erro relativo mínimo)."""
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+class DDSketch:
+    """Distribuição aproximada de uma série de valores."""
+    
+    __slots__ = ("mapping", "positive", "negative", "zero_count", "count", "min", "max", "sum")
+    
+    def __init__(self, mapping):
+        """Inicializa um sketch vazio.
+        
+        Args:
+            mapping: Instância de LogMapping (compartilhada entre sketches
+                que serão combinados)
+        """
+        self.mapping = mapping
+        self.positive = {}
+        self.negative = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sum = 0.0
+    
+    def add(self, value):
+        """Acrescenta um valor."""
+        if value > LogMapping.MIN_INDEXABLE:
+            key = self.mapping.key(value)
+            self.positive[key] = self.positive.get(key, 0) + 1
+        elif value < -LogMapping.MIN_INDEXABLE:
+            key = self.mapping.key(-value)
+            self.negative[key] = self.negative.get(key, 0) + 1
+        else:
+            self.zero_count += 1
+        
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+    
+    def merge(self, other):
+        """Acrescenta as contagens de outro sketch com o mesmo mapeamento."""
+        for key, count in other.positive.items():
+            self.positive[key] = self.positive.get(key, 0) + count
+        for key, count in other.negative.items():
+            self.negative[key] = self.negative.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+    
+    def quantile(self, q):
+        """Estima um quantil.
+        
+        Args:
+            q: Quantil entre 0 e 1 (ex: 0.95)
+        
+        Returns:
+            Valor estimado, ou None se o sketch estiver vazio
+        """
+        if not self.count:
+            return None
+        
+        rank = q * (self.count - 1)
+        seen = 0
+        # Negativos do maior módulo para o menor, depois zero e positivos.
+        # O representante do intervalo é limitado a [mín, máx], que são
+        # exatos (ex: uma série constante retorna o próprio valor)
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return min(self.max, max(self.min, -self.mapping.value(key)))
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return min(self.max, max(self.min, self.mapping.value(key)))
+        return self.max
@@ -0,0 +1,201 @@
+"""
+Armazenamento de métricas em SQLite para o Dashboard S10+.
+
+Alternativa ao SegmentStore com a mesma interface (append, flush, read),
+usando o módulo sqlite3 da biblioteca padrão. O esquema é estreito:
+
+    metrics (id, path)               dicionário de caminhos de métrica
+    samples (metric_id, ts, value)   um valor por linha
+
+O banco opera em modo WAL e os pontos são inseridos em lote, em uma
+única transação por intervalo de gravação. O arquivo pode ser consultado
+diretamente com SQL, por exemplo:
+
+    SELECT datetime(ts, 'unixepoch', 'localtime'), value
+    FROM samples JOIN metrics ON metrics.id = samples.metric_id
+    WHERE path = 'hardware.memory.used' ORDER BY ts;
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+
+from config.settings import Config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metrics (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS samples (
+    metric_id INTEGER NOT NULL REFERENCES metrics(id),
+    ts REAL NOT NULL,
+    value REAL,
+    PRIMARY KEY (metric_id, ts)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS samples_ts ON samples (ts);
+"""
+
+class SqliteStore:
+    """Armazenamento de pontos em um banco SQLite."""
+    
+    def __init__(self, path=None, retention=None, flush_interval=None):
+        """Inicializa o armazenamento e cria o esquema se necessário.
+        
+        Args:
+            path: Arquivo do banco (usa Config.HISTORY_SQLITE_PATH se None)
+            retention: Segundos mantidos no banco (usa Config.HISTORY_RETENTION se None)
+            flush_interval: Segundos entre gravações (usa Config.HISTORY_FLUSH_INTERVAL se None)
+        """
+        self.path = path or Config.HISTORY_SQLITE_PATH
+        self.retention = retention or Config.HISTORY_RETENTION
+        self.flush_interval = flush_interval if flush_interval is not None else Config.HISTORY_FLUSH_INTERVAL
+        
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        # A conexão é compartilhada entre threads, serializada pelo lock
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        
+        self._ids = {path: metric_id for metric_id, path in self._conn.execute("SELECT id, path FROM metrics")}
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _metric_id(self, path):
+        """Retorna o id de uma métrica, criando-o se necessário (dentro da transação)."""
+        metric_id = self._ids.get(path)
+        if metric_id is None:
+            metric_id = self._conn.execute("INSERT INTO metrics (path) VALUES (?)", (path,)).lastrowid
+            self._ids[path] = metric_id
+        return metric_id
+    
+    def append(self, timestamp, values):
+        """Acrescenta um ponto (gravado no banco no próximo flush).
+        
+        Args:
+            timestamp: Epoch em segundos
+            values: Lista de pares caminho -> valor numérico
+        """
+        if not values:
+            return
+        
+        with self._lock:
+            self._pending.append((timestamp, values))
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self._write_pending()
+    
+    def flush(self):
+        """Grava os pontos pendentes no banco."""
+        with self._lock:
+            self._write_pending()
+    
+    def _write_pending(self):
+        """Insere os pontos pendentes em uma única transação (com o lock obtido)."""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        
+        pending, self._pending = self._pending, []
+        ids = dict(self._ids)
+        try:
+            with self._conn:
+                rows = [
+                    (self._metric_id(path), timestamp, value)
+                    for timestamp, values in pending
+                    for path, value in values
+                ]
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO samples (metric_id, ts, value) VALUES (?, ?, ?)",
+                    rows
+                )
+                self._conn.execute("DELETE FROM samples WHERE ts < ?", (time.time() - self.retention,))
+        except sqlite3.Error as e:
+            # A transação foi desfeita: ids criados nela não existem mais
+            self._ids = ids
+            logging.error(f"Erro ao gravar histórico no SQLite: {e}")
+    
+    def iter_points(self, start=None, end=None):
+        """Gera os pontos gravados no banco sem carregá-los todos na memória.
+        
+        Usa uma conexão própria de leitura (o modo WAL permite ler enquanto
+        a conexão principal grava), de modo que a iteração pode ser lenta
+        sem bloquear a ingestão.
+        
+        Args:
+            start: Epoch inicial (inclusivo) ou None
+            end: Epoch final (inclusivo) ou None
+        
+        Yields:
+            Tuplas (timestamp, lista de pares caminho -> valor) em ordem
+            cronológica
+        """
+        conn = sqlite3.connect(self.path)
+        try:
+            cursor = conn.execute(
+                "SELECT ts, path, value FROM samples JOIN metrics ON metrics.id = samples.metric_id "
+                "WHERE ts >= ? AND ts <= ? ORDER BY ts",
+                (start if start is not None else float('-inf'), end if end is not None else float('inf'))
+            )
+            timestamp = None
+            values = []
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                for ts, path, value in rows:
+                    if ts != timestamp:
+                        if values:
+                            yield timestamp, values
+                        timestamp = ts
+                        values = []
+                    values.append((path, value))
+            if values:
+                yield timestamp, values
+        finally:
+            conn.close()
+    
+    def read(self, start=None, end=None):
+        """Lê os pontos gravados no banco.
+        
+        Args:
+            start: Epoch inicial (inclusivo) ou None
+            end: Epoch final (inclusivo) ou None
+        
+        Returns:
+            Lista de tuplas (timestamp, lista de pares caminho -> valor) em
+            ordem cronológica
+        """
+        return list(self.iter_points(start, end))
+    
+    def query(self, path, start=None, end=None):
+        """Consulta a série de uma métrica pelo índice (metric_id, ts).
+        
+        Args:
+            path: Caminho da métrica
+            start: Epoch inicial (inclusivo) ou None
+            end: Epoch final (inclusivo) ou None
+        
+        Returns:
+            Lista de tuplas (timestamp, valor) em ordem cronológica
+        """
+        with self._lock:
+            metric_id = self._ids.get(path)
+            if metric_id is None:
+                return []
+            return self._conn.execute(
+                "SELECT ts, value FROM samples WHERE metric_id = ? AND ts >= ? AND ts <= ? ORDER BY ts",
+                (metric_id, start if start is not None else float('-inf'), end if end is not None else float('inf'))
+            ).fetchall()
+    
+    def close(self):
+        """Grava os pontos pendentes e fecha a conexão."""
+        with self._lock:
+            self._write_pending()
+            self._conn.close()
@@ -0,0 +1,186 @@
+"""
+Estatísticas contínuas por métrica e janela de tempo.
+
+Para cada métrica selecionada (Config.STATS_METRICS) e cada janela
+(Config.STATS_WINDOWS, ex: 5m, 1h e 24h), mantém na ingestão:
+
+- quantis aproximados (DDSketch), com a janela dividida em
+  Config.STATS_BUCKETS sketches de períodos menores: a cada consulta os
+  sketches ainda dentro da janela são combinados, e os que saem dela são
+  descartados inteiros;
+- contagem, média, mínimo e máximo (exatos por período);
+- média móvel exponencial (EWMA) com constante de tempo igual à janela.
+
+A janela efetiva cobre entre (STATS_BUCKETS - 1) e STATS_BUCKETS
+períodos, já que o período mais antigo sai por inteiro. Counters são
+convertidos em taxa por segundo antes de entrar nas estatísticas.
+"""
+
+import math
+import threading
+from collections import deque
+from fnmatch import fnmatchcase
+
+from config.settings import Config
+from collectors.schema import COUNTER
+from storage.sketch import LogMapping, DDSketch
+
+class _WindowStats:
+    """Estatísticas de uma métrica em uma janela deslizante."""
+    
+    def __init__(self, length, buckets, mapping):
+        """Inicializa a janela.
+        
+        Args:
+            length: Duração da janela em segundos
+            buckets: Número de períodos em que a janela é dividida
+            mapping: LogMapping compartilhado pelos sketches
+        """
+        self.length = length
+        self.buckets = buckets
+        self.period = length / buckets
+        self.mapping = mapping
+        self.sketches = deque()
+        self.ewma = None
+        self.last_timestamp = None
+    
+    def add(self, timestamp, value):
+        """Acrescenta um valor em O(1)."""
+        index = int(timestamp // self.period)
+        if not self.sketches or self.sketches[-1][0] != index:
+            self.sketches.append((index, DDSketch(self.mapping)))
+            self._expire(index)
+        self.sketches[-1][1].add(value)
+        
+        if self.ewma is None:
+            self.ewma = value
+        else:
+            elapsed = max(0.0, timestamp - self.last_timestamp)
+            self.ewma += (1 - math.exp(-elapsed / self.length)) * (value - self.ewma)
+        self.last_timestamp = timestamp
+    
+    def _expire(self, index):
+        """Descarta os períodos que saíram da janela."""
+        while self.sketches and self.sketches[0][0] <= index - self.buckets:
+            self.sketches.popleft()
+    
+    def summary(self, now, quantiles):
+        """Combina os períodos da janela e resume a distribuição.
+        
+        Args:
+            now: Epoch atual
+            quantiles: Quantis a estimar (ex: [0.5, 0.95, 0.99])
+        
+        Returns:
+            Dicionário com count, mean, min, max, ewma, os quantis (p50,
+            p95...) e o início efetivo da janela (from)
+        """
+        self._expire(int(now // self.period))
+        merged = DDSketch(self.mapping)
+        for _, sketch in self.sketches:
+            merged.merge(sketch)
+        
+        summary = {
+            "count": merged.count,
+            "mean": merged.sum / merged.count if merged.count else None,
+            "min": merged.min if merged.count else None,
+            "max": merged.max if merged.count else None,
+            "ewma": self.ewma if merged.count else None,
+            "from": self.sketches[0][0] * self.period if self.sketches else None
+        }
+        for q in quantiles:
+            summary[f"p{q * 100:g}"] = merged.quantile(q)
+        return summary
+
+class MetricStats:
+    """Estatísticas por métrica e janela, alimentadas pelo histórico."""
+    
+    def __init__(self, schema=None, patterns=None, windows=None, buckets=None, accuracy=None):
+        """Inicializa as estatísticas.
+        
+        Args:
+            schema: Instância de MetricSchema (counters viram taxas) ou None
+            patterns: Caminhos ou padrões fnmatch das métricas acompanhadas
+                (usa Config.STATS_METRICS se None)
+            windows: Dicionário nome -> duração em segundos (usa
+                Config.STATS_WINDOWS se None)
+            buckets: Períodos por janela (usa Config.STATS_BUCKETS se None)
+            accuracy: Erro relativo dos quantis (usa Config.STATS_ACCURACY se None)
+        """
+        self.schema = schema
+        self.patterns = Config.STATS_METRICS if patterns is None else patterns
+        self.windows = Config.STATS_WINDOWS if windows is None else windows
+        self.buckets = buckets or Config.STATS_BUCKETS
+        self.mapping = LogMapping(accuracy or Config.STATS_ACCURACY)
+        
+        # Caminho -> lista de _WindowStats, ou None se não acompanhado
+        self._metrics = {}
+        # Último (timestamp, valor) de cada counter, para calcular a taxa
+        self._last_counters = {}
+        self._lock = threading.Lock()
+    
+    def _track(self, path):
+        """Decide uma única vez se um caminho é acompanhado."""
+        if any(fnmatchcase(path, pattern) for pattern in self.patterns):
+            return [_WindowStats(length, self.buckets, self.mapping) for length in self.windows.values()]
+        return None
+    
+    def add(self, timestamp, values):
+        """Acrescenta um ponto (ouvinte de MetricsHistory.add_listener).
+        
+        Args:
+            timestamp: Epoch em segundos
+            values: Lista de pares caminho -> valor numérico
+        """
+        with self._lock:
+            for path, value in values:
+                windows = self._metrics.get(path, False)
+                if windows is False:
+                    windows = self._metrics[path] = self._track(path)
+                if windows is None:
+                    continue
+                
+                spec = self.schema.lookup(path) if self.schema else None
+                if spec and spec[0] == COUNTER:
+                    previous = self._last_counters.get(path)
+                    self._last_counters[path] = (timestamp, value)
+                    if previous is None or timestamp <= previous[0] or value < previous[1]:
+                        # Primeira leitura ou contador reiniciado
+                        continue
+                    value = (value - previous[1]) / (timestamp - previous[0])
+                
+                for window in windows:
+                    window.add(timestamp, value)
+    
+    def tracked(self):
+        """Retorna os caminhos acompanhados já vistos na ingestão."""
+        with self._lock:
+            return sorted(path for path, windows in self._metrics.items() if windows)
+    
+    def summary(self, path, now, window=None, quantiles=None):
+        """Resume as estatísticas de uma métrica.
+        
+        Args:
+            path: Caminho da métrica
+            now: Epoch atual
+            window: Nome da janela (todas se None)
+            quantiles: Quantis a estimar (usa Config.STATS_QUANTILES se None)
+        
+        Returns:
+            Dicionário janela -> resumo (ver _WindowStats.summary), ou None
+            se a métrica não for acompanhada
+        
+        Raises:
+            KeyError: Se a janela não existir
+        """
+        quantiles = quantiles or Config.STATS_QUANTILES
+        if window is not None and window not in self.windows:
+            raise KeyError(window)
+        names = [window] if window is not None else list(self.windows)
+        
+        with self._lock:
+            windows = self._metrics.get(path)
+            if not windows:
+                return None
+            by_name = dict(zip(self.windows, windows))
+            return {name: by_name[name].summary(now, quantiles) for name in names}
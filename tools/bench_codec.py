@@ -0,0 +1,97 @@
+"""
+Medição da compressão das séries do histórico (storage.gorilla).
+
+Usa séries reais: as gravadas nos segmentos do histórico (HISTORY_DIR)
+ou, se não houver, uma captura feita na hora com os coletores do
+dashboard. Mostra bytes por ponto e vazão de codificação/decodificação.
+
+Uso:
+    python tools/bench_codec.py [--dir DIRETÓRIO]
+    python tools/bench_codec.py --capture N [--interval S]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Config
+from storage.gorilla import encode_block, decode_block
+from storage.segment_store import SegmentStore, _VALUE, _POINT
+from storage.metrics_history import flatten_snapshot
+
+def series_from_segments(directory):
+    """Agrupa por métrica os pontos gravados nos segmentos."""
+    series = {}
+    for timestamp, values in SegmentStore(directory).read():
+        for path, value in values:
+            series.setdefault(path, []).append((timestamp, value))
+    return series
+
+def capture_series(samples, interval):
+    """Coleta snapshots com os coletores do dashboard e agrupa por métrica."""
+    from api.routes import collector_pool
+    
+    series = {}
+    for index in range(samples):
+        started = time.monotonic()
+        timestamp = time.time()
+        snapshot = collector_pool.collect_all()
+        for path, value in flatten_snapshot(snapshot, Config.HISTORY_EXCLUDE):
+            if isinstance(value, (int, float)):
+                series.setdefault(path, []).append((timestamp, float(value)))
+        print(f"\rCapturando {index + 1}/{samples}", end='', file=sys.stderr)
+        time.sleep(max(0, interval - (time.monotonic() - started)))
+    print(file=sys.stderr)
+    collector_pool.shutdown()
+    return series
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(description='Medição do codec de séries do histórico')
+    parser.add_argument('--dir', default=Config.HISTORY_DIR, help='Diretório dos segmentos')
+    parser.add_argument('--capture', type=int, help='Captura N snapshots em vez de ler os segmentos')
+    parser.add_argument('--interval', type=float, default=Config.COLLECTION_INTERVAL, help='Intervalo da captura')
+    parser.add_argument('--block', type=int, default=Config.HISTORY_BLOCK_POINTS, help='Pontos por bloco')
+    args = parser.parse_args()
+    
+    series = {}
+    if not args.capture and os.path.isdir(args.dir):
+        series = series_from_segments(args.dir)
+    if not series:
+        series = capture_series(args.capture or 120, args.interval)
+    
+    blocks = []
+    for points in series.values():
+        for index in range(0, len(points), args.block):
+            blocks.append(points[index:index + args.block])
+    total_points = sum(len(block) for block in blocks)
+    if not total_points:
+        print("Nenhum ponto disponível")
+        return
+    
+    start = time.perf_counter()
+    encoded = [encode_block(block) for block in blocks]
+    encode_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for payload, block in zip(encoded, blocks):
+        decode_block(payload, len(block))
+    decode_time = time.perf_counter() - start
+    
+    compressed = sum(len(payload) for payload in encoded)
+    # Registro P: cabeçalho por snapshot dividido entre as métricas gravadas
+    raw = _VALUE.size + _POINT.size / max(1, len(series))
+    
+    print(f"Métricas: {len(series)}  pontos: {total_points}  blocos de até {args.block} pontos")
+    print(f"Bruto (timestamp + valor float64): {16:.2f} bytes/ponto")
+    print(f"Registro P do segmento ativo:      {raw:.2f} bytes/ponto")
+    print(f"Comprimido (Gorilla):              {compressed / total_points:.2f} bytes/ponto "
+          f"({16 * total_points / compressed:.1f}x)")
+    print(f"Codificação:   {total_points / encode_time:,.0f} pontos/s")
+    print(f"Decodificação: {total_points / decode_time:,.0f} pontos/s")
+
+if __name__ == "__main__":
+    main()
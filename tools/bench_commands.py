@@ -0,0 +1,118 @@
+"""
+Benchmark dos backends de execução de comandos.
+
+Compara subprocess.run (fork+exec do processo Python a cada comando)
+com o coprocesso sh persistente (Config.COMMAND_BACKEND = "shell")
+usando os comandos que os coletores realmente executam.
+
+Uso:
+    python tools/bench_commands.py [--iterations N]
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Config
+from core.utils import run_command, ShellCoprocess
+
+from collectors.system_collector import SystemCollector
+from collectors.hardware_collector import HardwareCollector
+from collectors.network_collector import NetworkCollector
+from collectors.storage_collector import StorageCollector
+from collectors.process_collector import ProcessCollector
+from collectors.android_collector import AndroidCollector
+from collectors.pressure_collector import PressureCollector
+
+COLLECTOR_CLASSES = [
+    SystemCollector,
+    HardwareCollector,
+    NetworkCollector,
+    StorageCollector,
+    ProcessCollector,
+    AndroidCollector,
+    PressureCollector
+]
+
+def collector_commands():
+    """Retorna os comandos declarados pelos coletores, sem repetições.
+    
+    Returns:
+        Lista de comandos (listas de argumentos) na ordem de declaração
+    """
+    commands = []
+    for collector_class in COLLECTOR_CLASSES:
+        for command in collector_class.commands:
+            if command not in commands:
+                commands.append(command)
+    return commands
+
+def measure(func, command, iterations):
+    """Mede o tempo de execução de um comando.
+    
+    Args:
+        func: Função que executa o comando
+        command: Comando a ser executado
+        iterations: Número de repetições
+    
+    Returns:
+        Lista com a duração de cada execução em milissegundos
+    """
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        try:
+            func(command)
+        except Exception:
+            pass
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+def summarize(durations):
+    """Retorna média e p95 de uma lista de durações."""
+    ordered = sorted(durations)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return statistics.mean(ordered), p95
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(description='Benchmark dos backends de comandos')
+    parser.add_argument('--iterations', type=int, default=20, help='Repetições por comando')
+    args = parser.parse_args()
+    
+    Config.COMMAND_BACKEND = "subprocess"
+    coprocess = ShellCoprocess(Config.SHELL_PATH)
+    
+    declared = collector_commands()
+    commands = [command for command in declared if shutil.which(command[0])]
+    skipped = sorted({command[0] for command in declared if not shutil.which(command[0])})
+    
+    print(f"{'comando':<36} {'subprocess ms (méd/p95)':>24} {'shell ms (méd/p95)':>20} {'ganho':>7}")
+    total_subprocess = total_shell = 0.0
+    
+    for command in commands:
+        # Aquece caches de disco e o próprio shell antes de medir
+        measure(run_command, command, 1)
+        measure(coprocess.run, command, 1)
+        
+        sub_mean, sub_p95 = summarize(measure(run_command, command, args.iterations))
+        sh_mean, sh_p95 = summarize(measure(coprocess.run, command, args.iterations))
+        total_subprocess += sub_mean
+        total_shell += sh_mean
+        
+        label = ' '.join(command)[:36]
+        print(f"{label:<36} {sub_mean:>11.2f} / {sub_p95:>8.2f} {sh_mean:>9.2f} / {sh_p95:>8.2f} {sub_mean / sh_mean:>6.2f}x")
+    
+    print(f"{'ciclo completo':<36} {total_subprocess:>22.2f} {total_shell:>20.2f} {total_subprocess / total_shell:>6.2f}x")
+    if skipped:
+        print(f"Comandos ausentes ignorados: {', '.join(skipped)}")
+    
+    coprocess.close()
+
+if __name__ == "__main__":
+    main()
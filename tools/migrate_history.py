@@ -0,0 +1,89 @@
+"""
+Migração do histórico de métricas para o banco SQLite.
+
+Copia para o SqliteStore os pontos de uma das origens:
+
+- o histórico em memória de um dashboard em execução (/api/history),
+  sem precisar pará-lo;
+- os segmentos binários gravados pelo SegmentStore (HISTORY_DIR).
+
+Depois da migração, defina Config.HISTORY_BACKEND = "sqlite" e reinicie
+o dashboard.
+
+Uso:
+    python tools/migrate_history.py --from-url http://localhost:8080
+    python tools/migrate_history.py --from-segments [DIRETÓRIO] [--db ARQUIVO]
+"""
+
+import os
+import sys
+import json
+import argparse
+from urllib.request import urlopen
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Config
+from storage.segment_store import SegmentStore
+from storage.sqlite_store import SqliteStore
+
+def points_from_url(url):
+    """Lê o histórico em memória de um dashboard em execução.
+    
+    Args:
+        url: Endereço base do dashboard (ex: http://localhost:8080)
+    
+    Returns:
+        Lista de tuplas (timestamp, lista de pares caminho -> valor)
+    """
+    with urlopen(url.rstrip('/') + '/api/history') as response:
+        history = json.load(response)
+    
+    points = []
+    for source in history.values():
+        for position, timestamp in enumerate(source["timestamps"]):
+            values = [
+                (path, series[position])
+                for path, series in source["metrics"].items()
+                if series[position] is not None
+            ]
+            if values:
+                points.append((timestamp, values))
+    
+    return sorted(points, key=lambda point: point[0])
+
+def points_from_segments(directory):
+    """Lê todos os pontos dos segmentos em disco.
+    
+    Args:
+        directory: Diretório dos segmentos
+    
+    Returns:
+        Lista de tuplas (timestamp, lista de pares caminho -> valor)
+    """
+    return SegmentStore(directory).read()
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(description='Migra o histórico de métricas para SQLite')
+    origin = parser.add_mutually_exclusive_group(required=True)
+    origin.add_argument('--from-url', help='Endereço de um dashboard em execução')
+    origin.add_argument('--from-segments', nargs='?', const=Config.HISTORY_DIR, help='Diretório dos segmentos')
+    parser.add_argument('--db', default=Config.HISTORY_SQLITE_PATH, help='Arquivo do banco SQLite')
+    args = parser.parse_args()
+    
+    if args.from_url:
+        points = points_from_url(args.from_url)
+    else:
+        points = points_from_segments(args.from_segments)
+    
+    # flush_interval alto: todos os pontos entram em uma única transação
+    store = SqliteStore(args.db, flush_interval=float('inf'))
+    for timestamp, values in points:
+        store.append(timestamp, values)
+    store.close()
+    
+    print(f"{len(points)} pontos migrados para {args.db}")
+
+if __name__ == "__main__":
+    main()
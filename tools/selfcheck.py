@@ -0,0 +1,277 @@
+"""
+Verificações de ida e volta dos formatos e estimadores do histórico.
+
+Codifica e decodifica dados conhecidos e compara o resultado com a
+entrada, para que uma alteração no formato binário não corrompa o
+histórico gravado sem ser percebida:
+
+- storage.gorilla: limites das faixas de delta-of-delta, janelas de
+  64 bits significativos, ponto único, NaN, -0.0, valores extremos,
+  intervalos longos e timestamps fora de ordem;
+- storage.segment_store: gravação, compactação em blocos e leitura de
+  segmentos, registro final incompleto e pontos atrasados;
+- storage.sketch: quantis do DDSketch dentro do erro relativo, com
+  valores negativos, zero e sketches combinados;
+- core.forecast: regressão das previsões em séries exatas, ruidosas,
+  constantes, com picos isolados e com mudanças de nível.
+
+Termina com código 1 se alguma verificação falhar.
+
+Uso:
+    python tools/selfcheck.py
+"""
+
+import os
+import sys
+import math
+import time
+import random
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage.gorilla import encode_block, decode_block, _float_bits
+from storage.segment_store import SegmentStore, parse_segment, compact_segment
+from storage.sketch import LogMapping, DDSketch
+from config.settings import Config
+from core.forecast import _Trend
+
+failures = []
+
+def check(condition, description):
+    """Registra e exibe o resultado de uma verificação."""
+    print(f"{'ok    ' if condition else 'FALHOU'} {description}")
+    if not condition:
+        failures.append(description)
+
+def same_points(decoded, expected):
+    """Compara pontos com timestamps em ms e valores bit a bit (NaN == NaN)."""
+    return len(decoded) == len(expected) and all(
+        round(ts * 1000) == round(expected_ts * 1000) and _float_bits(value) == _float_bits(expected_value)
+        for (ts, value), (expected_ts, expected_value) in zip(decoded, expected)
+    )
+
+def roundtrip(points):
+    """Codifica e decodifica um bloco."""
+    return decode_block(encode_block(points), len(points))
+
+def check_gorilla():
+    """Verifica o codec de blocos comprimidos."""
+    base = 1700000000.0
+    
+    check(roundtrip([]) == [], "gorilla: bloco vazio")
+    check(same_points(roundtrip([(base, 42.5)]), [(base, 42.5)]), "gorilla: ponto único")
+    
+    regular = [(base + i * 5, 20.0 + (i % 7) * 0.25) for i in range(500)]
+    check(same_points(roundtrip(regular), regular), "gorilla: intervalo regular")
+    
+    special = [0.0, -0.0, math.nan, math.inf, -math.inf, 1e300, -1e300, 5e-324, 1.0, -math.nan, 1.0, 1.0]
+    points = [(base + i, value) for i, value in enumerate(special)]
+    check(same_points(roundtrip(points), points), "gorilla: NaN, -0.0, infinitos, 1e300 e subnormais")
+    
+    # XOR com 64 bits significativos (gravado como 0 no campo de 6 bits)
+    # e com zeros à esquerda acima do limite de 31
+    points = [(base, 0.0), (base + 1, -5e-324), (base + 2, 1.0), (base + 3, math.nextafter(1.0, math.inf))]
+    check(same_points(roundtrip(points), points), "gorilla: janelas de 64 bits e de zeros à esquerda")
+    
+    # delta-of-delta (ms) nos limites de cada faixa e no caso de 64 bits
+    dods = []
+    for value_bits in (7, 9, 12):
+        limit = 1 << (value_bits - 1)
+        dods += [limit, -limit + 1, limit + 1, -limit]
+    dods += [1 << 40, -(1 << 40)]
+    timestamps = [base, base + 1]
+    delta = 1000
+    for dod in dods:
+        delta += dod
+        timestamps.append(timestamps[-1] + delta / 1000)
+    points = [(ts, float(i)) for i, ts in enumerate(timestamps)]
+    check(same_points(roundtrip(points), points), "gorilla: limites das faixas de delta-of-delta")
+    
+    points = [(base, 1.0), (base + 86400 * 365, 2.0), (base + 1, 3.0), (base - 10, 4.0)]
+    check(same_points(roundtrip(points), points), "gorilla: intervalos longos e timestamps fora de ordem")
+    
+    points = [(base + 0.0004, 1.0), (base + 1.2346, 2.0)]
+    decoded = roundtrip(points)
+    check([ts for ts, _ in decoded] == [round(ts * 1000) / 1000 for ts, _ in points],
+          "gorilla: timestamps arredondados para ms")
+    
+    payload = encode_block(regular)
+    try:
+        decode_block(payload[:len(payload) // 2], len(regular))
+        truncated = False
+    except ValueError:
+        truncated = True
+    check(truncated, "gorilla: bloco truncado gera ValueError")
+
+def check_segments():
+    """Verifica gravação, compactação e leitura de segmentos."""
+    with tempfile.TemporaryDirectory() as directory:
+        # Janelas no futuro: a compactação em segundo plano só alcança
+        # segmentos encerrados, então estes ficam sob controle da verificação
+        segment_seconds = 600
+        first = (int(time.time()) // segment_seconds + 1000) * segment_seconds
+        store = SegmentStore(directory, segment_seconds=segment_seconds, retention=10 ** 9, flush_interval=0)
+        
+        written = []
+        for i in range(250):
+            timestamp = first + i * 3 + 0.25
+            values = [("cpu.usage", 10.0 + i % 13), ("bateria/%", float(i))]
+            if i % 4 == 0:
+                values.append(("nan.metric", math.nan))
+            store.append(timestamp, values)
+            written.append((timestamp, values))
+        store.flush()
+        
+        segments = store.segments()
+        check(len(segments) == 2, "segmentos: pontos divididos por janela")
+        read = store.read()
+        check(len(read) == len(written) and all(
+            ts == expected_ts and [(name, _float_bits(value)) for name, value in values]
+            == [(name, _float_bits(value)) for name, value in expected_values]
+            for (ts, values), (expected_ts, expected_values) in zip(read, written)
+        ), "segmentos: leitura dos registros gravados")
+        
+        first_path = segments[0][1]
+        with open(first_path, 'rb') as f:
+            content = f.read()
+        ids, valid = parse_segment(content + b'P\x00')
+        check(valid == len(content) and set(ids) == {"cpu.usage", "bateria/%", "nan.metric"},
+              "segmentos: registro final incompleto ignorado")
+        
+        sizes = compact_segment(first_path, block_points=7)
+        check(sizes is not None and sizes[1] < sizes[0], "segmentos: compactação reduz o arquivo")
+        check(compact_segment(first_path) is None, "segmentos: compactação não se repete")
+        
+        blocks = {}
+        
+        def on_block(path, first_ts, last_ts, count, load):
+            points = decode_block(load(), count)
+            ok = len(points) == count and points[0][0] == round(first_ts * 1000) / 1000
+            blocks.setdefault(path, []).append((ok, points))
+        
+        with open(first_path, 'rb') as f:
+            parse_segment(f.read(), on_block=on_block)
+        check(all(ok for chunks in blocks.values() for ok, _ in chunks),
+              "segmentos: cabeçalhos dos blocos coerentes com o conteúdo")
+        
+        end = segments[1][0]
+        for path in ("cpu.usage", "bateria/%", "nan.metric"):
+            expected = [(ts, value) for ts, values in written if ts < end for name, value in values if name == path]
+            decoded = [point for _, points in blocks.get(path, []) for point in points]
+            check(same_points(decoded, expected) and same_points(store.query(path, end=end - 1), expected),
+                  f"segmentos: ida e volta da compactação ({path})")
+        
+        # Ponto atrasado: não reabre o segmento encerrado
+        size_before = os.path.getsize(first_path)
+        store.append(first + 1, [("cpu.usage", 99.0)])
+        store.flush()
+        check(os.path.getsize(first_path) == size_before and len(store.segments()) == 2,
+              "segmentos: ponto atrasado não reabre segmento encerrado")
+        check(store.query("cpu.usage", start=end, end=end) == [(end, 99.0)],
+              "segmentos: ponto atrasado gravado no início do segmento atual")
+
+def check_sketch():
+    """Verifica os quantis do DDSketch contra os valores exatos."""
+    accuracy = 0.01
+    mapping = LogMapping(accuracy)
+    rng = random.Random(42)
+    quantiles = (0.0, 0.01, 0.5, 0.95, 0.99, 1.0)
+    
+    check(DDSketch(mapping).quantile(0.5) is None, "sketch: vazio retorna None")
+    
+    constant = DDSketch(mapping)
+    for _ in range(100):
+        constant.add(36.6)
+    check(all(constant.quantile(q) == 36.6 for q in quantiles), "sketch: série constante retorna o próprio valor")
+    
+    datasets = {
+        "lognormal": [rng.lognormvariate(3, 1.5) for _ in range(5000)],
+        "negativos, zero e positivos": [rng.choice((-1, 1)) * rng.uniform(0.01, 1000) for _ in range(3000)] + [0.0] * 200,
+        "valor constante": [36.6] * 100,
+        "valor único": [-12.5]
+    }
+    for name, values in datasets.items():
+        sketch = DDSketch(mapping)
+        for value in values:
+            sketch.add(value)
+        ordered = sorted(values)
+        within = True
+        for q in quantiles:
+            exact = ordered[int(q * (len(ordered) - 1))]
+            estimate = sketch.quantile(q)
+            within = within and ordered[0] <= estimate <= ordered[-1]
+            within = within and abs(estimate - exact) <= accuracy * abs(exact) + 1e-12
+        check(within, f"sketch: quantis dentro de {accuracy:.0%} e entre mín e máx ({name})")
+    
+    values = datasets["negativos, zero e positivos"]
+    whole = DDSketch(mapping)
+    merged = DDSketch(mapping)
+    for start in range(0, len(values), 500):
+        part = DDSketch(mapping)
+        for value in values[start:start + 500]:
+            whole.add(value)
+            part.add(value)
+        merged.merge(part)
+    check(all(merged.quantile(q) == whole.quantile(q) for q in quantiles) and merged.count == whole.count,
+          "sketch: combinação equivale a um único sketch")
+
+def trend(window, points):
+    """Cria uma regressão de previsão com os pontos informados."""
+    result = _Trend(window)
+    for timestamp, value in points:
+        result.add(timestamp, value)
+    return result
+
+def check_trend():
+    """Verifica a regressão usada pelas previsões."""
+    few = trend(1800, [(i * 5, 50.0 - i) for i in range(Config.FORECAST_MIN_POINTS - 1)])
+    check(few.fit() is None and few.forecast(100, 0) is None, "previsão: sem ajuste antes do mínimo de amostras")
+    
+    exact = trend(3600, [(1000 + i * 10, 50 + 0.1 * i) for i in range(100)])
+    forecast = exact.forecast(100, 0)
+    check(math.isclose(forecast["rate"], 0.01, rel_tol=1e-9)
+          and math.isclose(forecast["eta_seconds"], (100 - 59.9) / 0.01, rel_tol=1e-9),
+          "previsão: reta exata recuperada")
+    
+    duplicated = trend(3600, [(1000 + i * 10, 50 + 0.1 * i) for i in range(100)] + [(1990, 0.0), (500, 0.0)])
+    check(duplicated.fit() == exact.fit(), "previsão: timestamps repetidos ou antigos ignorados")
+    
+    rng = random.Random(7)
+    noisy = trend(6 * 3600, [(i * 30, 1000 + 0.5 * i * 30 + rng.gauss(0, 20)) for i in range(500)])
+    forecast = noisy.forecast(20000, None)
+    true_eta = (20000 - (1000 + 0.5 * 499 * 30)) / 0.5
+    check(forecast["eta_low_seconds"] <= true_eta <= forecast["eta_high_seconds"],
+          "previsão: intervalo de ~95% contém o ETA real")
+    
+    flat = trend(1800, [(i * 5, 100.0) for i in range(300)])
+    check(flat.forecast(100, 0) == {"rate": 0.0}, "previsão: série constante sem tendência nem ETA")
+    
+    line = [(i * 5, 80 - 0.05 * i) for i in range(60)]
+    clean = trend(1800, line)
+    spiked = trend(1800, [(ts, 5.0 if i == 40 else value) for i, (ts, value) in enumerate(line)])
+    check(math.isclose(spiked.fit()[1], clean.fit()[1], rel_tol=0.05), "previsão: pico isolado limitado")
+    
+    step = trend(1800, [(i * 5, 80.0) for i in range(200)] + [(i * 5, 70.0) for i in range(200, 260)])
+    intercept, slope, _, _ = step.fit()
+    check(abs(intercept + slope * 259 * 5 - 70) < 3, "previsão: mudança de nível persistente acompanhada")
+    
+    discharge = [(i * 5, 100.0) for i in range(300)] + [(i * 5, 100.0 - (i - 299) // 12) for i in range(300, 400)]
+    forecast = trend(1800, discharge).forecast(100, 0)
+    check(forecast["rate"] < 0 and forecast.get("eta_seconds", 0) > 0,
+          "previsão: descarga após série constante reconhecida")
+
+def main():
+    """Função principal."""
+    check_gorilla()
+    check_segments()
+    check_sketch()
+    check_trend()
+    
+    if failures:
+        print(f"\n{len(failures)} verificação(ões) falharam")
+        sys.exit(1)
+    print("\nTodas as verificações passaram")
+
+if __name__ == "__main__":
+    main()
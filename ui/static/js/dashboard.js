@@ -103,6 +103,55 @@ class Dashboard {
         }
     }
     
+    /**
+     * Formata bytes para unidades legíveis (KB, MB, GB)
+     * @param {number} bytes - Valor em bytes
+     * @param {number} precision - Número de casas decimais
+     * @returns {string} Valor formatado ou 'N/A'
+     */
+    formatBytes(bytes, precision = 2) {
+        if (bytes === null || bytes === undefined || isNaN(bytes)) return 'N/A';
+        
+        const units = ['B', 'KB', 'MB', 'GB', 'TB', 'PB'];
+        let value = Math.max(0, Number(bytes));
+        let unitIndex = 0;
+        
+        while (value >= 1024 && unitIndex < units.length - 1) {
+            value /= 1024;
+            unitIndex++;
+        }
+        
+        return `${value.toFixed(precision)} ${units[unitIndex]}`;
+    }
+    
+    /**
+     * Formata uma duração em segundos (ex: "2 dias, 3 horas, 15 minutos")
+     * @param {number} seconds - Duração em segundos
+     * @returns {string} Duração formatada ou 'N/A'
+     */
+    formatDuration(seconds) {
+        if (seconds === null || seconds === undefined || isNaN(seconds)) return 'N/A';
+        
+        const days = Math.floor(seconds / 86400);
+        const hours = Math.floor((seconds % 86400) / 3600);
+        const minutes = Math.floor((seconds % 3600) / 60);
+        
+        const parts = [];
+        if (days) parts.push(`${days} dia${days !== 1 ? 's' : ''}`);
+        if (hours) parts.push(`${hours} hora${hours !== 1 ? 's' : ''}`);
+        parts.push(`${minutes} minuto${minutes !== 1 ? 's' : ''}`);
+        return parts.join(', ');
+    }
+    
+    /**
+     * Formata um percentual numérico
+     * @param {number} percent - Valor percentual
+     * @returns {string} Percentual com uma casa decimal
+     */
+    formatPercent(percent) {
+        return `${(Number(percent) || 0).toFixed(1)}%`;
+    }
+    
     /**
      * Atualiza a interface com os novos dados
      * @param {Object} data - Dados recebidos da API
@@ -162,7 +211,7 @@ class Dashboard {
                 <div class="metric">
                     <h3>💾 Memória</h3>
                     <div class="value">${memory.percent ? memory.percent.toFixed(1) + '%' : 'N/A'}</div>
-                    <small>${memory.used || '0'} de ${memory.total || '0'}</small>
+                    <small>${this.formatBytes(memory.used)} de ${this.formatBytes(memory.total)}</small>
                     <div class="progress-bar">
                         <div class="progress-fill" style="width: ${memory.percent || 0}%"></div>
                     </div>
@@ -176,10 +225,10 @@ class Dashboard {
             overviewMetrics.innerHTML += `
                 <div class="metric">
                     <h3>💽 Armazenamento</h3>
-                    <div class="value">${disk.percent || '0%'}</div>
-                    <small>${disk.used || '0'} de ${disk.total || '0'}</small>
+                    <div class="value">${this.formatPercent(disk.percent)}</div>
+                    <small>${this.formatBytes(disk.used)} de ${this.formatBytes(disk.total)}</small>
                     <div class="progress-bar">
-                        <div class="progress-fill" style="width: ${disk.percent_num || 0}%"></div>
+                        <div class="progress-fill" style="width: ${disk.percent || 0}%"></div>
                     </div>
                 </div>
             `;
@@ -206,7 +255,7 @@ class Dashboard {
             let safeInfoHtml = '<ul>';
             
             if (data.system.uptime) {
-                safeInfoHtml += `<li><strong>Uptime:</strong> ${data.system.uptime}</li>`;
+                safeInfoHtml += `<li><strong>Uptime:</strong> ${this.formatDuration(data.system.uptime)}</li>`;
             }
             
             if (data.system.hostname) {
@@ -267,6 +316,15 @@ class Dashboard {
                 cpuHtml += `<p><strong>Frequência:</strong> ${cpu.frequency.toFixed(0)} MHz</p>`;
             }
             
+            // Frequência por cluster (policy), destacando limites de throttling
+            if (cpu.cpufreq && cpu.cpufreq.policies) {
+                for (const [name, policy] of Object.entries(cpu.cpufreq.policies)) {
+                    const cores = policy.cpus.join(',');
+                    const cap = policy.max_capped ? ` ⚠️ limitado a ${policy.max_mhz.toFixed(0)}` : '';
+                    cpuHtml += `<p><strong>${name} (${cores}):</strong> ${policy.cur_mhz !== null ? policy.cur_mhz.toFixed(0) : 'N/A'} / ${policy.hw_max_mhz !== null ? policy.hw_max_mhz.toFixed(0) : 'N/A'} MHz${cap}</p>`;
+                }
+            }
+            
             cpuContent.innerHTML = cpuHtml || 'Informações não disponíveis';
         }
         
@@ -284,8 +342,24 @@ class Dashboard {
                 </div>`;
             }
             
-            memoryHtml += `<p><strong>Total:</strong> ${memory.total || 'N/A'}</p>`;
-            memoryHtml += `<p><strong>Usado:</strong> ${memory.used || 'N/A'}</p>`;
+            memoryHtml += `<p><strong>Total:</strong> ${this.formatBytes(memory.total)}</p>`;
+            memoryHtml += `<p><strong>Usado:</strong> ${this.formatBytes(memory.used)}</p>`;
+            
+            if (memory.available !== undefined) {
+                memoryHtml += `<p><strong>Disponível:</strong> ${this.formatBytes(memory.available)}</p>`;
+                memoryHtml += `<p><strong>Cache:</strong> ${this.formatBytes(memory.cached + memory.buffers)}</p>`;
+            }
+            
+            if (memory.swap && memory.swap.total) {
+                memoryHtml += `<p><strong>Swap:</strong> ${this.formatBytes(memory.swap.used)} de ${this.formatBytes(memory.swap.total)}</p>`;
+            }
+            
+            if (memory.zram) {
+                for (const [device, zram] of Object.entries(memory.zram)) {
+                    const ratio = zram.compression_ratio ? `${zram.compression_ratio.toFixed(2)}x` : 'N/A';
+                    memoryHtml += `<p><strong>${device}:</strong> ${this.formatBytes(zram.orig_data_size)} → ${this.formatBytes(zram.compr_data_size)} (${ratio})</p>`;
+                }
+            }
             
             memoryContent.innerHTML = memoryHtml || 'Informações não disponíveis';
         }
@@ -364,8 +438,8 @@ class Dashboard {
                 interfacesHtml += `<tr>
                     <td>${iface.name}</td>
                     <td>${iface.ip || 'N/A'}</td>
-                    <td>${iface.rx_bytes || 'N/A'}</td>
-                    <td>${iface.tx_bytes || 'N/A'}</td>
+                    <td>${this.formatBytes(iface.rx_bytes)}</td>
+                    <td>${this.formatBytes(iface.tx_bytes)}</td>
                 </tr>`;
             });
             
@@ -413,7 +487,7 @@ class Dashboard {
             }
             
             if (wifi.link_speed) {
-                wifiHtml += `<p><strong>Velocidade:</strong> ${wifi.link_speed}</p>`;
+                wifiHtml += `<p><strong>Velocidade:</strong> ${wifi.link_speed} Mbps</p>`;
             }
             
             wifiContent.innerHTML = wifiHtml || 'Informações não disponíveis';
@@ -436,14 +510,14 @@ class Dashboard {
             
             let diskHtml = '';
             
-            diskHtml += `<div class="value">${disk.percent || '0%'}</div>`;
+            diskHtml += `<div class="value">${this.formatPercent(disk.percent)}</div>`;
             diskHtml += `<div class="progress-bar">
-                <div class="progress-fill" style="width: ${disk.percent_num || 0}%"></div>
+                <div class="progress-fill" style="width: ${disk.percent || 0}%"></div>
             </div>`;
             
-            diskHtml += `<p><strong>Total:</strong> ${disk.total || 'N/A'}</p>`;
-            diskHtml += `<p><strong>Usado:</strong> ${disk.used || 'N/A'}</p>`;
-            diskHtml += `<p><strong>Livre:</strong> ${disk.free || 'N/A'}</p>`;
+            diskHtml += `<p><strong>Total:</strong> ${this.formatBytes(disk.total)}</p>`;
+            diskHtml += `<p><strong>Usado:</strong> ${this.formatBytes(disk.used)}</p>`;
+            diskHtml += `<p><strong>Livre:</strong> ${this.formatBytes(disk.free)}</p>`;
             
             if (disk.mount_point) {
                 diskHtml += `<p><strong>Ponto de Montagem:</strong> ${disk.mount_point}</p>`;
@@ -461,10 +535,10 @@ class Dashboard {
                 partitionsHtml += `<tr>
                     <td>${part.device}</td>
                     <td>${part.mount_point}</td>
-                    <td>${part.total || 'N/A'}</td>
-                    <td>${part.used || 'N/A'}</td>
-                    <td>${part.free || 'N/A'}</td>
-                    <td>${part.percent || '0%'}</td>
+                    <td>${this.formatBytes(part.total)}</td>
+                    <td>${this.formatBytes(part.used)}</td>
+                    <td>${this.formatBytes(part.free)}</td>
+                    <td>${this.formatPercent(part.percent)}</td>
                 </tr>`;
             });
             